@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Compares the character-based chunk_text, the token-aware chunk_by_tokens and the
+full analysis plan (token chunking plus packing of small sources) on the raw data
+samples in database/exports/raw_data_samples.json.
+
+For every tool in the samples the analysis sources are rebuilt the way
+ToolIntelligenceAgent._process_tool builds them, and the script reports the number
+of LLM calls (one per chunk), the estimated prompt tokens sent and the largest
+prompt under each chunker. No model is called.
+
+Usage: python benchmark_chunking.py [path/to/raw_data_samples.json]
+"""
+
+import json
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from chunking import LLM_PROMPT_TOKEN_BUDGET, chunk_text, chunk_by_tokens, data_token_budget, estimate_tokens
+from main import ToolIntelligenceAgent
+
+DEFAULT_SAMPLES_PATH = os.path.join(os.path.dirname(__file__), 'database', 'exports', 'raw_data_samples.json')
+
+# Maps the raw_data keys onto the source names used by the analysis stage.
+SOURCE_NAMES = {
+    "scraped_content": "scraped_website",
+    "reddit_data": "reddit_posts",
+    "news_data": "news_articles",
+}
+
+
+def build_sources(raw_data: dict) -> dict:
+    """Rebuilds the large_data_sources mapping of _process_tool from sampled raw data."""
+    sources = {}
+    for key, data in raw_data.items():
+        if key == "scraped_content":
+            # Sampled as a list of {url, content}; the run concatenates them with headers.
+            text = "".join(
+                f"\n\n--- Scraped Content from {page.get('url')} ---\n{page.get('content', '')}" for page in data
+            ) if isinstance(data, list) else str(data)
+        elif key == "github_data":
+            text = data.get('readme') if isinstance(data, dict) else None
+        else:
+            text = json.dumps(data, default=str) if data else None
+        if text:
+            sources[SOURCE_NAMES.get(key, key)] = text
+    return sources
+
+
+def chunk_jobs_per_source(sources: dict, chunker) -> list:
+    """Returns (source_name, chunk, packed) for every source chunked on its own."""
+    return [(source_name, chunk, False) for source_name, text in sources.items() for chunk in chunker(text, source_name)]
+
+
+def measure(agent: ToolIntelligenceAgent, tool_name: str, jobs: list) -> dict:
+    prompt_sizes = [
+        estimate_tokens(agent._create_full_prompt(
+            tool_name, {"context_info": {}, "data_source_name": source_name, "data_chunk": chunk}, is_partial=True, packed=packed
+        ))
+        for source_name, chunk, packed in jobs
+    ]
+    return {"calls": len(prompt_sizes), "prompt_tokens": sum(prompt_sizes), "largest_prompt": max(prompt_sizes, default=0)}
+
+
+def main():
+    samples_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SAMPLES_PATH
+    with open(samples_path) as f:
+        samples = json.load(f)
+
+    # Group the per-source samples by tool.
+    tools = {}
+    for source_key, entries in samples.items():
+        for entry in entries:
+            tools.setdefault(entry['tool_name'], {})[source_key] = entry['sample_data']
+
+    # Only the prompt builder is needed, so the agent is not initialized.
+    agent = ToolIntelligenceAgent.__new__(ToolIntelligenceAgent)
+
+    def overhead(tool_name, source_name):
+        return estimate_tokens(agent._create_full_prompt(
+            tool_name, {"context_info": {}, "data_source_name": source_name, "data_chunk": ""}, is_partial=True
+        ))
+
+    strategies = {
+        "chunk_text (8000 chars)": lambda tool_name, sources: chunk_jobs_per_source(
+            sources, lambda text, source_name: chunk_text(text)
+        ),
+        f"chunk_by_tokens ({LLM_PROMPT_TOKEN_BUDGET} tokens)": lambda tool_name, sources: chunk_jobs_per_source(
+            sources, lambda text, source_name: chunk_by_tokens(text, data_token_budget(overhead(tool_name, source_name)))
+        ),
+        "chunk_by_tokens + packing": lambda tool_name, sources: [
+            (source_name, chunk, len(names) > 1) for names, source_name, chunk, _ in agent._plan_chunk_jobs(tool_name, {}, sources)
+        ],
+    }
+
+    print(f"Samples: {samples_path}")
+    totals = {name: {"calls": 0, "prompt_tokens": 0} for name in strategies}
+    for tool_name, raw_data in sorted(tools.items()):
+        sources = build_sources(raw_data)
+        print(f"\n{tool_name} ({len(sources)} sources, {sum(estimate_tokens(t) for t in sources.values())} data tokens)")
+        for name, plan in strategies.items():
+            result = measure(agent, tool_name, plan(tool_name, sources))
+            totals[name]["calls"] += result["calls"]
+            totals[name]["prompt_tokens"] += result["prompt_tokens"]
+            print(f"  {name:<32} calls={result['calls']:<4} prompt_tokens={result['prompt_tokens']:<8} largest_prompt={result['largest_prompt']}")
+
+    print(f"\nLLM calls per tool ({len(tools)} tools):")
+    for name, total in totals.items():
+        print(f"  {name:<32} {total['calls'] / max(len(tools), 1):.1f} calls, {total['prompt_tokens'] / max(len(tools), 1):.0f} prompt tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of JSON extraction from agent responses: the previous regex-based
+_extract_json against the single-pass scanner in src/json_scan.py.
+
+Full agent responses are not kept in the logs (only previews), so the responses
+are rebuilt from the structured output stored with the recorded snapshot in
+database/exports/tool_snapshots.json, in the shapes the agent actually produces:
+a fenced answer, raw JSON wrapped in prose, answers next to notes that contain
+braces (fenced and unfenced), and a large synthesis-sized answer.
+
+For each shape the script reports extraction throughput and whether the extracted
+text parses as JSON.
+
+Usage: python benchmark_json_extraction.py [iterations]
+"""
+
+import re
+import json
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from json_scan import extract_first_json_object
+
+SNAPSHOTS_PATH = os.path.join(os.path.dirname(__file__), 'database', 'exports', 'tool_snapshots.json')
+
+
+def legacy_extract_json(text: str) -> str:
+    """The regex extractor _extract_json used before the scanner."""
+    match = re.search(r'```json\s*(\{.*?\})\s*```', text, re.DOTALL)
+    if match:
+        return match.group(1)
+    try:
+        start = text.index('{')
+        end = text.rindex('}') + 1
+        return text[start:end]
+    except ValueError:
+        return ""
+
+
+def build_responses() -> dict:
+    with open(SNAPSHOTS_PATH) as f:
+        snapshot = json.load(f)[0]
+    structured = {key: snapshot[key] for key in ("basic_info", "technical_details", "company_info", "community_metrics")}
+    answer = json.dumps(structured, indent=2)
+    large = json.dumps({**structured, "raw_data": snapshot.get("raw_data")}, indent=2, default=str)
+    return {
+        "fenced": f"```json\n{answer}\n```",
+        "prose + raw JSON": f"Here's the analysis of the tool's \"data\":\n\n{answer}\n\nLet me know if you need more.",
+        "fenced + notes with braces": (
+            f"```json\n{answer}\n```\n\nNotes: fields such as {{employee_count}} were not found; "
+            "see {the website} for pricing. Example config: { mode: 'agent' }"
+        ),
+        "unfenced + notes with braces": (
+            f"Placeholders like {{tool_name}} were filled in.\n{answer}\n"
+            "Example config: { mode: 'agent' }"
+        ),
+        "large (synthesis-sized)": f"I merged the partial analyses below.\n```json\n{large}\n```\nDone.",
+    }
+
+
+def is_valid(candidate: str) -> bool:
+    try:
+        return isinstance(json.loads(candidate), dict)
+    except ValueError:
+        return False
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    extractors = {"regex (previous)": legacy_extract_json, "scanner": extract_first_json_object}
+
+    print(f"{'response':<28} {'size':>8}  {'extractor':<18} {'MB/s':>8} {'valid JSON':>10}")
+    for name, response in build_responses().items():
+        for extractor_name, extract in extractors.items():
+            started = time.perf_counter()
+            for _ in range(iterations):
+                extracted = extract(response)
+            elapsed = time.perf_counter() - started
+            throughput = len(response) * iterations / elapsed / 1_000_000
+            print(f"{name:<28} {len(response):>8}  {extractor_name:<18} {throughput:>8.1f} {str(is_valid(extracted)):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-from src.database import Database
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from database import Database
 import psycopg2.extras
 import json
 
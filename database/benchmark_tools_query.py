@@ -0,0 +1,172 @@
+# database/benchmark_tools_query.py
+"""
+EXPLAIN ANALYZE benchmark of the get_tools_to_process query: the previous shape with
+four correlated tool_urls subqueries per tool against the single pivoted join.
+
+The script seeds a throwaway schema (bench_tools_query) with ai_tools and tool_urls
+tables holding N tools (default 10,000) with 2-6 URLs each, runs both queries a few
+times with and without the covering idx_tool_urls_tool_type_url index, prints the
+median execution time and the top plan node of each, and drops the schema again.
+Existing tables are not touched.
+
+Usage: python database/benchmark_tools_query.py [tool_count] [repetitions]
+"""
+import os
+import sys
+import json
+import random
+import logging
+import statistics
+import psycopg2
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Database configuration
+DB_NAME = os.getenv("DB_NAME", "ai_database")
+DB_USER = os.getenv("DB_USER", "postgres")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = os.getenv("DB_PORT", "5432")
+
+BENCH_SCHEMA = "bench_tools_query"
+URL_TYPES = ["website", "documentation", "blog", "changelog", "docs", "release_notes", "product_page"]
+
+LEGACY_QUERY = """
+    SELECT
+        t.id, t.name, t.description, t.category, t.github_url, t.stock_symbol, t.status, t.run_status, t.last_run,
+        (SELECT url FROM tool_urls WHERE tool_id = t.id AND url_type = 'website') AS website_url,
+        (SELECT url FROM tool_urls WHERE tool_id = t.id AND url_type = 'documentation') AS documentation_url,
+        (SELECT url FROM tool_urls WHERE tool_id = t.id AND url_type = 'blog') AS blog_url,
+        (SELECT url FROM tool_urls WHERE tool_id = t.id AND url_type = 'changelog') AS changelog_url
+    FROM ai_tools t
+    WHERE t.run_status IS NULL OR t.run_status = 'update' OR t.run_status = 'failed'
+    ORDER BY t.id
+"""
+
+PIVOTED_QUERY = """
+    SELECT
+        t.id, t.name, t.description, t.category, t.github_url, t.stock_symbol, t.status, t.run_status, t.last_run,
+        COALESCE(jsonb_object_agg(u.url_type, u.url) FILTER (WHERE u.url_type IS NOT NULL), '{}'::jsonb) AS urls
+    FROM ai_tools t
+    LEFT JOIN tool_urls u ON u.tool_id = t.id
+    WHERE t.run_status IS NULL OR t.run_status = 'update' OR t.run_status = 'failed'
+    GROUP BY t.id
+    ORDER BY t.id
+"""
+
+
+def get_connection():
+    """Establishes a connection to the PostgreSQL database."""
+    try:
+        conn = psycopg2.connect(
+            dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=DB_PORT
+        )
+        logging.info("Successfully connected to the database.")
+        return conn
+    except psycopg2.OperationalError as e:
+        logging.error(f"Could not connect to the database: {e}")
+        return None
+
+
+def seed(cur, tool_count: int):
+    """Creates the benchmark schema with the production table shapes and seeds it."""
+    cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+    cur.execute(f"SET search_path TO {BENCH_SCHEMA}")
+    cur.execute("""
+        CREATE TABLE ai_tools (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            description TEXT,
+            github_url VARCHAR(500),
+            stock_symbol VARCHAR(20),
+            category VARCHAR(100),
+            status VARCHAR(50) DEFAULT 'active',
+            run_status VARCHAR(50),
+            last_run TIMESTAMP
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE tool_urls (
+            id SERIAL PRIMARY KEY,
+            tool_id INTEGER NOT NULL REFERENCES ai_tools(id) ON DELETE CASCADE,
+            url VARCHAR(500) NOT NULL,
+            url_type VARCHAR(50) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(tool_id, url_type)
+        )
+    """)
+
+    rng = random.Random(42)
+    run_statuses = [None, 'update', 'failed', 'success', 'success']
+    tools = [
+        (f"Tool {i}", f"Description of tool {i}", f"https://github.com/example/tool-{i}", f"Category {i % 12}", rng.choice(run_statuses))
+        for i in range(tool_count)
+    ]
+    cur.executemany(
+        "INSERT INTO ai_tools (name, description, github_url, category, run_status) VALUES (%s, %s, %s, %s, %s)", tools
+    )
+    urls = []
+    for tool_id in range(1, tool_count + 1):
+        for url_type in rng.sample(URL_TYPES, rng.randint(2, 6)):
+            urls.append((tool_id, f"https://tool-{tool_id}.example.com/{url_type}", url_type))
+    cur.executemany("INSERT INTO tool_urls (tool_id, url, url_type) VALUES (%s, %s, %s)", urls)
+    logging.info(f"Seeded {tool_count} tools and {len(urls)} URLs into schema {BENCH_SCHEMA}.")
+
+
+def explain(cur, query: str, repetitions: int):
+    """Runs EXPLAIN ANALYZE repeatedly and returns (median execution ms, top plan node)."""
+    timings = []
+    plan = None
+    for _ in range(repetitions):
+        cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}")
+        result = cur.fetchone()[0]
+        result = json.loads(result) if isinstance(result, str) else result
+        timings.append(result[0]["Execution Time"])
+        plan = result[0]["Plan"]
+    return statistics.median(timings), plan
+
+
+def describe(plan: dict) -> str:
+    children = ", ".join(child["Node Type"] for child in plan.get("Plans", []))
+    return f"{plan['Node Type']} ({children})" if children else plan["Node Type"]
+
+
+def main():
+    tool_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    conn = get_connection()
+    if not conn:
+        return
+
+    try:
+        with conn.cursor() as cur:
+            seed(cur, tool_count)
+            conn.commit()
+            # VACUUM cannot run in a transaction; it also sets the visibility map index-only scans rely on.
+            conn.autocommit = True
+            cur.execute("VACUUM ANALYZE ai_tools")
+            cur.execute("VACUUM ANALYZE tool_urls")
+
+            print(f"{'query':<34} {'median ms':>10}  plan")
+            for index_label in ("UNIQUE(tool_id, url_type) only", "with covering index"):
+                if index_label == "with covering index":
+                    cur.execute("CREATE INDEX idx_tool_urls_tool_type_url ON tool_urls(tool_id, url_type) INCLUDE (url)")
+                    cur.execute("VACUUM ANALYZE tool_urls")
+                print(f"-- {index_label}")
+                for name, query in (("correlated subqueries (previous)", LEGACY_QUERY), ("pivoted join", PIVOTED_QUERY)):
+                    median_ms, plan = explain(cur, query, repetitions)
+                    print(f"{name:<34} {median_ms:>10.1f}  {describe(plan)}")
+    finally:
+        conn.rollback()
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        conn.close()
+        logging.info(f"Dropped schema {BENCH_SCHEMA}.")
+
+
+if __name__ == "__main__":
+    main()
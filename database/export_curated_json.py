@@ -1,9 +1,13 @@
 import os
+import sys
 import json
 import logging
 import psycopg2
 from psycopg2.extras import DictCursor
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from database import fetch_snapshot_raw_data
+
 # --- Database Configuration ---
 # To run this script, ensure the following environment variables are set:
 # DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
@@ -13,6 +17,14 @@ DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
 
+# Snapshot columns to export; the raw scraper payload is only exported with --include-raw.
+SNAPSHOT_COLUMNS = """
+    s.id, s.tool_id, s.snapshot_date, s.basic_info, s.technical_details, s.company_info,
+    s.community_metrics, s.raw_data_hash, s.processing_status, s.error_log, s.created_at,
+    s.review_status, s.quality_score, s.curator_notes, s.reviewed_at, s.reviewed_by,
+    s.changes_detected, s.ready_for_publication
+"""
+
 # --- Logging Configuration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -32,12 +44,13 @@ def get_db_connection():
         logging.error(f"Could not connect to the database: {e}")
         return None
 
-def fetch_all_data(conn):
+def fetch_all_data(conn, include_raw=False):
     """
     Fetches all tools and their related data from the database and structures it.
     
     The final JSON object will be a list of tools, where each tool has its
     details and nested lists for URLs, snapshots, screenshots, etc.
+    Raw scraper payloads are only fetched when include_raw is set.
     """
     if not conn:
         return None
@@ -58,12 +71,14 @@ def fetch_all_data(conn):
             cur.execute("SELECT * FROM tool_urls WHERE tool_id = %s", (tool_id,))
             tool_data['urls'] = [dict(row) for row in cur.fetchall()]
 
-            cur.execute("SELECT * FROM tool_snapshots WHERE tool_id = %s ORDER BY snapshot_date DESC", (tool_id,))
+            cur.execute(f"SELECT {SNAPSHOT_COLUMNS} FROM tool_snapshots s WHERE s.tool_id = %s ORDER BY s.snapshot_date DESC", (tool_id,))
             snapshots = cur.fetchall()
             tool_data['snapshots'] = []
             for snapshot in snapshots:
                 snapshot_data = dict(snapshot)
                 snapshot_id = snapshot['id']
+                if include_raw:
+                    snapshot_data['raw_data'] = fetch_snapshot_raw_data(conn, snapshot_id)
                 
                 cur.execute("SELECT * FROM curated_snapshots WHERE snapshot_id = %s", (snapshot_id,))
                 curated = cur.fetchone()
@@ -91,6 +106,7 @@ def fetch_all_data(conn):
 def main():
     """
     Main function to export curated data to a JSON file.
+    Pass --include-raw to also export the raw scraper payload of every snapshot.
     """
     logging.info("Starting data export process...")
     
@@ -100,7 +116,7 @@ def main():
         return
 
     try:
-        all_data = fetch_all_data(conn)
+        all_data = fetch_all_data(conn, include_raw='--include-raw' in sys.argv[1:])
         
         if all_data is not None:
             output_filename = 'curated_export.json'
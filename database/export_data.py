@@ -29,6 +29,8 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
+from database import fetch_snapshot_raw_data
+
 # Load environment variables
 load_dotenv()
 
@@ -98,7 +100,6 @@ def export_structured_analysis(conn, output_dir):
         s.technical_details,
         s.company_info,
         s.community_metrics,
-        s.raw_data,
         s.processing_status,
         s.created_at as snapshot_created_at
     FROM ai_tools t
@@ -152,6 +153,7 @@ def export_structured_analysis(conn, output_dir):
             
             # Add snapshot data if it exists
             if row['snapshot_id']:
+                raw_data = fetch_snapshot_raw_data(conn, row['snapshot_id'])
                 snapshot_data = {
                     "snapshot_id": row['snapshot_id'],
                     "snapshot_date": row['snapshot_date'].isoformat() if row['snapshot_date'] else None,
@@ -160,12 +162,12 @@ def export_structured_analysis(conn, output_dir):
                     "technical_details": row['technical_details'],
                     "company_info": row['company_info'],
                     "community_metrics": row['community_metrics'],
-                    "raw_data": row['raw_data']
+                    "raw_data": raw_data
                 }
                 
                 # Track data sources from raw_data
-                if row['raw_data']:
-                    for source in row['raw_data'].keys():
+                if raw_data:
+                    for source in raw_data.keys():
                         data_sources.add(source)
                 
                 analysis_data["tools"][tool_name]["snapshots"].append(snapshot_data)
@@ -207,10 +209,13 @@ def export_raw_data_samples(conn, output_dir):
     """Export sample raw data for each data source for inspection."""
     print("🔬 Exporting raw data samples...")
     
+    # Sources of compressed payloads, uncompressed payloads and legacy inline raw_data.
     query = """
-    SELECT DISTINCT jsonb_object_keys(raw_data) as data_source
-    FROM tool_snapshots 
-    WHERE raw_data IS NOT NULL
+    SELECT DISTINCT source FROM raw_payload_frames
+    UNION
+    SELECT DISTINCT jsonb_object_keys(payload) FROM raw_payloads WHERE payload IS NOT NULL
+    UNION
+    SELECT DISTINCT jsonb_object_keys(raw_data) FROM tool_snapshots WHERE raw_data IS NOT NULL
     """
     
     with conn.cursor() as cur:
@@ -222,25 +227,30 @@ def export_raw_data_samples(conn, output_dir):
         query = f"""
         SELECT 
             t.name as tool_name,
-            s.snapshot_date,
-            s.raw_data -> %s as source_data
+            s.id as snapshot_id,
+            s.snapshot_date
         FROM tool_snapshots s
         JOIN ai_tools t ON s.tool_id = t.id
+        LEFT JOIN raw_payloads p ON p.hash = s.raw_data_hash
         WHERE s.raw_data -> %s IS NOT NULL
+           OR p.payload -> %s IS NOT NULL
+           OR EXISTS (SELECT 1 FROM raw_payload_frames f WHERE f.payload_hash = s.raw_data_hash AND f.source = %s)
         ORDER BY s.snapshot_date DESC
         LIMIT 3
         """
         
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, (source, source))
+            cur.execute(query, (source, source, source))
             rows = cur.fetchall()
             
             samples[source] = []
             for row in rows:
+                # Only this source's frame is decompressed.
+                source_data = fetch_snapshot_raw_data(conn, row['snapshot_id'], [source]) or {}
                 samples[source].append({
                     "tool_name": row['tool_name'],
                     "snapshot_date": row['snapshot_date'].isoformat() if row['snapshot_date'] else None,
-                    "sample_data": row['source_data']
+                    "sample_data": source_data.get(source)
                 })
     
     output_file = output_dir / "raw_data_samples.json"
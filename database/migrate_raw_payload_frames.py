@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Migration: store raw payloads as compressed per-source frames.
+
+Run after migrate_raw_payloads.py. The script
+  1. creates raw_payload_dictionaries and raw_payload_frames and adds the format,
+     dictionary and size columns to raw_payloads,
+  2. trains a shared compression dictionary from a sample of the stored payloads
+     (skipped with --reuse-dictionary, which uses the latest stored one),
+  3. converts every payload still stored as JSONB into frames, in batches, and
+  4. reports the size reduction per source and for the tables on disk.
+
+Usage:
+    python database/migrate_raw_payload_frames.py [--dry-run] [--reuse-dictionary]
+                                                   [--sample-size 200] [--batch-size 100]
+
+With --dry-run nothing is written: payloads are compressed in memory to report the
+reduction the migration would achieve.
+"""
+
+import os
+import sys
+import logging
+import argparse
+
+# Add src directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import psycopg2
+from dotenv import load_dotenv
+
+from raw_frames import RAW_FRAME_CODEC, encode_payload, source_json, train_dictionary
+from database import latest_raw_dictionary
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+DDL = """
+CREATE TABLE IF NOT EXISTS raw_payload_dictionaries (
+    id SERIAL PRIMARY KEY,
+    codec VARCHAR(16) NOT NULL,
+    dictionary BYTEA NOT NULL,
+    sample_count INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE raw_payloads
+ADD COLUMN IF NOT EXISTS format VARCHAR(16) NOT NULL DEFAULT 'jsonb',
+ADD COLUMN IF NOT EXISTS dictionary_id INTEGER REFERENCES raw_payload_dictionaries(id),
+ADD COLUMN IF NOT EXISTS stored_bytes INTEGER;
+
+ALTER TABLE raw_payloads ALTER COLUMN payload DROP NOT NULL;
+
+CREATE TABLE IF NOT EXISTS raw_payload_frames (
+    payload_hash CHAR(64) NOT NULL REFERENCES raw_payloads(hash) ON DELETE CASCADE,
+    position SMALLINT NOT NULL,
+    source VARCHAR(100) NOT NULL,
+    data BYTEA NOT NULL,
+    raw_size INTEGER,
+    PRIMARY KEY (payload_hash, source)
+);
+
+ALTER TABLE raw_payload_frames ALTER COLUMN data SET STORAGE EXTERNAL;
+"""
+
+SIZE_QUERY = """
+SELECT pg_total_relation_size('raw_payloads')
+     + COALESCE(pg_total_relation_size(to_regclass('raw_payload_frames')), 0)
+"""
+
+
+def get_db_connection():
+    """Establish database connection using environment variables."""
+    try:
+        conn = psycopg2.connect(
+            dbname=os.getenv("DB_NAME", "ai_database"),
+            user=os.getenv("DB_USER", "postgres"),
+            password=os.getenv("DB_PASSWORD", "postgres"),
+            host=os.getenv("DB_HOST", "localhost"),
+            port=os.getenv("DB_PORT", "5432")
+        )
+        logging.info("Successfully connected to the database.")
+        return conn
+    except psycopg2.OperationalError as e:
+        logging.error(f"Could not connect to the database: {e}")
+        return None
+
+
+def jsonb_payload_filter(conn) -> str:
+    """
+    Returns the WHERE condition selecting payloads still stored as JSONB. A dry run skips the DDL,
+    so before the first real run raw_payloads has no format column and every payload is JSONB.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'raw_payloads' AND column_name = 'format'
+        """)
+        has_format = cur.fetchone() is not None
+    return "format = 'jsonb' AND payload IS NOT NULL" if has_format else "payload IS NOT NULL"
+
+
+def train(conn, payload_filter: str, sample_size: int, dry_run: bool):
+    """Trains a dictionary from the most recent JSONB payloads and returns (id, dictionary)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT payload FROM raw_payloads WHERE {payload_filter} ORDER BY created_at DESC LIMIT %s",
+            (sample_size,)
+        )
+        payloads = [row[0] for row in cur.fetchall()]
+    samples = [source_json(value) for payload in payloads for value in payload.values()]
+    dictionary = train_dictionary(samples)
+    logging.info(f"Trained a {len(dictionary)} byte dictionary from {len(payloads)} payloads ({len(samples)} sources).")
+    if dry_run or not dictionary:
+        return None, dictionary or None
+    with conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO raw_payload_dictionaries (codec, dictionary, sample_count) VALUES (%s, %s, %s) RETURNING id",
+            (RAW_FRAME_CODEC, psycopg2.Binary(dictionary), len(payloads))
+        )
+        dictionary_id = cur.fetchone()[0]
+    conn.commit()
+    return dictionary_id, dictionary
+
+
+def convert(conn, payload_filter: str, dictionary_id, dictionary, batch_size: int, dry_run: bool) -> dict:
+    """Converts JSONB payloads to frames and returns {source: [raw bytes, stored bytes]}."""
+    totals = {}
+    converted = 0
+    last_hash = ""
+    while True:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT hash, payload FROM raw_payloads WHERE {payload_filter} AND hash > %s ORDER BY hash LIMIT %s",
+                (last_hash, batch_size)
+            )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            for payload_hash, payload in rows:
+                frames = encode_payload(payload, dictionary)
+                for source, frame, raw_size in frames:
+                    source_totals = totals.setdefault(source, [0, 0])
+                    source_totals[0] += raw_size
+                    source_totals[1] += len(frame)
+                if dry_run:
+                    continue
+                cur.executemany(
+                    "INSERT INTO raw_payload_frames (payload_hash, position, source, data, raw_size) VALUES (%s, %s, %s, %s, %s)",
+                    [(payload_hash, position, source, psycopg2.Binary(frame), raw_size)
+                     for position, (source, frame, raw_size) in enumerate(frames)]
+                )
+                cur.execute(
+                    """
+                    UPDATE raw_payloads
+                    SET format = 'frames', payload = NULL, dictionary_id = %s, stored_bytes = %s
+                    WHERE hash = %s
+                    """,
+                    (dictionary_id, sum(len(frame) for _, frame, _ in frames), payload_hash)
+                )
+        conn.commit()
+        converted += len(rows)
+        last_hash = rows[-1][0]
+        logging.info(f"{'Compressed' if dry_run else 'Converted'} {converted} payloads...")
+    return totals
+
+
+def report(totals: dict, size_before: int, size_after: int, dry_run: bool):
+    print(f"\n{'source':<24} {'raw bytes':>14} {'stored bytes':>14} {'ratio':>7}")
+    raw_total = stored_total = 0
+    for source, (raw_bytes, stored_bytes) in sorted(totals.items(), key=lambda item: item[1][0], reverse=True):
+        raw_total += raw_bytes
+        stored_total += stored_bytes
+        print(f"{source:<24} {raw_bytes:>14,} {stored_bytes:>14,} {raw_bytes / max(stored_bytes, 1):>6.1f}x")
+    print(f"{'total':<24} {raw_total:>14,} {stored_total:>14,} {raw_total / max(stored_total, 1):>6.1f}x")
+    if not dry_run:
+        reduction = 100 * (1 - size_after / size_before) if size_before else 0
+        print(f"\nraw_payloads + raw_payload_frames on disk: {size_before:,} -> {size_after:,} bytes ({reduction:.1f}% smaller)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert raw payloads to compressed per-source frames.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the expected size reduction.")
+    parser.add_argument("--reuse-dictionary", action="store_true", help="Compress with the latest stored dictionary.")
+    parser.add_argument("--sample-size", type=int, default=200, help="Payloads used to train the dictionary.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Payloads converted per transaction.")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if not conn:
+        return
+
+    try:
+        with conn.cursor() as cur:
+            if not args.dry_run:
+                cur.execute(DDL)
+            cur.execute(SIZE_QUERY)
+            size_before = cur.fetchone()[0]
+            cur.execute("SELECT count(*) FROM tool_snapshots WHERE raw_data IS NOT NULL AND raw_data_hash IS NULL")
+            inline_count = cur.fetchone()[0]
+        conn.commit()
+        if inline_count:
+            logging.warning(f"{inline_count} snapshots still keep raw_data inline; run migrate_raw_payloads.py first to include them.")
+
+        payload_filter = jsonb_payload_filter(conn)
+        if args.reuse_dictionary:
+            with conn.cursor() as cur:
+                cur.execute("SELECT to_regclass('raw_payload_dictionaries') IS NOT NULL")
+                has_dictionaries = cur.fetchone()[0]
+            if not has_dictionaries:
+                logging.error("There is no stored dictionary to reuse yet; run without --reuse-dictionary.")
+                return
+            dictionary_id, dictionary = latest_raw_dictionary(conn)
+            logging.info(f"Using stored dictionary {dictionary_id}.")
+        else:
+            dictionary_id, dictionary = train(conn, payload_filter, args.sample_size, args.dry_run)
+
+        totals = convert(conn, payload_filter, dictionary_id, dictionary, args.batch_size, args.dry_run)
+
+        size_after = size_before
+        if not args.dry_run:
+            # Reclaim the space of the JSONB payloads that were moved into frames.
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("VACUUM FULL raw_payloads")
+                cur.execute(SIZE_QUERY)
+                size_after = cur.fetchone()[0]
+        report(totals, size_before, size_after, args.dry_run)
+    finally:
+        conn.close()
+        logging.info("Database connection closed.")
+
+
+if __name__ == "__main__":
+    main()
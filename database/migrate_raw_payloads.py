@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Migration: move raw scraper payloads out of tool_snapshots into raw_payloads.
+
+Raw payloads are stored once per distinct content in raw_payloads and referenced from
+tool_snapshots.raw_data_hash, so queries on snapshots no longer drag them through TOAST.
+Payloads are hashed in Python with the collector's raw_payload_json(), so a migrated
+payload gets the same key as an identical one written by a later weekly run and the two
+are stored once.
+
+The script
+  1. creates raw_payloads and tool_snapshots.raw_data_hash,
+  2. moves inline tool_snapshots.raw_data into raw_payloads, in batches,
+  3. re-keys JSONB payloads whose hash is not the collector's (rows moved by the earlier
+     SQL version of this migration, which hashed PostgreSQL's jsonb text form), and
+  4. reclaims the space with VACUUM FULL tool_snapshots and reports the sizes.
+
+Run it before migrate_raw_payload_frames.py, which converts the payloads to frames.
+
+Usage:
+    python database/migrate_raw_payloads.py [--batch-size 100] [--skip-vacuum]
+"""
+
+import os
+import sys
+import logging
+import argparse
+
+# Add src directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import psycopg2
+from dotenv import load_dotenv
+
+from database import raw_payload_json
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+DDL = """
+CREATE TABLE IF NOT EXISTS raw_payloads (
+    hash CHAR(64) PRIMARY KEY,
+    payload JSONB NOT NULL,
+    size_bytes INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE tool_snapshots
+ADD COLUMN IF NOT EXISTS raw_data_hash CHAR(64) REFERENCES raw_payloads(hash);
+"""
+
+SIZE_QUERY = """
+SELECT pg_total_relation_size('tool_snapshots'), pg_total_relation_size('raw_payloads')
+"""
+
+INSERT_PAYLOAD = """
+INSERT INTO raw_payloads (hash, payload, size_bytes) VALUES (%s, %s::jsonb, %s)
+ON CONFLICT (hash) DO NOTHING
+"""
+
+
+def get_db_connection():
+    """Establish database connection using environment variables."""
+    try:
+        conn = psycopg2.connect(
+            dbname=os.getenv("DB_NAME", "ai_database"),
+            user=os.getenv("DB_USER", "postgres"),
+            password=os.getenv("DB_PASSWORD", "postgres"),
+            host=os.getenv("DB_HOST", "localhost"),
+            port=os.getenv("DB_PORT", "5432")
+        )
+        logging.info("Successfully connected to the database.")
+        return conn
+    except psycopg2.OperationalError as e:
+        logging.error(f"Could not connect to the database: {e}")
+        return None
+
+
+def move_inline_payloads(conn, batch_size: int) -> int:
+    """Moves tool_snapshots.raw_data into raw_payloads and returns the number of snapshots moved."""
+    moved = 0
+    last_id = 0
+    while True:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT id, raw_data FROM tool_snapshots
+                WHERE raw_data IS NOT NULL AND raw_data_hash IS NULL AND id > %s
+                ORDER BY id LIMIT %s
+                """,
+                (last_id, batch_size)
+            )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            for snapshot_id, raw_data in rows:
+                payload_json, payload_hash = raw_payload_json(raw_data)
+                cur.execute(INSERT_PAYLOAD, (payload_hash, payload_json, len(payload_json.encode("utf-8"))))
+                cur.execute(
+                    "UPDATE tool_snapshots SET raw_data_hash = %s, raw_data = NULL WHERE id = %s",
+                    (payload_hash, snapshot_id)
+                )
+        conn.commit()
+        moved += len(rows)
+        last_id = rows[-1][0]
+        logging.info(f"Moved {moved} snapshot payloads...")
+    return moved
+
+
+def rekey_payloads(conn, batch_size: int) -> int:
+    """Re-keys JSONB payloads whose hash differs from raw_payload_json's and returns how many were re-keyed."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'raw_payloads' AND column_name = 'format'
+        """)
+        # Payloads already converted to frames are keyed by the collector or by a previous re-key.
+        jsonb_filter = "format = 'jsonb' AND payload IS NOT NULL" if cur.fetchone() else "payload IS NOT NULL"
+
+    rekeyed = 0
+    last_hash = ""
+    while True:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT hash, payload FROM raw_payloads WHERE {jsonb_filter} AND hash > %s ORDER BY hash LIMIT %s",
+                (last_hash, batch_size)
+            )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            for old_hash, payload in rows:
+                payload_json, payload_hash = raw_payload_json(payload)
+                if payload_hash == old_hash:
+                    continue
+                cur.execute(INSERT_PAYLOAD, (payload_hash, payload_json, len(payload_json.encode("utf-8"))))
+                cur.execute("UPDATE tool_snapshots SET raw_data_hash = %s WHERE raw_data_hash = %s", (payload_hash, old_hash))
+                cur.execute("DELETE FROM raw_payloads WHERE hash = %s", (old_hash,))
+                rekeyed += 1
+        conn.commit()
+        last_hash = rows[-1][0]
+    return rekeyed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move raw payloads from tool_snapshots into raw_payloads.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Snapshots moved per transaction.")
+    parser.add_argument("--skip-vacuum", action="store_true", help="Do not run VACUUM FULL tool_snapshots.")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if not conn:
+        return
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute(DDL)
+            cur.execute(SIZE_QUERY)
+            snapshots_before, payloads_before = cur.fetchone()
+        conn.commit()
+
+        moved = move_inline_payloads(conn, args.batch_size)
+        rekeyed = rekey_payloads(conn, args.batch_size)
+        logging.info(f"Moved {moved} inline payloads and re-keyed {rekeyed} previously migrated payloads.")
+
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            if not args.skip_vacuum:
+                # Reclaims the space of the moved payloads (takes an exclusive lock on tool_snapshots).
+                cur.execute("VACUUM FULL tool_snapshots")
+            cur.execute(SIZE_QUERY)
+            snapshots_after, payloads_after = cur.fetchone()
+            cur.execute("""
+                SELECT (SELECT count(*) FROM tool_snapshots WHERE raw_data_hash IS NOT NULL),
+                       (SELECT count(*) FROM raw_payloads)
+            """)
+            snapshot_count, payload_count = cur.fetchone()
+        print(f"\nsnapshots with a payload: {snapshot_count:,}, distinct payloads: {payload_count:,}")
+        print(f"tool_snapshots: {snapshots_before:,} -> {snapshots_after:,} bytes")
+        print(f"raw_payloads:   {payloads_before:,} -> {payloads_after:,} bytes")
+    finally:
+        conn.close()
+        logging.info("Database connection closed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+-- Migration Script: Claim-based work queue for collectors
+-- Run this script on existing installations before running main.py with this version.
+
+-- Collectors claim pending tools with SELECT ... FOR UPDATE SKIP LOCKED and hold a lease
+-- that their heartbeat renews. An expired lease (e.g. a crashed collector) makes the tool
+-- claimable again; failed tools keep a lease for TOOL_FAILED_RETRY_SECONDS as a retry delay.
+ALTER TABLE ai_tools
+ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(255),
+ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_ai_tools_claimable ON ai_tools(id, lease_expires_at)
+WHERE run_status IS NULL OR run_status IN ('update', 'failed');
+
+-- Verify the migration
+SELECT id, name, run_status, claimed_by, lease_expires_at FROM ai_tools ORDER BY id LIMIT 10;
@@ -0,0 +1,12 @@
+-- Migration Script: Covering index for the tool URL lookup
+-- Run this script on existing installations (PostgreSQL 11+).
+
+-- get_tools_to_process joins tool_urls once and pivots the rows with jsonb_object_agg.
+-- The UNIQUE(tool_id, url_type) index already finds a tool's rows; including url lets
+-- the join read them with an index-only scan instead of visiting the table.
+CREATE INDEX IF NOT EXISTS idx_tool_urls_tool_type_url ON tool_urls(tool_id, url_type) INCLUDE (url);
+
+ANALYZE tool_urls;
+
+-- Verify the migration
+SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'tool_urls';
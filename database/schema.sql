@@ -7,6 +7,9 @@ DROP TABLE IF EXISTS curation_sessions CASCADE;
 DROP TABLE IF EXISTS snapshot_changes CASCADE;
 DROP TABLE IF EXISTS curated_snapshots CASCADE;
 DROP TABLE IF EXISTS tool_snapshots CASCADE;
+DROP TABLE IF EXISTS raw_payload_frames CASCADE;
+DROP TABLE IF EXISTS raw_payloads CASCADE;
+DROP TABLE IF EXISTS raw_payload_dictionaries CASCADE;
 DROP TABLE IF EXISTS tool_urls CASCADE;
 DROP TABLE IF EXISTS ai_tools CASCADE;
 DROP TABLE IF EXISTS data_sources CASCADE;
@@ -25,6 +28,8 @@ CREATE TABLE ai_tools (
     run_status VARCHAR(50) DEFAULT NULL, -- null=never_run, update=needs_run, processed=completed
     last_run TIMESTAMP,
     error_message TEXT, -- To store the error message if a run fails
+    claimed_by VARCHAR(255), -- Collector currently processing the tool (host:pid)
+    lease_expires_at TIMESTAMP, -- Claim expiry, renewed by the collector's heartbeat; also delays retries of failed tools
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -39,6 +44,38 @@ CREATE TABLE tool_urls (
     UNIQUE(tool_id, url_type)
 );
 
+-- Shared compression dictionaries for raw payload frames, trained from existing payloads
+CREATE TABLE raw_payload_dictionaries (
+    id SERIAL PRIMARY KEY,
+    codec VARCHAR(16) NOT NULL,
+    dictionary BYTEA NOT NULL,
+    sample_count INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Raw scraper payloads, stored once per distinct content (SHA-256 of the canonical JSON)
+CREATE TABLE raw_payloads (
+    hash CHAR(64) PRIMARY KEY,
+    format VARCHAR(16) NOT NULL DEFAULT 'jsonb', -- 'jsonb': payload column; 'frames': raw_payload_frames
+    payload JSONB,
+    dictionary_id INTEGER REFERENCES raw_payload_dictionaries(id),
+    size_bytes INTEGER, -- Size of the uncompressed JSON
+    stored_bytes INTEGER, -- Size of the compressed frames
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- One compressed frame per source of a raw payload, so sources can be read independently
+CREATE TABLE raw_payload_frames (
+    payload_hash CHAR(64) NOT NULL REFERENCES raw_payloads(hash) ON DELETE CASCADE,
+    position SMALLINT NOT NULL,
+    source VARCHAR(100) NOT NULL,
+    data BYTEA NOT NULL,
+    raw_size INTEGER,
+    PRIMARY KEY (payload_hash, source)
+);
+-- Frames are already compressed; skip PostgreSQL's own TOAST compression attempt
+ALTER TABLE raw_payload_frames ALTER COLUMN data SET STORAGE EXTERNAL;
+
 -- Table to store snapshots of data collected for each tool at a point in time
 CREATE TABLE tool_snapshots (
     id SERIAL PRIMARY KEY,
@@ -48,7 +85,8 @@ CREATE TABLE tool_snapshots (
     technical_details JSONB,
     company_info JSONB,
     community_metrics JSONB,
-    raw_data JSONB,
+    raw_data JSONB, -- Legacy inline payload; new snapshots reference raw_payloads instead
+    raw_data_hash CHAR(64) REFERENCES raw_payloads(hash),
     processing_status VARCHAR(50) DEFAULT 'processing',
     error_log TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -135,6 +173,10 @@ CREATE INDEX idx_tool_snapshots_review_status ON tool_snapshots(review_status);
 CREATE INDEX idx_tool_snapshots_ready_for_publication ON tool_snapshots(ready_for_publication);
 CREATE INDEX idx_tool_snapshots_tool_date ON tool_snapshots(tool_id, snapshot_date DESC);
 CREATE INDEX idx_snapshot_changes_snapshot_id ON snapshot_changes(snapshot_id);
+-- Pending tools in claim order, for the collectors' FOR UPDATE SKIP LOCKED claims
+CREATE INDEX idx_ai_tools_claimable ON ai_tools(id, lease_expires_at) WHERE run_status IS NULL OR run_status IN ('update', 'failed');
+-- Covers the tool_urls join in get_tools_to_process (index-only scan, no heap access for url)
+CREATE INDEX idx_tool_urls_tool_type_url ON tool_urls(tool_id, url_type) INCLUDE (url);
 
 -- Function to detect changes between snapshots
 CREATE OR REPLACE FUNCTION detect_snapshot_changes(new_snapshot_id INTEGER)
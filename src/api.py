@@ -1,4 +1,5 @@
 import os
+import sys
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import psycopg2
@@ -7,6 +8,12 @@ from dotenv import load_dotenv
 from pydantic import BaseModel
 from typing import Optional
 
+# Make the sibling modules importable when started as `uvicorn src.api:app` from the repo root,
+# where `database` would otherwise resolve to the top-level database/ directory.
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import fetch_snapshot_raw_data
+
 # Load environment variables
 load_dotenv()
 
@@ -40,6 +47,15 @@ def get_db_connection():
     )
     return conn
 
+# Snapshot columns returned by the API. The raw scraper payload (often megabytes) is left out
+# and only loaded on explicit request, via fetch_snapshot_raw_data.
+SNAPSHOT_COLUMNS = """
+    s.id, s.tool_id, s.snapshot_date, s.basic_info, s.technical_details, s.company_info,
+    s.community_metrics, s.raw_data_hash, s.processing_status, s.error_log, s.created_at,
+    s.review_status, s.quality_score, s.curator_notes, s.reviewed_at, s.reviewed_by,
+    s.changes_detected, s.ready_for_publication
+"""
+
 # --- Pydantic Models ---
 class CurationRequest(BaseModel):
     curator_notes: Optional[str] = None
@@ -75,8 +91,11 @@ async def get_tools():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/tools/{tool_id}")
-async def get_tool_detail(tool_id: int):
-    """Get details for a specific tool including its URLs and most recent snapshot."""
+async def get_tool_detail(tool_id: int, include_raw: bool = False):
+    """
+    Get details for a specific tool including its URLs and most recent snapshot.
+    The snapshot's raw scraper payload is only included with ?include_raw=true.
+    """
     try:
         conn = get_db_connection()
         with conn.cursor(cursor_factory=DictCursor) as cur:
@@ -97,24 +116,51 @@ async def get_tool_detail(tool_id: int):
 
             # Get the most recent snapshot for this tool
             cur.execute(
-                """SELECT * FROM tool_snapshots 
-                   WHERE tool_id = %s 
-                   ORDER BY snapshot_date DESC 
+                f"""SELECT {SNAPSHOT_COLUMNS}
+                   FROM tool_snapshots s
+                   WHERE s.tool_id = %s 
+                   ORDER BY s.snapshot_date DESC 
                    LIMIT 1""", 
                 (tool_id,)
             )
             snapshot = cur.fetchone()
+            snapshot = dict(snapshot) if snapshot else None
+        if snapshot and include_raw:
+            snapshot["raw_data"] = fetch_snapshot_raw_data(conn, snapshot["id"])
 
         conn.close()
         return {
             "tool": dict(tool) if tool else None,
-            "snapshot": dict(snapshot) if snapshot else None
+            "snapshot": snapshot
         }
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/snapshots/{snapshot_id}/raw")
+async def get_snapshot_raw_data(snapshot_id: int, sources: Optional[str] = None):
+    """
+    Get the raw scraper payload of a snapshot. ?sources=github_data,pypi_data returns (and
+    decompresses) only those sources.
+    """
+    try:
+        conn = get_db_connection()
+        with conn.cursor(cursor_factory=DictCursor) as cur:
+            cur.execute("SELECT id, raw_data_hash FROM tool_snapshots WHERE id = %s", (snapshot_id,))
+            snapshot = cur.fetchone()
+        if not snapshot:
+            conn.close()
+            raise HTTPException(status_code=404, detail="Snapshot not found")
+        source_list = [source.strip() for source in sources.split(",") if source.strip()] if sources else None
+        raw_data = fetch_snapshot_raw_data(conn, snapshot_id, source_list)
+        conn.close()
+        return {"snapshot_id": snapshot["id"], "raw_data_hash": snapshot["raw_data_hash"], "raw_data": raw_data}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/snapshots/{snapshot_id}/curate")
 async def curate_snapshot(snapshot_id: int, curation: CurationRequest):
     """Save curation data for a snapshot."""
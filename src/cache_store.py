@@ -0,0 +1,112 @@
+"""
+Persistent key/value storage for the platform's on-disk caches.
+
+A single SQLite file holds the entries of one cache. Entries carry a small JSON
+metadata record next to their value, the store is bounded in size and evicts
+the least recently used entries first, and hit/miss counters are kept for the
+end-of-run report.
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+
+class SqliteLRUStore:
+    """A size-bounded SQLite key/value store with least-recently-used eviction."""
+
+    def __init__(self, path: str, max_bytes: int, name: str):
+        self.name = name
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {}
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB,
+                    meta TEXT,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed_at ON entries(accessed_at)")
+            self._conn.commit()
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def count(self, counter: str, amount: int = 1):
+        """Increments one of the named statistics counters."""
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def get(self, key: str):
+        """Returns (value, meta, stored_at) for a key, or None. Marks the entry as recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, meta, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        value, meta, stored_at = row
+        return value, json.loads(meta) if meta else {}, stored_at
+
+    def put(self, key: str, value: bytes, meta: dict = None):
+        """Stores a value, replacing any previous entry, and evicts old entries if over budget."""
+        now = time.time()
+        size = len(value or b"") + len(key)
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, meta, stored_at, accessed_at, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, json.dumps(meta or {}), now, now, size)
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict_locked()
+            self._conn.commit()
+            self._counters["stores"] = self._counters.get("stores", 0) + 1
+
+    def touch(self, key: str):
+        """Resets an entry's age, e.g. after the origin confirmed it is still current."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self._conn.commit()
+
+    def _evict_locked(self):
+        """Drops least recently used entries until the store is back under 90% of its budget."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC").fetchall()
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._total_bytes -= size
+            evicted += 1
+        self._counters["evictions"] = self._counters.get("evictions", 0) + evicted
+
+    def summary(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size_bytes"] = self._total_bytes
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        stats["hit_rate"] = round(stats.get("hits", 0) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def log_stats(self):
+        """Logs the hit/miss statistics of this cache."""
+        logging.info(f"{self.name} stats: {self.summary()}")
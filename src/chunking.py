@@ -0,0 +1,162 @@
+"""
+Token-aware chunking for the LLM analysis stage.
+
+Sources are split on natural boundaries (markdown headings, paragraphs, lines,
+JSON array items, sentences, words) and the pieces are packed greedily into
+chunks that fit a token budget. The budget is what remains of the prompt budget
+after the prompt's own instructions and schema, so a chunk that fits here also
+fits the model's context and overflow retries become the exception.
+
+Sources small enough to fit a chunk on their own are bin-packed together, each
+introduced by a source label, so a handful of small JSON payloads share one
+prompt (and one copy of the schema) instead of getting a prompt each.
+"""
+import os
+import re
+
+
+# Total tokens a single analysis prompt may use, including instructions and schema.
+LLM_PROMPT_TOKEN_BUDGET = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "6000"))
+# Never pack less data than this into a chunk, however large the prompt overhead is.
+MIN_CHUNK_TOKENS = 500
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Split points from coarsest to finest. Each separator stays with the text before it.
+_SEPARATORS = [
+    re.compile(r"\n(?=#{1,6} )"),    # markdown headings
+    re.compile(r"\n[ \t]*\n"),       # paragraphs
+    re.compile(r"\n"),               # lines
+    re.compile(r"(?<=\}), ?(?=\{)"), # objects in a JSON array
+    re.compile(r"(?<=[.!?])\s+"),    # sentences
+    re.compile(r"\s+"),              # words
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of model tokens in a text without a tokenizer.
+    Every punctuation mark counts as one token and words count one token per four
+    characters, which slightly overestimates English prose and is close for JSON.
+    """
+    if not text:
+        return 0
+    return sum((len(token) + 3) // 4 for token in _TOKEN_PATTERN.findall(text))
+
+
+def data_token_budget(prompt_overhead_tokens: int, prompt_budget: int = LLM_PROMPT_TOKEN_BUDGET) -> int:
+    """Returns how many tokens of data fit in a prompt next to its fixed overhead."""
+    return max(prompt_budget - prompt_overhead_tokens, MIN_CHUNK_TOKENS)
+
+
+def _cut(text: str, separator: re.Pattern) -> list:
+    pieces = []
+    start = 0
+    for match in separator.finditer(text):
+        if match.end() > start:
+            pieces.append(text[start:match.end()])
+            start = match.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+
+def _split(text: str, max_tokens: int, level: int = 0) -> list:
+    """Splits text into pieces of at most max_tokens, using the coarsest boundary that works."""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return [text]
+    if level == len(_SEPARATORS):
+        # No boundary left (e.g. a very long token run): cut by characters.
+        size = max(len(text) * max_tokens // tokens, 1)
+        return [text[i:i + size] for i in range(0, len(text), size)]
+    pieces = _cut(text, _SEPARATORS[level])
+    if len(pieces) == 1:
+        return _split(text, max_tokens, level + 1)
+    result = []
+    for piece in pieces:
+        result.extend(_split(piece, max_tokens, level + 1))
+    return result
+
+
+def chunk_by_tokens(text: str, max_tokens: int) -> list:
+    """
+    Splits text into chunks of at most max_tokens estimated tokens, cutting on
+    markdown/paragraph/line/sentence boundaries and packing adjacent pieces together.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return []
+    chunks = []
+    current = []
+    current_tokens = 0
+    for piece in _split(text, max_tokens):
+        piece_tokens = estimate_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append("".join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append("".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def source_label(source_name: str) -> str:
+    """Returns the line that introduces a source inside a packed chunk."""
+    return f"--- Source: {source_name} ---\n"
+
+
+def pack_sources(sources: dict, max_tokens: int) -> list:
+    """
+    Bin-packs whole sources into as few chunks of at most max_tokens as possible
+    (first-fit decreasing). Every source must fit a chunk on its own.
+    :param sources: Source name to text, in analysis order.
+    :param max_tokens: Token budget of one chunk, labels included.
+    :return: A list of (source_names, text) in the order of each chunk's first source.
+             Chunks with several sources label each one; a lone source is left as is.
+    """
+    order = {name: position for position, name in enumerate(sources)}
+    sizes = {name: estimate_tokens(source_label(name)) + estimate_tokens(text) + 1 for name, text in sources.items()}
+    bins = []  # [used_tokens, [names]]
+    for name in sorted(sources, key=lambda n: sizes[n], reverse=True):
+        for packed in bins:
+            if packed[0] + sizes[name] <= max_tokens:
+                packed[0] += sizes[name]
+                packed[1].append(name)
+                break
+        else:
+            bins.append([sizes[name], [name]])
+
+    chunks = []
+    for _, names in bins:
+        names.sort(key=order.get)
+        if len(names) == 1:
+            text = sources[names[0]]
+        else:
+            text = "\n".join(source_label(name) + sources[name] for name in names)
+        chunks.append((names, text))
+    chunks.sort(key=lambda chunk: order[chunk[0][0]])
+    return chunks
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Returns the longest boundary-aligned prefix of text that fits max_tokens."""
+    chunks = chunk_by_tokens(text, max_tokens)
+    return chunks[0] if chunks else ""
+
+
+def chunk_text(text, chunk_size=8000, overlap=400):
+    """
+    Splits text into overlapping fixed-size character chunks.
+    This was the analysis chunker before chunk_by_tokens; it is kept for the chunking benchmark.
+    """
+    if not isinstance(text, str):
+        return []
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        chunks.append(text[start:end])
+        start += chunk_size - overlap
+    return chunks
@@ -2,12 +2,35 @@
 Database utilities for AI tool intelligence platform.
 
 This module contains database connection and utility functions.
+
+Database keeps a pool of connections (psycopg2's ThreadedConnectionPool), so one
+instance can be shared by concurrent tool workers: every method checks a
+connection out for the duration of its statement(s) and returns it afterwards.
+With write batching enabled, snapshot inserts and status updates are queued and
+written by a background flusher in one transaction per flush interval instead of
+one commit per statement.
+
+Raw scraper payloads are kept out of tool_snapshots: each payload is stored once
+in raw_payloads, keyed by the SHA-256 of its canonical JSON, and snapshots refer
+to it by raw_data_hash, so identical payloads are shared across weeks and the
+snapshot rows stay small. Snapshots written before that keep raw_data inline.
+By default a payload is stored as compressed per-source frames (see raw_frames.py)
+in raw_payload_frames; fetch_raw_payload() and fetch_snapshot_raw_data() read any
+of these layouts and can inflate just the sources a caller asks for.
 """
 import os
+import json
+import time
+import hashlib
 import logging
+import threading
 import psycopg2
 import datetime
+from contextlib import contextmanager
 from psycopg2.extras import DictCursor, Json
+from psycopg2.pool import ThreadedConnectionPool
+
+from raw_frames import RAW_FRAME_CODEC, decode_frame, encode_payload
 
 
 # Database configuration
@@ -17,102 +40,541 @@ DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
 
+# Connection pool bounds; callers beyond DB_POOL_MAX wait for a free connection.
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "8"))
+
+# Queue writes and commit them in one transaction every DB_FLUSH_INTERVAL_SECONDS, or as soon as
+# DB_BATCH_MAX_STATEMENTS are pending. Queued writes are flushed on close().
+DB_WRITE_BATCHING = os.getenv("DB_WRITE_BATCHING", "false").lower() in ("1", "true", "yes")
+DB_FLUSH_INTERVAL_SECONDS = float(os.getenv("DB_FLUSH_INTERVAL_SECONDS", "2"))
+DB_BATCH_MAX_STATEMENTS = int(os.getenv("DB_BATCH_MAX_STATEMENTS", "100"))
+
+# Claimed tools are leased to one collector; the lease is renewed by its heartbeat while the tool
+# is processed and expires if the collector dies, after which another collector can claim the tool.
+TOOL_LEASE_SECONDS = int(os.getenv("TOOL_LEASE_SECONDS", "900"))
+TOOL_FAILED_RETRY_SECONDS = int(os.getenv("TOOL_FAILED_RETRY_SECONDS", "3600"))
+
+# "frames" stores every source of a raw payload as its own compressed frame; "jsonb" stores the
+# payload as a single JSONB value in raw_payloads.
+RAW_PAYLOAD_FORMAT = os.getenv("RAW_PAYLOAD_FORMAT", "frames")
+
+_PENDING_RUN_STATUS = "t.run_status IS NULL OR t.run_status = 'update' OR t.run_status = 'failed'"
+# Pending tools without a live lease: not claimed by a collector and, if failed, past the retry delay.
+_PENDING_TOOL = f"({_PENDING_RUN_STATUS}) AND (t.lease_expires_at IS NULL OR t.lease_expires_at < now())"
+
+# Tools with their URLs joined once and pivoted into a {url_type: url} object.
+_TOOLS_QUERY = """
+    SELECT
+        t.id,
+        t.name,
+        t.description,
+        t.category,
+        t.github_url,
+        t.stock_symbol,
+        t.status,
+        t.run_status,
+        t.last_run,
+        COALESCE(
+            jsonb_object_agg(u.url_type, u.url) FILTER (WHERE u.url_type IS NOT NULL),
+            '{{}}'::jsonb
+        ) AS urls
+    FROM
+        ai_tools t
+        LEFT JOIN tool_urls u ON u.tool_id = t.id
+    WHERE
+        {where}
+    GROUP BY
+        t.id
+    ORDER BY
+        t.id;
+"""
+
+
+def _p95(values: list):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(int(round(0.95 * (len(ordered) - 1))), len(ordered) - 1)] * 1000, 1)
+
+
+# URL types that callers expect as `<url_type>_url` keys even when a tool has no such URL.
+STANDARD_URL_TYPES = ("website", "documentation", "blog", "changelog")
+
+
+def _with_url_columns(tool: dict) -> dict:
+    """Adds a `<url_type>_url` key for each of a tool's URLs; columns of ai_tools (e.g. github_url) take precedence."""
+    for url_type in STANDARD_URL_TYPES:
+        tool.setdefault(f"{url_type}_url", None)
+    for url_type, url in (tool.get("urls") or {}).items():
+        key = f"{url_type}_url"
+        if tool.get(key) is None:
+            tool[key] = url
+    return tool
+
+
+def raw_payload_json(raw_data_dict: dict):
+    """Returns (canonical JSON, SHA-256 hex digest) of a raw payload; equal payloads get equal hashes."""
+    payload_json = json.dumps(raw_data_dict, sort_keys=True, separators=(",", ":"), default=str)
+    return payload_json, hashlib.sha256(payload_json.encode("utf-8")).hexdigest()
+
+
+# Stored dictionaries never change, so they are cached by id for the life of the process.
+_raw_dictionaries = {}
+_raw_dictionaries_lock = threading.Lock()
+
+
+def load_raw_dictionary(conn, dictionary_id):
+    """Returns the compression dictionary with the given id, or None for frames without one."""
+    if dictionary_id is None:
+        return None
+    with _raw_dictionaries_lock:
+        if dictionary_id in _raw_dictionaries:
+            return _raw_dictionaries[dictionary_id]
+    with conn.cursor() as cur:
+        cur.execute("SELECT dictionary FROM raw_payload_dictionaries WHERE id = %s", (dictionary_id,))
+        row = cur.fetchone()
+    if not row:
+        raise ValueError(f"Raw payload dictionary {dictionary_id} does not exist.")
+    with _raw_dictionaries_lock:
+        _raw_dictionaries[dictionary_id] = bytes(row[0])
+        return _raw_dictionaries[dictionary_id]
+
+
+def latest_raw_dictionary(conn):
+    """Returns (id, dictionary) of the most recently trained dictionary, or (None, None)."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM raw_payload_dictionaries WHERE codec = %s ORDER BY id DESC LIMIT 1", (RAW_FRAME_CODEC,))
+        row = cur.fetchone()
+    if not row:
+        return None, None
+    return row[0], load_raw_dictionary(conn, row[0])
+
+
+def fetch_raw_payload(conn, payload_hash, sources=None):
+    """
+    Reads a raw payload from raw_payloads, whichever format it was stored in.
+    :param sources: Source keys to return (e.g. ["github_data"]); only their frames are inflated.
+                    None returns the whole payload.
+    :return: The payload (or the requested part of it) as a dict, or None if there is no such payload.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT format, payload, dictionary_id FROM raw_payloads WHERE hash = %s", (payload_hash,))
+        row = cur.fetchone()
+        if not row:
+            return None
+        payload_format, payload, dictionary_id = row
+        if payload_format != "frames":
+            payload = payload or {}
+            return payload if sources is None else {key: value for key, value in payload.items() if key in sources}
+        if sources is None:
+            cur.execute(
+                "SELECT source, data FROM raw_payload_frames WHERE payload_hash = %s ORDER BY position",
+                (payload_hash,)
+            )
+        else:
+            cur.execute(
+                "SELECT source, data FROM raw_payload_frames WHERE payload_hash = %s AND source = ANY(%s) ORDER BY position",
+                (payload_hash, list(sources))
+            )
+        frames = cur.fetchall()
+    dictionary = load_raw_dictionary(conn, dictionary_id)
+    return {source: decode_frame(data, dictionary) for source, data in frames}
+
+
+def fetch_snapshot_raw_data(conn, snapshot_id, sources=None):
+    """Reads the raw payload of a snapshot (see fetch_raw_payload), or None if it has none."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT raw_data_hash, raw_data FROM tool_snapshots WHERE id = %s", (snapshot_id,))
+        row = cur.fetchone()
+    if not row:
+        return None
+    payload_hash, inline_raw_data = row
+    if payload_hash:
+        return fetch_raw_payload(conn, payload_hash, sources)
+    if inline_raw_data is None or sources is None:
+        return inline_raw_data
+    return {key: value for key, value in inline_raw_data.items() if key in sources}
+
+
+class DatabaseStats:
+    """Thread-safe pool wait and commit latency metrics of a Database."""
 
-class Database:
     def __init__(self):
-        self.conn = self._get_connection()
+        self._lock = threading.Lock()
+        self.pool_waits = []
+        self.commits = []
+        self.statements = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    def record_pool_wait(self, seconds: float):
+        with self._lock:
+            self.pool_waits.append(seconds)
+
+    def record_commit(self, seconds: float, statements: int, batched: bool = False):
+        with self._lock:
+            self.commits.append(seconds)
+            self.statements += statements
+            if batched:
+                self.batches += 1
+
+    def record_failed_batch(self):
+        with self._lock:
+            self.failed_batches += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            pool_waits = list(self.pool_waits)
+            commits = list(self.commits)
+            stats = {
+                "statements": self.statements,
+                "commits": len(commits),
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+            }
+        stats.update({
+            "pool_checkouts": len(pool_waits),
+            "pool_wait_total_s": round(sum(pool_waits), 3),
+            "pool_wait_p95_ms": _p95(pool_waits),
+            "commit_total_s": round(sum(commits), 3),
+            "commit_p95_ms": _p95(commits),
+        })
+        return stats
+
+    def log_stats(self):
+        """Logs the pool wait and commit latency metrics of this run."""
+        logging.info(f"Database stats: {self.summary()}")
+
+
+class Database:
+    def __init__(self, max_connections: int = None, write_batching: bool = None):
+        self.max_connections = max(max_connections or DB_POOL_MAX, 1)
+        self.write_batching = DB_WRITE_BATCHING if write_batching is None else write_batching
+        self.stats = DatabaseStats()
+        # ThreadedConnectionPool raises instead of blocking when it is exhausted, so checkouts
+        # are gated by a semaphore of the same size and callers queue on it.
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._conn = None
+        self._raw_dictionary = None
+        self.pool = self._create_pool()
 
-    def _get_connection(self):
-        """Establishes a connection to the PostgreSQL database."""
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_flusher = threading.Event()
+        self._flusher = None
+        if self.pool and self.write_batching:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="db-flusher", daemon=True)
+            self._flusher.start()
+
+    def _create_pool(self):
+        """Creates the PostgreSQL connection pool."""
         try:
-            conn = psycopg2.connect(
+            pool = ThreadedConnectionPool(
+                min(DB_POOL_MIN, self.max_connections),
+                self.max_connections,
                 dbname=DB_NAME,
                 user=DB_USER,
                 password=DB_PASSWORD,
                 host=DB_HOST,
                 port=DB_PORT
             )
-            logging.info("Successfully connected to the database.")
-            return conn
+            logging.info(f"Successfully connected to the database (pool of up to {self.max_connections} connections).")
+            return pool
         except psycopg2.OperationalError as e:
             logging.error(f"Could not connect to the database: {e}")
             return None
 
+    @property
+    def conn(self):
+        """
+        A connection reserved for direct use by scripts (e.g. check_cursor.py), checked out on first
+        access and returned on close(). None if the database is unavailable.
+        """
+        if self._conn is None and self.pool:
+            self._conn = self._checkout()
+        return self._conn
+
+    def _checkout(self):
+        started = time.monotonic()
+        self._slots.acquire()
+        try:
+            conn = self.pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+        self.stats.record_pool_wait(time.monotonic() - started)
+        return conn
+
+    def _checkin(self, conn):
+        # The pool rolls back any transaction left open (e.g. by a read) and drops broken connections.
+        self.pool.putconn(conn, close=bool(conn.closed))
+        self._slots.release()
+
+    @contextmanager
+    def _connection(self):
+        """Checks a connection out of the pool for the duration of the block."""
+        conn = self._checkout()
+        try:
+            yield conn
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self._checkin(conn)
+
+    def _commit(self, conn, statements: int, batched: bool = False):
+        started = time.monotonic()
+        conn.commit()
+        self.stats.record_commit(time.monotonic() - started, statements, batched)
+
+    def _write(self, sql: str, params: tuple):
+        """Executes a write now, or queues it for the next flush in write-batching mode."""
+        if self.write_batching:
+            with self._pending_lock:
+                self._pending.append((sql, params))
+                flush_now = len(self._pending) >= DB_BATCH_MAX_STATEMENTS
+            if flush_now:
+                self.flush()
+            return
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+            self._commit(conn, 1)
+
+    def _flush_periodically(self):
+        while not self._stop_flusher.wait(DB_FLUSH_INTERVAL_SECONDS):
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Background database flush failed: {e}")
+
+    def flush(self):
+        """Writes all queued statements in one transaction."""
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                with self._connection() as conn:
+                    with conn.cursor() as cur:
+                        for sql, params in batch:
+                            cur.execute(sql, params)
+                    self._commit(conn, len(batch), batched=True)
+                return
+            except psycopg2.Error as e:
+                self.stats.record_failed_batch()
+                logging.error(f"Batched write of {len(batch)} statement(s) failed, retrying them one by one: {e}")
+            # One bad statement must not cost the rest of the batch.
+            for sql, params in batch:
+                try:
+                    with self._connection() as conn:
+                        with conn.cursor() as cur:
+                            cur.execute(sql, params)
+                        self._commit(conn, 1)
+                except psycopg2.Error as e:
+                    logging.error(f"Dropping write that failed on its own: {e}")
+
     def get_tools_to_process(self):
         """
         Fetches tools that need to be processed and their associated URLs.
+        URLs are joined once and pivoted into a {url_type: url} object, so every url_type in
+        tool_urls is returned as `urls` and as a `<url_type>_url` key without query changes.
+        Tools with a live lease (claimed by a collector, or failed within TOOL_FAILED_RETRY_SECONDS)
+        are left out, exactly as in claim_tools.
         """
-        if not self.conn:
+        if not self.pool:
             return []
-        with self.conn.cursor(cursor_factory=DictCursor) as cur:
-            cur.execute("""
-                SELECT
-                    t.id,
-                    t.name,
-                    t.description,
-                    t.category,
-                    t.github_url,
-                    t.stock_symbol,
-                    t.status,
-                    t.run_status,
-                    t.last_run,
-                    (SELECT url FROM tool_urls WHERE tool_id = t.id AND url_type = 'website') AS website_url,
-                    (SELECT url FROM tool_urls WHERE tool_id = t.id AND url_type = 'documentation') AS documentation_url,
-                    (SELECT url FROM tool_urls WHERE tool_id = t.id AND url_type = 'blog') AS blog_url,
-                    (SELECT url FROM tool_urls WHERE tool_id = t.id AND url_type = 'changelog') AS changelog_url
-                FROM
-                    ai_tools t
-                WHERE
-                    t.run_status IS NULL OR t.run_status = 'update' OR t.run_status = 'failed'
-                ORDER BY
-                    t.id;
-            """)
+        with self._connection() as conn, conn.cursor(cursor_factory=DictCursor) as cur:
+            cur.execute(_TOOLS_QUERY.format(where=_PENDING_TOOL))
             tools = cur.fetchall()
-            return [dict(row) for row in tools]
+            return [_with_url_columns(dict(row)) for row in tools]
 
-    def update_tool_run_status(self, tool_id, status, error_message=None):
-        """Updates the run status of a tool."""
-        if not self.conn:
-            return
-        with self.conn.cursor() as cur:
+    def count_tools_to_process(self) -> int:
+        """Counts the tools get_tools_to_process and claim_tools would currently return."""
+        if not self.pool:
+            return 0
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(f"SELECT count(*) FROM ai_tools t WHERE {_PENDING_TOOL}")
+            return cur.fetchone()[0]
+
+    def claim_tools(self, worker_id: str, limit: int, lease_seconds: int = TOOL_LEASE_SECONDS) -> list:
+        """
+        Claims up to `limit` pending tools for a worker and returns them like get_tools_to_process.
+        Rows locked by a concurrent claim are skipped (FOR UPDATE SKIP LOCKED), so collectors
+        never claim the same tool; a claim lasts until its lease expires unless it is renewed.
+        """
+        if not self.pool or limit <= 0:
+            return []
+        with self._connection() as conn, conn.cursor(cursor_factory=DictCursor) as cur:
+            cur.execute(f"""
+                WITH claimable AS (
+                    SELECT t.id FROM ai_tools t
+                    WHERE {_PENDING_TOOL}
+                    ORDER BY t.id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE ai_tools t
+                SET claimed_by = %s, lease_expires_at = now() + make_interval(secs => %s)
+                FROM claimable
+                WHERE t.id = claimable.id
+                RETURNING t.id
+            """, (limit, worker_id, lease_seconds))
+            claimed_ids = [row[0] for row in cur.fetchall()]
+            tools = []
+            if claimed_ids:
+                cur.execute(_TOOLS_QUERY.format(where="t.id = ANY(%s)"), (claimed_ids,))
+                tools = [_with_url_columns(dict(row)) for row in cur.fetchall()]
+            self._commit(conn, 1)
+        return tools
+
+    def renew_tool_leases(self, worker_id: str, tool_ids: list, lease_seconds: int = TOOL_LEASE_SECONDS) -> list:
+        """Extends the worker's leases on the given tools and returns the ids whose lease was lost."""
+        if not self.pool or not tool_ids:
+            return []
+        with self._connection() as conn, conn.cursor() as cur:
             cur.execute(
-                "UPDATE ai_tools SET run_status = %s, last_run = %s, error_message = %s WHERE id = %s",
-                (status, datetime.datetime.now(), error_message, tool_id)
+                """
+                UPDATE ai_tools SET lease_expires_at = now() + make_interval(secs => %s)
+                WHERE id = ANY(%s) AND claimed_by = %s
+                RETURNING id
+                """,
+                (lease_seconds, list(tool_ids), worker_id)
             )
-        self.conn.commit()
+            renewed = {row[0] for row in cur.fetchall()}
+            self._commit(conn, 1)
+        return [tool_id for tool_id in tool_ids if tool_id not in renewed]
+
+    def update_tool_run_status(self, tool_id, status, error_message=None):
+        """
+        Updates the run status of a tool and releases its claim. A failed tool stays leased
+        for TOOL_FAILED_RETRY_SECONDS so collectors do not retry it straight away.
+        """
+        if not self.pool:
+            return
+        self._write(
+            """
+            UPDATE ai_tools
+            SET run_status = %s, last_run = %s, error_message = %s, claimed_by = NULL,
+                lease_expires_at = CASE WHEN %s = 'failed' THEN now() + make_interval(secs => %s) END
+            WHERE id = %s
+            """,
+            (status, datetime.datetime.now(), error_message, status, TOOL_FAILED_RETRY_SECONDS, tool_id)
+        )
 
     def create_snapshot(self, tool_id, structured_data_dict, raw_data_dict):
         """Creates a new snapshot for a tool, breaking down data into respective columns."""
-        if not self.conn:
+        if not self.pool:
             return
 
         basic_info = structured_data_dict.get('basic_info')
         technical_details = structured_data_dict.get('technical_details')
         company_info = structured_data_dict.get('company_info')
         community_metrics = structured_data_dict.get('community_metrics')
+        payload_json, payload_hash = raw_payload_json(raw_data_dict)
+        snapshot_values = (
+            tool_id,
+            datetime.datetime.now(),
+            Json(basic_info),
+            Json(technical_details),
+            Json(company_info),
+            Json(community_metrics),
+            payload_hash
+        )
+        insert_snapshot = """
+            INSERT INTO tool_snapshots (
+                tool_id, snapshot_date, basic_info, technical_details,
+                company_info, community_metrics, raw_data_hash
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
 
-        with self.conn.cursor() as cur:
-            cur.execute(
+        # One statement, so the payload and the snapshot referencing it are written (or batched) together.
+        # A payload that is already stored is neither inserted nor compressed into frames again.
+        if RAW_PAYLOAD_FORMAT != "frames":
+            self._write(
                 """
-                INSERT INTO tool_snapshots (
-                    tool_id, snapshot_date, basic_info, technical_details, 
-                    company_info, community_metrics, raw_data
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    tool_id, 
-                    datetime.datetime.now(), 
-                    Json(basic_info), 
-                    Json(technical_details), 
-                    Json(company_info), 
-                    Json(community_metrics),
-                    Json(raw_data_dict)
+                WITH payload AS (
+                    INSERT INTO raw_payloads (hash, format, payload, size_bytes)
+                    VALUES (%s, 'jsonb', %s::jsonb, %s)
+                    ON CONFLICT (hash) DO NOTHING
                 )
+                """ + insert_snapshot,
+                (payload_hash, payload_json, len(payload_json.encode("utf-8"))) + snapshot_values
             )
-        self.conn.commit()
+            return
+
+        dictionary_id, dictionary = self._get_raw_dictionary()
+        frames = encode_payload(raw_data_dict, dictionary)
+        self._write(
+            """
+            WITH payload AS (
+                INSERT INTO raw_payloads (hash, format, dictionary_id, size_bytes, stored_bytes)
+                VALUES (%s, 'frames', %s, %s, %s)
+                ON CONFLICT (hash) DO NOTHING
+                RETURNING hash
+            ), frames AS (
+                INSERT INTO raw_payload_frames (payload_hash, position, source, data, raw_size)
+                SELECT payload.hash, frame.position, frame.source, frame.data, frame.raw_size
+                FROM payload, unnest(%s::int[], %s::text[], %s::bytea[], %s::int[]) AS frame(position, source, data, raw_size)
+            )
+            """ + insert_snapshot,
+            (
+                payload_hash,
+                dictionary_id,
+                len(payload_json.encode("utf-8")),
+                sum(len(frame) for _, frame, _ in frames),
+                list(range(len(frames))),
+                [source for source, _, _ in frames],
+                [psycopg2.Binary(frame) for _, frame, _ in frames],
+                [raw_size for _, _, raw_size in frames],
+            ) + snapshot_values
+        )
+
+    def _get_raw_dictionary(self):
+        """Returns (id, dictionary) used to compress new payloads; loaded once per Database."""
+        if self._raw_dictionary is None:
+            with self._connection() as conn:
+                self._raw_dictionary = latest_raw_dictionary(conn)
+        return self._raw_dictionary
+
+    def get_snapshot_raw_data(self, snapshot_id, sources=None):
+        """Returns the raw payload of a snapshot, or only the given sources of it; None if it has none."""
+        if not self.pool:
+            return None
+        with self._connection() as conn:
+            return fetch_snapshot_raw_data(conn, snapshot_id, sources)
+
+    def get_latest_analysis_cache(self, tool_id):
+        """Returns the analysis cache stored in the raw_data of a tool's latest snapshot, or an empty dict."""
+        if not self.pool:
+            return {}
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id FROM tool_snapshots WHERE tool_id = %s ORDER BY snapshot_date DESC LIMIT 1",
+                    (tool_id,)
+                )
+                row = cur.fetchone()
+            # Only the cache's own frame is inflated, not the scraped content next to it.
+            raw_data = fetch_snapshot_raw_data(conn, row[0], ["_analysis_cache"]) if row else None
+        return (raw_data or {}).get("_analysis_cache") or {}
 
     def close(self):
-        """Closes the database connection."""
-        if self.conn:
-            self.conn.close()
-            logging.info("Database connection closed.")
\ No newline at end of file
+        """Flushes queued writes and closes all database connections."""
+        if not self.pool:
+            return
+        if self._flusher:
+            self._stop_flusher.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        if self._conn is not None:
+            self._checkin(self._conn)
+            self._conn = None
+        self.pool.closeall()
+        self.pool = None
+        logging.info("Database connection closed.")
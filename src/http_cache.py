@@ -0,0 +1,135 @@
+"""
+On-disk response cache for the scraper HTTP client.
+
+Successful GET responses from slow-changing APIs (PyPI, npm, GitHub, ...) are
+kept in a SQLite file keyed by method, URL and query parameters, so re-running
+a failed or updated tool does not refetch every source from scratch. Each host
+has its own time-to-live; once an entry is stale it is revalidated with
+If-None-Match / If-Modified-Since when the API supplied an ETag or
+Last-Modified header. For hosts where we probe guessed names, 404s are
+remembered as well (negative caching).
+"""
+import os
+import json
+import hashlib
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from cache_store import SqliteLRUStore
+
+
+# Response cache configuration
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", os.path.join(".cache", "http_cache.sqlite3"))
+HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", "256"))
+
+HOUR = 3600
+
+# Time-to-live per host in seconds. Hosts that are not listed are never cached.
+# All TTLs are well below a week so every weekly run still sees fresh data.
+CACHE_TTLS = {
+    "pypi.org": 24 * HOUR,
+    "registry.npmjs.org": 24 * HOUR,
+    "api.npmjs.org": 12 * HOUR,
+    "api.github.com": 6 * HOUR,
+    "api.stackexchange.com": 12 * HOUR,
+    "www.googleapis.com": 12 * HOUR,
+    "hn.algolia.com": 6 * HOUR,
+    "newsapi.org": 6 * HOUR,
+    "dev.to": 6 * HOUR,
+    "medium.com": 6 * HOUR,
+}
+
+# How long a 404 is remembered per host, in seconds. Only hosts where we probe
+# guessed names (PyPI package lookups) are listed; these outlive the weekly run so
+# names that do not exist are not re-probed every week.
+NEGATIVE_CACHE_TTLS = {
+    "pypi.org": int(os.getenv("PYPI_NEGATIVE_CACHE_DAYS", "30")) * 24 * HOUR,
+}
+
+# Response headers kept with a cached body.
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class ResponseCache:
+    """Persistent, TTL-aware cache of HTTP responses."""
+
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_MB * 1024 * 1024):
+        self.store = SqliteLRUStore(path, max_bytes, name="HTTP response cache")
+
+    @staticmethod
+    def ttl_for(url: str) -> int:
+        """Returns the TTL configured for a URL's host, or 0 if it should not be cached."""
+        return CACHE_TTLS.get(urlsplit(url).hostname or "", 0)
+
+    @staticmethod
+    def negative_ttl_for(url: str) -> int:
+        """Returns how long a 404 from a URL's host is remembered, or 0 if it should not be."""
+        return NEGATIVE_CACHE_TTLS.get(urlsplit(url).hostname or "", 0)
+
+    @staticmethod
+    def make_key(method: str, url: str, params: dict = None) -> str:
+        """Builds the cache key from method, URL and sorted query parameters."""
+        raw = json.dumps([method.upper(), url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str):
+        """Returns the cached entry as (response, meta, stored_at), or None."""
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        body, meta, stored_at = entry
+        return self._build_response(body, meta), meta, stored_at
+
+    def save(self, key: str, response: requests.Response):
+        """Stores a response body together with its validators."""
+        meta = {
+            "status_code": response.status_code,
+            "encoding": response.encoding,
+            # The query string can carry API keys, so only the path is kept for debugging.
+            "url": response.url.split("?", 1)[0],
+            "headers": {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers},
+        }
+        self.store.put(key, response.content, meta)
+
+    @staticmethod
+    def validator_headers(meta: dict) -> dict:
+        """Returns conditional request headers for revalidating a stale entry."""
+        headers = meta.get("headers", {})
+        conditional = {}
+        if headers.get("ETag"):
+            conditional["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            conditional["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional
+
+    @staticmethod
+    def _build_response(body: bytes, meta: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = meta.get("status_code", 200)
+        response._content = body
+        response.encoding = meta.get("encoding")
+        response.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        response.url = meta.get("url", "")
+        response.reason = "Cached"
+        return response
+
+    def log_stats(self):
+        self.store.log_stats()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Returns the process-wide ResponseCache, or None when caching is disabled."""
+    global _cache
+    if not HTTP_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
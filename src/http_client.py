@@ -0,0 +1,189 @@
+"""
+Shared HTTP client for the scraper tools.
+
+All scrapers send their requests through a single pooled, keep-alive
+requests.Session so that repeated calls to the same host (api.github.com,
+registry.npmjs.org, ...) reuse connections instead of paying a new TCP+TLS
+handshake every time. The client also applies per-host connection limits,
+retry with backoff and uniform timeouts, serves cacheable GETs from the
+on-disk response cache, and counts connection reuse and bytes transferred
+for the end-of-run report.
+"""
+import os
+import time
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from http_cache import get_response_cache
+
+
+# HTTP client configuration
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP_READ_TIMEOUT_SECONDS = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "15"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "8"))
+HTTP_MAX_HOSTS = int(os.getenv("HTTP_MAX_HOSTS", "32"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+
+
+class HttpStats:
+    """Thread-safe counters for requests, new connections and bytes transferred."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.new_connections = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def record_request(self, bytes_sent: int, bytes_received: int):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+
+    def record_error(self):
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            reused = max(self.requests - self.new_connections, 0)
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "new_connections": self.new_connections,
+                "reused_connections": reused,
+                "connection_reuse_rate": round(reused / self.requests, 3) if self.requests else 0.0,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+            }
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every newly opened connection."""
+
+    def __init__(self, stats: HttpStats, **kwargs):
+        # Must be set before HTTPAdapter.__init__, which calls init_poolmanager.
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self._stats
+
+        def counting(pool_cls):
+            class CountingPool(pool_cls):
+                def _new_conn(self):
+                    stats.record_new_connection()
+                    return super()._new_conn()
+            return CountingPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": counting(HTTPConnectionPool),
+            "https": counting(HTTPSConnectionPool),
+        }
+
+
+class HttpClient:
+    """A pooled keep-alive session shared by every scraper."""
+
+    def __init__(self):
+        self.stats = HttpStats()
+        self.timeout = (HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS)
+
+        retry = Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=HTTP_BACKOFF_FACTOR,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,  # Callers inspect status codes themselves.
+        )
+        adapter = _CountingAdapter(
+            self.stats,
+            pool_connections=HTTP_MAX_HOSTS,
+            pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST,
+            pool_block=True,  # Wait for a free connection instead of exceeding the per-host limit.
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, url: str, headers: dict = None, params: dict = None,
+                json: dict = None, timeout=None) -> requests.Response:
+        """
+        Sends a request through the shared session. Network errors propagate as requests exceptions.
+        GET requests to hosts with a cache TTL are served from the on-disk response cache when fresh
+        (including remembered 404s for negatively cached hosts), and stale entries are revalidated
+        with conditional headers where the API supports them.
+        """
+        cache = get_response_cache() if method.upper() == "GET" else None
+        ttl = cache.ttl_for(url) if cache else 0
+        negative_ttl = cache.negative_ttl_for(url) if cache else 0
+        cached = None
+        if ttl or negative_ttl:
+            key = cache.make_key(method, url, params)
+            cached = cache.lookup(key)
+            if cached:
+                cached_response, meta, stored_at = cached
+                is_negative = cached_response.status_code == 404
+                if time.time() - stored_at < (negative_ttl if is_negative else ttl):
+                    cache.store.count("hits")
+                    if is_negative:
+                        cache.store.count("negative_hits")
+                    return cached_response
+                headers = {**(headers or {}), **cache.validator_headers(meta)}
+
+        response = self._send(method, url, headers, params, json, timeout)
+
+        if ttl or negative_ttl:
+            if response.status_code == 304 and cached:
+                cache.store.touch(key)
+                cache.store.count("hits")
+                cache.store.count("revalidations")
+                return cached_response
+            cache.store.count("misses")
+            if (response.status_code == 200 and ttl) or (response.status_code == 404 and negative_ttl):
+                cache.save(key, response)
+        return response
+
+    def _send(self, method, url, headers, params, json, timeout) -> requests.Response:
+        try:
+            response = self.session.request(
+                method, url, headers=headers, params=params, json=json,
+                timeout=timeout or self.timeout
+            )
+        except requests.RequestException:
+            self.stats.record_error()
+            raise
+        body = response.request.body
+        self.stats.record_request(len(body) if body else 0, len(response.content or b""))
+        return response
+
+    def log_stats(self):
+        """Logs the connection reuse and transfer counters for this run."""
+        logging.info(f"HTTP client stats: {self.stats.summary()}")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Returns the process-wide HttpClient, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
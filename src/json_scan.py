@@ -0,0 +1,172 @@
+"""
+Single-pass extraction of JSON objects from model responses.
+
+Each top-level '{' is first matched to its closing brace by a string-aware scanner
+that only steps through braces and whole strings; only closed spans are decoded,
+with the C-accelerated JSONDecoder.raw_decode (too deeply nested ones count as not
+JSON rather than raising RecursionError). A closed span that is not
+JSON (prose like "{employee_count}" or "{ mode: 'agent' }") is skipped whole, so
+nothing inside it is scanned again.
+
+An unclosed '{' that starts a JSON object ('{' followed by a key, or the first '{'
+of a ```json fence) is a truncated answer: scanning stops there instead of
+returning one of its complete children. Any other unclosed '{' is a stray brace in
+prose and is skipped on its own. The scan that finds it unclosed records the
+matching brace of every '{' after it, so later candidates are not rescanned and
+extraction stays linear in the response length.
+"""
+import re
+import json
+
+
+JSON_FENCE_OPEN = "```json"
+
+_STRUCTURAL = re.compile(r'[{}"\\]')
+# Whole strings are matched by the regex engine, so only braces and strings reach Python.
+_BRACE_OR_STRING = re.compile(r'[{}]|"[^"\\]*(?:\\.[^"\\]*)*"|"', re.DOTALL)
+_OBJECT_START = re.compile(r'\{\s*"')
+_DECODER = json.JSONDecoder()
+
+
+class BalancedSpanScanner:
+    """
+    Incremental balanced_span_end for text that arrives in pieces (e.g. a streamed response).
+    The first piece must start at the '{' whose closing brace is wanted.
+    """
+
+    def __init__(self):
+        self.end = -1
+        self._offset = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape_pending = False
+
+    def feed(self, text: str) -> int:
+        """
+        Adds the next piece of text and returns the index (in all text fed so far) just past
+        the balancing '}', or -1 while the object is still open.
+        """
+        if self.end >= 0:
+            return self.end
+        offset = self._offset
+        self._offset += len(text)
+        # A backslash that ended the previous piece escapes the first character of this one.
+        skip_until = 1 if self._escape_pending else -1
+        self._escape_pending = False
+        for match in _STRUCTURAL.finditer(text):
+            position = match.start()
+            if position < skip_until:
+                continue  # escaped character
+            char = match.group()
+            if self._in_string:
+                if char == "\\":
+                    skip_until = position + 2
+                    self._escape_pending = skip_until > len(text)
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = offset + position + 1
+                    return self.end
+        return -1
+
+
+def _match_braces(text: str, start: int, known: dict) -> int:
+    """
+    Scans from the '{' at text[start] to the '}' that balances it and returns the index just
+    past it, or -1 if it is never closed. The end of every '{' met on the way (outside strings)
+    is recorded in known, and braces left open are recorded as -1.
+    """
+    stack = []
+    for match in _BRACE_OR_STRING.finditer(text, start):
+        char = match.group()
+        if char == "{":
+            stack.append(match.start())
+        elif char == "}":
+            if stack:
+                known.setdefault(stack.pop(), match.end())
+                if not stack:
+                    return match.end()
+        elif len(char) == 1:
+            break  # an unterminated string runs to the end of the text
+    for position in stack:
+        known.setdefault(position, -1)
+    return -1
+
+
+def balanced_span_end(text: str, start: int) -> int:
+    """
+    Returns the index just past the '}' that balances the '{' at text[start],
+    or -1 if the object is never closed. Braces inside strings are ignored.
+    """
+    return _match_braces(text, start, {})
+
+
+def _iter_spans(text: str, start: int = 0, fenced: bool = False):
+    """
+    Yields (start, end) of each top-level JSON object in text, in order, and (start, -1) for a
+    truncated object, after which the scan stops. fenced marks text[start:] as the body of a
+    ```json fence, whose first '{' is the answer.
+    """
+    known = {}
+    position = start
+    first = True
+    while True:
+        object_start = text.find("{", position)
+        if object_start < 0:
+            return
+        span_end = known[object_start] if object_start in known else _match_braces(text, object_start, known)
+        if span_end < 0:
+            if (fenced and first) or _OBJECT_START.match(text, object_start):
+                yield object_start, -1
+                return
+            first = False
+            position = object_start + 1  # a stray brace in prose
+            continue
+        first = False
+        try:
+            value, object_end = _DECODER.raw_decode(text, object_start)
+            if isinstance(value, dict):
+                yield object_start, object_end
+                position = object_end
+                continue
+        except (ValueError, RecursionError):
+            pass
+        # Not JSON: skip the whole balanced span so nothing inside it is decoded again.
+        position = span_end
+
+
+def iter_json_objects(text: str, start: int = 0):
+    """Yields (start, end) of each top-level span of text that is a valid JSON object, in order."""
+    for object_start, object_end in _iter_spans(text, start):
+        if object_end < 0:
+            return
+        yield object_start, object_end
+
+
+def find_json_objects(text: str) -> list:
+    """Returns every top-level JSON object in text as a string, in order."""
+    if not text:
+        return []
+    return [text[start:end] for start, end in iter_json_objects(text)]
+
+
+def extract_first_json_object(text: str) -> str:
+    """
+    Returns the first top-level JSON object in text, preferring one inside a ```json
+    fence, or an empty string if there is none or the answer is truncated.
+    """
+    if not text:
+        return ""
+    fence = text.find(JSON_FENCE_OPEN)
+    if fence >= 0:
+        for start, end in _iter_spans(text, fence + len(JSON_FENCE_OPEN), fenced=True):
+            return text[start:end] if end >= 0 else ""
+    for start, end in _iter_spans(text):
+        return text[start:end] if end >= 0 else ""
+    return ""
@@ -0,0 +1,66 @@
+"""
+On-disk cache of LLM responses.
+
+Chunk analyses and syntheses are keyed by a hash of the model id, the sampling
+temperature and the exact prompt text. A re-run over unchanged sources builds
+byte-identical prompts, so those calls are answered from disk without spending
+tokens or waiting on Bedrock.
+"""
+import os
+import json
+import hashlib
+import threading
+
+from cache_store import SqliteLRUStore
+
+
+# LLM cache configuration
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "128"))
+
+
+class LLMResultCache:
+    """Persistent, content-addressed cache of model responses."""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_bytes: int = LLM_CACHE_MAX_MB * 1024 * 1024):
+        self.store = SqliteLRUStore(path, max_bytes, name="LLM result cache")
+
+    @staticmethod
+    def make_key(model_id: str, temperature: float, prompt: str) -> str:
+        """Builds the cache key from the model id, temperature and prompt text."""
+        raw = json.dumps([model_id, temperature, prompt])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Returns the cached response text, or None. Counts the lookup as a hit or miss."""
+        entry = self.store.get(key)
+        if entry is None:
+            self.store.count("misses")
+            return None
+        value, meta, _ = entry
+        self.store.count("hits")
+        self.store.count("saved_prompt_chars", meta.get("prompt_chars", 0))
+        return value.decode("utf-8")
+
+    def put(self, key: str, prompt: str, response_text: str):
+        """Stores a response text."""
+        self.store.put(key, response_text.encode("utf-8"), {"prompt_chars": len(prompt)})
+
+    def log_stats(self):
+        self.store.log_stats()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Returns the process-wide LLMResultCache, or None when caching is disabled."""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResultCache()
+        return _cache
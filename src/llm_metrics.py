@@ -0,0 +1,187 @@
+"""
+Instrumentation and budgeting of model calls.
+
+Every Bedrock call records its stage (chunk analysis, synthesis, ...), the tool
+and source it was made for, input/output tokens, total latency and, when
+streamed, the time to the first token and whether the stream was stopped early.
+Retries, errors and LLM cache hits are counted per group as well. At the end of
+the run the metrics are logged as a table and written to a JSON run report.
+
+A per-run token budget (LLM_TOKEN_BUDGET) can cap spending: once it is used up,
+only essential sources are still analyzed and the rest are skipped.
+"""
+import os
+import json
+import logging
+import datetime
+import threading
+
+
+# Total input + output tokens a run may spend on model calls; 0 means unlimited.
+LLM_TOKEN_BUDGET = int(os.getenv("LLM_TOKEN_BUDGET", "0"))
+
+
+def percentile(values: list, fraction: float):
+    """Returns the nearest-rank percentile of a list of numbers, or None if it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def call_context(tool: str, stage: str, source: str = None) -> dict:
+    """Describes what a model call is for; used to group the metrics."""
+    return {"tool": tool, "stage": stage, "source": source}
+
+
+def _latency_stats(latencies: list, prefix: str = "latency") -> dict:
+    stats = {}
+    for label, fraction in (("p50", 0.5), ("p95", 0.95)):
+        value = percentile(latencies, fraction)
+        stats[f"{prefix}_{label}_s"] = round(value, 2) if value is not None else None
+    return stats
+
+
+class LLMCallMetrics:
+    """Thread-safe collection of per-call metrics, grouped by tool, source and stage."""
+
+    _COUNTERS = ("calls", "cache_hits", "retries", "errors", "stopped_early", "input_tokens", "output_tokens", "estimated_calls")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups = {}
+        self.first_token_latencies = []
+        self.started_at = datetime.datetime.now()
+
+    def _group_locked(self, context: dict) -> dict:
+        context = context or {}
+        key = (context.get("tool"), context.get("source"), context.get("stage"))
+        if key not in self._groups:
+            self._groups[key] = {counter: 0 for counter in self._COUNTERS}
+            self._groups[key]["latencies"] = []
+        return self._groups[key]
+
+    def record(self, context: dict, latency_seconds: float, first_token_seconds: float = None,
+               input_tokens: int = 0, output_tokens: int = 0, stopped_early: bool = False,
+               estimated_tokens: bool = False):
+        """Records a completed call. estimated_tokens marks token counts the provider did not report."""
+        with self._lock:
+            group = self._group_locked(context)
+            group["calls"] += 1
+            group["input_tokens"] += input_tokens
+            group["output_tokens"] += output_tokens
+            group["latencies"].append(latency_seconds)
+            if stopped_early:
+                group["stopped_early"] += 1
+            if estimated_tokens:
+                group["estimated_calls"] += 1
+            if first_token_seconds is not None:
+                self.first_token_latencies.append(first_token_seconds)
+
+    def count(self, context: dict, counter: str):
+        """Increments one of the per-group counters (cache_hits, retries, errors)."""
+        with self._lock:
+            self._group_locked(context)[counter] += 1
+
+    def _rows_locked(self) -> list:
+        rows = []
+        for (tool, source, stage), group in sorted(self._groups.items(), key=lambda item: tuple(str(part) for part in item[0])):
+            row = {"tool": tool, "source": source, "stage": stage}
+            row.update({counter: group[counter] for counter in self._COUNTERS})
+            row["latency_total_s"] = round(sum(group["latencies"]), 2)
+            row.update(_latency_stats(group["latencies"]))
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _aggregate(rows: list, key: str) -> dict:
+        totals = {}
+        for row in rows:
+            total = totals.setdefault(row[key] or "-", {counter: 0 for counter in ("calls", "cache_hits", "retries", "errors", "input_tokens", "output_tokens")})
+            for counter in total:
+                total[counter] += row[counter]
+            total["latency_total_s"] = round(total.get("latency_total_s", 0) + row["latency_total_s"], 2)
+        return totals
+
+    def summary(self) -> dict:
+        with self._lock:
+            latencies = [latency for group in self._groups.values() for latency in group["latencies"]]
+            first_token_latencies = list(self.first_token_latencies)
+            totals = {counter: sum(group[counter] for group in self._groups.values()) for counter in self._COUNTERS}
+        totals.update(_latency_stats(latencies))
+        totals.update(_latency_stats(first_token_latencies, prefix="ttft"))
+        return totals
+
+    def report(self, budget=None) -> dict:
+        """Returns the full run report: totals, per-stage and per-tool aggregates and per-group rows."""
+        with self._lock:
+            rows = self._rows_locked()
+        report = {
+            "run_started_at": self.started_at.isoformat(),
+            "generated_at": datetime.datetime.now().isoformat(),
+            "summary": self.summary(),
+            "by_stage": self._aggregate(rows, "stage"),
+            "by_tool": self._aggregate(rows, "tool"),
+            "calls": rows,
+        }
+        if budget is not None:
+            report["token_budget"] = budget.summary()
+        return report
+
+    def write_report(self, directory: str, budget=None) -> str:
+        """Writes the run report as JSON into directory and returns its path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"llm_report_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, "w") as f:
+            json.dump(self.report(budget), f, indent=2, default=str)
+        return path
+
+    def log_stats(self):
+        """Logs run totals and a per-stage table of this run's model calls."""
+        logging.info(f"LLM call stats: {self.summary()}")
+        with self._lock:
+            rows = self._rows_locked()
+        by_stage = self._aggregate(rows, "stage")
+        if by_stage:
+            lines = [f"{'stage':<22}{'calls':>7}{'cached':>8}{'retries':>9}{'errors':>8}{'in_tokens':>11}{'out_tokens':>12}{'seconds':>10}"]
+            for stage, total in by_stage.items():
+                lines.append(
+                    f"{stage:<22}{total['calls']:>7}{total['cache_hits']:>8}{total['retries']:>9}{total['errors']:>8}"
+                    f"{total['input_tokens']:>11}{total['output_tokens']:>12}{total['latency_total_s']:>10}"
+                )
+            logging.info("LLM usage by stage:\n" + "\n".join(lines))
+
+
+class TokenBudget:
+    """A thread-safe per-run token budget; a limit of 0 means unlimited."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self.spent = 0
+        self.skipped_sources = 0
+        self._exhaustion_logged = False
+
+    def spend(self, tokens: int):
+        with self._lock:
+            self.spent += tokens
+            if self.limit and self.spent >= self.limit and not self._exhaustion_logged:
+                self._exhaustion_logged = True
+                logging.warning(f"LLM token budget of {self.limit} exhausted; only essential sources will be analyzed from now on.")
+
+    def exhausted(self) -> bool:
+        with self._lock:
+            return bool(self.limit) and self.spent >= self.limit
+
+    def record_skipped(self, count: int = 1):
+        with self._lock:
+            self.skipped_sources += count
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {"limit": self.limit or None, "spent": self.spent, "skipped_sources": self.skipped_sources}
+
+
+LLM_METRICS = LLMCallMetrics()
+LLM_BUDGET = TokenBudget(LLM_TOKEN_BUDGET)
@@ -2,7 +2,14 @@ import os
 import logging
 import datetime
 import json
-import re
+import time
+import hashlib
+import asyncio
+import argparse
+import itertools
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from psycopg2.extras import Json
 from dotenv import load_dotenv
 from strands import Agent, tool
@@ -11,9 +18,21 @@ import praw
 import prawcore
 from typing import List
 
-from models import ToolSnapshotData
-from database import Database
-from scrapers import ScraperMixin
+from models import ToolSnapshotData, CommunityMetrics
+from database import Database, DB_POOL_MAX, TOOL_LEASE_SECONDS
+from scrapers import ScraperMixin, GITHUB_GRAPHQL_MODE, prefetch_github_repos, log_run_stats as log_scraper_stats
+from http_client import get_http_client
+from http_cache import get_response_cache
+from rate_limit import AdaptiveConcurrencyLimiter
+from llm_cache import get_llm_cache
+from llm_metrics import LLM_BUDGET, LLM_METRICS, call_context
+from streaming import stream_until_json
+from json_scan import extract_first_json_object
+from pydantic import ValidationError
+from merge import CANDIDATES_KEY, merge_partials, parse_partials, premerge_json
+from chunking import (
+    LLM_PROMPT_TOKEN_BUDGET, chunk_by_tokens, data_token_budget, estimate_tokens, pack_sources, source_label, truncate_to_tokens
+)
 from strands.models import BedrockModel
 import strands
 
@@ -23,18 +42,88 @@ load_dotenv()
 # --- Logging Configuration ---
 # This will be moved into main for clarity
 
+# --- Data Gathering Configuration ---
+# Every source is fetched concurrently; each gets its own timeout and the whole
+# gathering stage is bounded by a total deadline so one slow API cannot stall a tool.
+SOURCE_TIMEOUT_SECONDS = float(os.getenv("SOURCE_TIMEOUT_SECONDS", "45"))
+WEB_SCRAPE_TIMEOUT_SECONDS = float(os.getenv("WEB_SCRAPE_TIMEOUT_SECONDS", "90"))
+GATHER_DEADLINE_SECONDS = float(os.getenv("GATHER_DEADLINE_SECONDS", "120"))
+
+# Number of tools processed at once; each worker has its own agent and DB connection.
+TOOL_CONCURRENCY = int(os.getenv("TOOL_CONCURRENCY", "1"))
+# Claim tools from the shared queue (SELECT ... FOR UPDATE SKIP LOCKED with a renewed lease) so several
+# collector processes can run against one database; when off, every pending tool is processed.
+TOOL_CLAIM_MODE = os.getenv("TOOL_CLAIM_MODE", "true").lower() in ("1", "true", "yes")
+
+# --- LLM Configuration ---
+# Chunks of a tool are analyzed concurrently. LLM_MAX_INFLIGHT bounds the Bedrock calls in
+# flight across all tool workers; the bound shrinks on throttling and recovers afterwards.
+LLM_MAX_INFLIGHT = int(os.getenv("LLM_MAX_INFLIGHT", "4"))
+LLM_THROTTLE_RETRIES = int(os.getenv("LLM_THROTTLE_RETRIES", "5"))
+LLM_LIMITER = AdaptiveConcurrencyLimiter(LLM_MAX_INFLIGHT, name="Bedrock")
+# Stream responses and stop generating once the fenced JSON answer is complete.
+LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() in ("1", "true", "yes")
+# Once the run's LLM_TOKEN_BUDGET is spent, only these sources are still analyzed; synthesis always runs.
+LLM_BUDGET_ESSENTIAL_SOURCES = {
+    name.strip() for name in os.getenv("LLM_BUDGET_ESSENTIAL_SOURCES", "scraped_website,github_readme").split(",") if name.strip()
+}
+
+# "local" merges partials in Python along the snapshot schema and only asks the model to resolve
+# conflicting free-text fields. "tree" synthesizes with the model, merging at most SYNTHESIS_GROUP_SIZE
+# pre-merged partials per call and reducing the group results again until one remains;
+# "single" sends every raw partial in one prompt.
+SYNTHESIS_MODE = os.getenv("SYNTHESIS_MODE", "local")
+SYNTHESIS_GROUP_SIZE = int(os.getenv("SYNTHESIS_GROUP_SIZE", "8"))
+
+# Sources whose content fingerprint matches the previous snapshot reuse that snapshot's partial
+# analyses, which are stored in raw_data under ANALYSIS_CACHE_KEY. Bump the version when the
+# partial-analysis prompt changes so old analyses are not reused.
+ANALYSIS_REUSE = os.getenv("ANALYSIS_REUSE", "true").lower() in ("1", "true", "yes")
+ANALYSIS_CACHE_KEY = "_analysis_cache"
+ANALYSIS_CACHE_VERSION = 1
+
+REDDIT_SUBREDDITS = ['AI_Agents', 'mcp', 'ClaudeAI', 'ChatGPTCoding', 'cursor', 'ArtificialInteligence', 'PromptEngineering']
+
+class SourceReuseStats:
+    """Thread-safe counts of analysis sources reused from previous snapshots versus sent to the model."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reused = 0
+        self.analyzed = 0
+
+    def record(self, reused: int, analyzed: int):
+        with self._lock:
+            self.reused += reused
+            self.analyzed += analyzed
+
+    def summary(self) -> dict:
+        with self._lock:
+            total = self.reused + self.analyzed
+            return {
+                "sources_skipped": self.reused,
+                "sources_analyzed": self.analyzed,
+                "skip_rate": round(self.reused / total, 3) if total else 0.0,
+            }
+
+    def log_stats(self):
+        logging.info(f"Incremental analysis: {self.summary()}")
+
+
+SOURCE_REUSE_STATS = SourceReuseStats()
+
 # --- Strands Agent Definition ---
-def chunk_text(text, chunk_size=8000, overlap=400):
-    """Splits text into overlapping chunks with more conservative sizing to avoid context overflow."""
-    if not isinstance(text, str):
-        return []
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = start + chunk_size
-        chunks.append(text[start:end])
-        start += chunk_size - overlap
-    return chunks
+def _is_throttling_error(error: Exception) -> bool:
+    """Returns True if a model call failed because the provider throttled it."""
+    error_str = f"{type(error).__name__} {error}".lower()
+    return 'throttl' in error_str or 'too many requests' in error_str or 'rate exceeded' in error_str
+
+def _token_usage(usage, prompt: str, response_text: str):
+    """Returns (input tokens, output tokens, estimated) from the provider's usage, estimating when it is missing."""
+    if usage and usage.get("inputTokens"):
+        return usage.get("inputTokens", 0), usage.get("outputTokens", 0), False
+    # Streams stopped after the JSON fence end before the provider reports usage.
+    return estimate_tokens(prompt), estimate_tokens(response_text), True
 
 class ToolIntelligenceAgent(ScraperMixin):
     def __init__(self, db: Database, model: str = "anthropic.claude-3-5-sonnet-20240620-v1:0"):
@@ -43,12 +132,14 @@ class ToolIntelligenceAgent(ScraperMixin):
         logging.info(f"Model: {model}")
         
         # Configure the model with specific parameters
-        bedrock_model = BedrockModel(
+        self.model_id = model
+        self.temperature = 0.1
+        self.bedrock_model = bedrock_model = BedrockModel(
             model_id=model,
             region_name=aws_region,
             model_kwargs={
                 "max_tokens": 8192,
-                "temperature": 0.1,
+                "temperature": self.temperature,
             }
         )
         
@@ -116,39 +207,113 @@ class ToolIntelligenceAgent(ScraperMixin):
             {content[:15000]} 
             ---
             """
-            summary = self.agent(summary_prompt, system_message="You are a text summarization expert.")
+            summary = self._invoke_llm(
+                summary_prompt, call_context(None, "summarize", context), system_prompt="You are a text summarization expert."
+            )
             logging.info("Content summarized successfully.")
-            return str(summary)
+            return summary
         except Exception as e:
             logging.error(f"Could not summarize content for {context}: {e}")
             return content[:1500] # Fallback to truncated content
 
     def _get_tool_urls(self, tool_info):
-        """Extracts and cleans URLs from tool info."""
+        """Extracts and cleans URLs from tool info: the standard URL types first, then any other url_type."""
         urls = [
             tool_info.get('website_url'), 
             tool_info.get('documentation_url'), 
             tool_info.get('blog_url'),
             tool_info.get('changelog_url')
         ]
-        return [url for url in urls if url and url.strip()]
+        urls.extend((tool_info.get('urls') or {}).values())
+        # De-duplicated in order, since the standard types also appear in `urls`.
+        return list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+
+    def _invoke_llm(self, prompt: str, context: dict = None, system_prompt: str = None) -> str:
+        """
+        Sends a single prompt to the model under the shared concurrency limiter.
+        A fresh Agent is used for every call: Agents keep conversation history and are
+        not safe to call concurrently, while the underlying model client is. It gets no
+        tools: all sources are gathered before analysis, and a scraper call made by the
+        model would bypass the shared rate limits and HTTP cache.
+        In streaming mode the response is cut off right after the fenced JSON block.
+        Latency and tokens are recorded in LLM_METRICS under `context` and charged to LLM_BUDGET.
+        """
+        agent = Agent(model=self.bedrock_model, system_prompt=system_prompt, callback_handler=None)
+        LLM_LIMITER.acquire()
+        throttled = False
+        started = time.monotonic()
+        try:
+            if LLM_STREAMING:
+                # Each call runs on its own worker thread, so it gets its own event loop.
+                response_text, first_token_at, stopped_early, usage = asyncio.run(stream_until_json(agent, prompt))
+            else:
+                result = agent(prompt)
+                response_text, first_token_at, stopped_early = str(result), None, False
+                usage = getattr(result.metrics, "accumulated_usage", None)
+            input_tokens, output_tokens, estimated = _token_usage(usage, (system_prompt or "") + prompt, response_text)
+            LLM_BUDGET.spend(input_tokens + output_tokens)
+            LLM_METRICS.record(
+                context,
+                time.monotonic() - started,
+                first_token_seconds=first_token_at - started if first_token_at else None,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                stopped_early=stopped_early,
+                estimated_tokens=estimated
+            )
+            return response_text
+        except Exception as e:
+            throttled = _is_throttling_error(e)
+            LLM_METRICS.count(context, "errors")
+            raise
+        finally:
+            LLM_LIMITER.release(throttled)
 
-    def _analyze_chunk_with_retry(self, chunk_prompt: str, chunk_info: str, max_retries: int = 3) -> str:
+    def _cached_llm_call(self, prompt: str, call, context: dict = None, validate=None) -> str:
+        """
+        Returns the cached response for a prompt, or runs `call` and caches its response.
+        Only responses that pass `validate` (by default: contain JSON) are cached, so failed or
+        malformed answers are retried next run instead of being replayed from the cache.
+        """
+        cache = get_llm_cache()
+        if not cache:
+            return call()
+        key = cache.make_key(self.model_id, self.temperature, prompt)
+        cached = cache.get(key)
+        if cached is not None:
+            LLM_METRICS.count(context, "cache_hits")
+            return cached
+        response_text = call()
+        valid = validate(response_text) if validate else bool(self._extract_json(response_text))
+        if response_text and valid:
+            cache.put(key, prompt, response_text)
+        return response_text
+
+    def _analyze_chunk_with_retry(self, chunk_prompt: str, chunk_info: str, max_retries: int = 3, context: dict = None) -> str:
         """
         Analyzes a chunk with automatic retry using progressively smaller chunks on context overflow.
+        Throttled calls are retried after the limiter's backoff without using up an attempt.
         """
-        for attempt in range(max_retries):
+        attempt = 0
+        throttle_retries = 0
+        while attempt < max_retries:
             try:
                 logging.info(f"Attempting chunk analysis (attempt {attempt + 1}/{max_retries}): {chunk_info}")
-                result = self.agent(chunk_prompt)
-                return str(result)
+                return self._invoke_llm(chunk_prompt, context)
             except Exception as e:
+                if _is_throttling_error(e) and throttle_retries < LLM_THROTTLE_RETRIES:
+                    throttle_retries += 1
+                    LLM_METRICS.count(context, "retries")
+                    logging.warning(f"Throttled while analyzing {chunk_info}; retrying ({throttle_retries}/{LLM_THROTTLE_RETRIES})")
+                    continue
                 error_str = str(e).lower()
                 if 'context window' in error_str or 'overflow' in error_str or 'too large' in error_str:
                     logging.warning(f"Context window overflow on attempt {attempt + 1} for {chunk_info}")
-                    if attempt < max_retries - 1:
+                    attempt += 1
+                    if attempt < max_retries:
                         # Try to reduce the chunk size for next attempt
                         logging.info(f"Will retry with smaller chunk size...")
+                        LLM_METRICS.count(context, "retries")
                         continue
                     else:
                         logging.error(f"Failed to analyze chunk after {max_retries} attempts: {chunk_info}")
@@ -159,53 +324,280 @@ class ToolIntelligenceAgent(ScraperMixin):
                     return ""
         return ""
 
-    def _process_tool(self, tool_info: dict):
-        """Gathers intelligence for a single tool and generates a snapshot."""
-        logging.info(f"Starting intelligence gathering for tool: {tool_info['name']} (ID: {tool_info['id']})")
+    def _source_fingerprint(self, source_name: str, content: str) -> str:
+        """Fingerprints a source's content together with everything else that shapes its analysis."""
+        raw = json.dumps([ANALYSIS_CACHE_VERSION, self.model_id, LLM_PROMPT_TOKEN_BUDGET, source_name, content])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _analyze_sources(self, tool_info: dict, base_info: dict, sources: dict, previous_cache: dict):
+        """
+        Produces the partial analyses of a tool's sources, reusing the previous snapshot's analyses
+        for sources whose fingerprints are unchanged. A previous entry covers a chunked source or a
+        packed group of sources and is reused only if every one of its sources is unchanged.
+        :return: (partial analyses in source order, analysis cache to store with the new snapshot)
+        """
+        sources = {name: str(content) for name, content in sources.items() if content}
+        positions = {name: position for position, name in enumerate(sources)}
+        fingerprints = {name: self._source_fingerprint(name, content) for name, content in sources.items()}
+
+        entries = []
+        reused_sources = set()
+        if (previous_cache or {}).get("version") == ANALYSIS_CACHE_VERSION:
+            for entry in previous_cache.get("entries", []):
+                names = entry.get("sources") or []
+                if names and all(
+                    name in fingerprints and name not in reused_sources
+                    and entry.get("fingerprints", {}).get(name) == fingerprints[name]
+                    for name in names
+                ):
+                    entries.append(entry)
+                    reused_sources.update(names)
+        if reused_sources:
+            logging.info(f"Reusing previous analyses of {len(reused_sources)} unchanged source(s): {', '.join(sorted(reused_sources, key=positions.get))}")
+
+        chunk_jobs = self._plan_chunk_jobs(
+            tool_info['name'], base_info, {name: content for name, content in sources.items() if name not in reused_sources}
+        )
+
+        def run_job(job):
+            # The budget is checked when a job starts, so it also covers tools that are mid-analysis
+            # when it runs out. Skipped jobs return "" like failed ones and are not cached.
+            if LLM_BUDGET.exhausted() and not LLM_BUDGET_ESSENTIAL_SOURCES.intersection(job[0]):
+                skipped_sources.update(job[0])
+                return ""
+            return self._analyze_chunk(tool_info['name'], base_info, *job[1:], packed=len(job[0]) > 1)
+
+        # Chunks are analyzed concurrently (bounded by LLM_LIMITER across all tools);
+        # map() keeps the results in source/chunk order so synthesis sees the same sequence.
+        results = []
+        skipped_sources = set()
+        if chunk_jobs:
+            with ThreadPoolExecutor(max_workers=min(LLM_MAX_INFLIGHT, len(chunk_jobs)), thread_name_prefix=f"llm-{tool_info['id']}") as executor:
+                results = list(executor.map(run_job, chunk_jobs))
+        if skipped_sources:
+            LLM_BUDGET.record_skipped(len(skipped_sources))
+            logging.warning(f"LLM token budget exhausted; skipped {len(skipped_sources)} source(s) of {tool_info['name']}: {', '.join(sorted(skipped_sources, key=positions.get))}")
+
+        new_entries = {}
+        for (names, *_), result in zip(chunk_jobs, results):
+            new_entries.setdefault(names, []).append(result)
+        cache_entries = list(entries)
+        for names, partials in new_entries.items():
+            entry = {
+                "sources": list(names),
+                "fingerprints": {name: fingerprints[name] for name in names},
+                "partials": [partial for partial in partials if partial]
+            }
+            entries.append(entry)
+            # Entries with a failed chunk are used this run but analyzed again next time.
+            if all(partials):
+                cache_entries.append(entry)
+
+        def first_position(entry):
+            return min(positions[name] for name in entry["sources"])
+
+        entries.sort(key=first_position)
+        cache_entries.sort(key=first_position)
+        SOURCE_REUSE_STATS.record(reused=len(reused_sources), analyzed=len(sources) - len(reused_sources))
+        partial_analyses = [partial for entry in entries for partial in entry["partials"]]
+        analysis_cache = {"version": ANALYSIS_CACHE_VERSION, "entries": cache_entries}
+        return partial_analyses, analysis_cache
+
+    def _plan_chunk_jobs(self, tool_name: str, base_info: dict, sources: dict) -> list:
+        """
+        Splits the analysis sources into LLM calls, returned as (source_names, source_name, chunk, chunk_info)
+        in source order; source_names is a tuple of the sources a call covers and source_name its label.
+        Sources that fit a single prompt are bin-packed together with per-source labels; larger
+        sources (typically the scraped website) are chunked to the token budget on their own.
+        """
+        sources = {name: str(content) for name, content in sources.items() if content}
+        if not sources:
+            return []
+        # Chunks are packed to the token budget left after the prompt's instructions and schema;
+        # naming every source gives an upper bound for the overhead of a packed prompt.
+        prompt_overhead = estimate_tokens(self._create_full_prompt(
+            tool_name, {"context_info": base_info, "data_source_name": ", ".join(sources), "data_chunk": ""},
+            is_partial=True, packed=len(sources) > 1
+        ))
+        budget = data_token_budget(prompt_overhead)
+
+        small_sources = {}
+        planned = []  # (position of first source, jobs)
+        for position, (source_name, content) in enumerate(sources.items()):
+            if estimate_tokens(source_label(source_name)) + estimate_tokens(content) < budget:
+                small_sources[source_name] = content
+                continue
+            # The progressively smaller retries in _analyze_chunk remain as a fallback on overflow.
+            chunks = chunk_by_tokens(content, budget)
+            logging.info(f"Processing source '{source_name}' in {len(chunks)} chunk(s).")
+            planned.append((position, [
+                ((source_name,), source_name, chunk, f"chunk {i+1}/{len(chunks)} from source: {source_name}")
+                for i, chunk in enumerate(chunks)
+            ]))
+
+        positions = {name: position for position, name in enumerate(sources)}
+        for names, text in pack_sources(small_sources, budget):
+            label = ", ".join(names)
+            if len(names) > 1:
+                logging.info(f"Packing {len(names)} small sources into one prompt: {label}")
+            planned.append((positions[names[0]], [(tuple(names), label, text, f"source(s): {label}")]))
+
+        planned.sort(key=lambda item: item[0])
+        return [job for _, jobs in planned for job in jobs]
+
+    def _analyze_chunk(self, tool_name: str, base_info: dict, source_name: str, chunk: str, chunk_info: str, packed: bool = False) -> str:
+        """
+        Analyzes one chunk, shrinking it on failure, and returns the extracted JSON or an empty string.
+        packed marks a chunk that combines several labelled sources.
+        """
+        context = call_context(tool_name, "chunk_analysis", source_name)
+        # Try analysis with progressively smaller chunks on overflow
+        chunk_sizes_to_try = [len(chunk), len(chunk)//2, len(chunk)//4]
         
-        # --- 1. Data Gathering ---
-        # Gather all data sources first, same as before.
+        for attempt, max_chunk_size in enumerate(chunk_sizes_to_try):
+            # Shrinking retries stop below 1000 chars, but the first attempt always runs:
+            # small sources (e.g. pypi_data) must still be analyzed, or their empty result
+            # would count as a failed entry and be re-planned on every run.
+            if attempt > 0 and max_chunk_size < 1000:
+                break
+            if attempt > 0:
+                LLM_METRICS.count(context, "retries")
+                
+            # Split chunk if needed
+            current_chunk = chunk[:max_chunk_size] if len(chunk) > max_chunk_size else chunk
+            
+            # Payload contains ONLY the essential context and the specific data chunk.
+            chunk_payload = {
+                "context_info": base_info,
+                "data_source_name": source_name,
+                "data_chunk": current_chunk
+            }
+            
+            chunk_prompt = self._create_full_prompt(tool_name, chunk_payload, is_partial=True, packed=packed)
+            
+            # Use retry method for analysis; unchanged chunks are answered from the LLM cache
+            partial_result = self._cached_llm_call(
+                chunk_prompt, lambda: self._analyze_chunk_with_retry(chunk_prompt, chunk_info, max_retries=2, context=context), context
+            )
+            
+            if partial_result:
+                extracted_json = self._extract_json(partial_result)
+                if extracted_json:
+                    if attempt > 0:
+                        logging.info(f"Successfully analyzed {chunk_info} with reduced chunk size ({max_chunk_size} chars)")
+                    return extracted_json
+                else:
+                    logging.warning(f"No JSON extracted from {chunk_info}")
+            
+        logging.warning(f"Failed to analyze {chunk_info} after trying multiple chunk sizes")
+        return ""
+
+    def _gather_sources(self, tool_info: dict) -> dict:
+        """
+        Runs every scraper for a tool concurrently and assembles the raw data payload.
+        Sources that fail, exceed their own timeout or miss the total deadline are
+        recorded as errors so the remaining sources are still used.
+        """
+        tool_name = tool_info['name']
         urls = self._get_tool_urls(tool_info)
+
+        # (key, callable, args, timeout) for every source to fetch.
+        tasks = [(f"web:{url}", self.web_scraper, (url,), WEB_SCRAPE_TIMEOUT_SECONDS) for url in urls]
+        if tool_info.get('github_url'):
+            tasks.append(("github_data", self.github_analyzer, (tool_info['github_url'],), SOURCE_TIMEOUT_SECONDS))
+        tasks += [
+            ("reddit_data", self.reddit_searcher, (tool_name, REDDIT_SUBREDDITS), SOURCE_TIMEOUT_SECONDS),
+            ("news_data", self.news_aggregator, (tool_name,), SOURCE_TIMEOUT_SECONDS),
+            ("hackernews_data", self.hackernews_searcher, (tool_name,), SOURCE_TIMEOUT_SECONDS),
+            ("stackoverflow_data", self.stackoverflow_searcher, (tool_name,), SOURCE_TIMEOUT_SECONDS),
+            ("youtube_data", self.youtube_searcher, (tool_name,), SOURCE_TIMEOUT_SECONDS),
+            ("producthunt_data", self.producthunt_searcher, (tool_name,), SOURCE_TIMEOUT_SECONDS),
+            ("devto_data", self.devto_searcher, (tool_name,), SOURCE_TIMEOUT_SECONDS),
+            ("npm_data", self.npm_searcher, (tool_name,), SOURCE_TIMEOUT_SECONDS),
+            ("pypi_data", self.pypi_searcher, (tool_name,), SOURCE_TIMEOUT_SECONDS),
+            ("medium_data", self.medium_searcher, (tool_name,), SOURCE_TIMEOUT_SECONDS),
+        ]
+
+        results = {}
+        started = time.monotonic()
+        deadline = started + GATHER_DEADLINE_SECONDS
+        executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix=f"gather-{tool_info['id']}")
+        try:
+            # Every task gets its own worker, so all of them start immediately.
+            futures = {
+                executor.submit(func, *args): (key, min(started + timeout, deadline))
+                for key, func, args, timeout in tasks
+            }
+            pending = set(futures)
+            while pending:
+                next_expiry = min(futures[f][1] for f in pending)
+                done, pending = wait(pending, timeout=max(0.0, next_expiry - time.monotonic()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = futures[future][0]
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        logging.error(f"Error gathering {key} for {tool_name}: {e}", exc_info=True)
+                        results[key] = {"error": str(e)}
+
+                now = time.monotonic()
+                expired = {f for f in pending if futures[f][1] <= now}
+                for future in expired:
+                    key = futures[future][0]
+                    logging.warning(f"Gathering {key} for {tool_name} timed out after {now - started:.1f}s")
+                    results[key] = {"error": f"Timed out after {now - started:.1f}s"}
+                    future.cancel()
+                pending -= expired
+        finally:
+            # Do not wait for timed-out scrapers; their results are discarded.
+            executor.shutdown(wait=False, cancel_futures=True)
+
         all_scraped_text = ""
         for url in urls:
-            try:
-                scraped_data = self.web_scraper(url, stealth=False)
-                if scraped_data and "content" in scraped_data and scraped_data["content"]:
-                    all_scraped_text += f"\\n\\n--- Scraped Content from {url} ---\\n{scraped_data['content']}"
-            except Exception as e:
-                logging.error(f"Error scraping {url}: {e}", exc_info=True)
+            scraped_data = results.get(f"web:{url}")
+            if scraped_data and "content" in scraped_data and scraped_data["content"]:
+                all_scraped_text += f"\\n\\n--- Scraped Content from {url} ---\\n{scraped_data['content']}"
 
-        # --- Community Metrics Data Collection ---
-        github_data = self.github_analyzer(tool_info['github_url']) if tool_info.get('github_url') else None
-        reddit_data = self.reddit_searcher(tool_info['name'], ['AI_Agents', 'mcp', 'ClaudeAI', 'ChatGPTCoding', 'cursor', 'ArtificialInteligence', 'PromptEngineering'])
-        news_data = self.news_aggregator(tool_info['name'])
-        
-        # Add all missing community metric scrapers
-        hackernews_data = self.hackernews_searcher(tool_info['name'])
-        stackoverflow_data = self.stackoverflow_searcher(tool_info['name'])
-        youtube_data = self.youtube_searcher(tool_info['name'])
-        producthunt_data = self.producthunt_searcher(tool_info['name'])
-        devto_data = self.devto_searcher(tool_info['name'])
-        npm_data = self.npm_searcher(tool_info['name'])
-        pypi_data = self.pypi_searcher(tool_info['name'])
-        medium_data = self.medium_searcher(tool_info['name'])
+        logging.info(f"Gathered {len(tasks)} source(s) for {tool_name} in {time.monotonic() - started:.1f}s")
 
         # This is the complete raw data that we will save at the end.
-        full_raw_data_payload = {
-            "scraped_content": all_scraped_text, 
-            "github_data": github_data,
-            "reddit_data": reddit_data, 
-            "news_data": news_data,
-            "hackernews_data": hackernews_data,
-            "stackoverflow_data": stackoverflow_data,
-            "youtube_data": youtube_data,
-            "producthunt_data": producthunt_data,
-            "devto_data": devto_data,
-            "npm_data": npm_data,
-            "pypi_data": pypi_data,
-            "medium_data": medium_data
+        return {
+            "scraped_content": all_scraped_text,
+            "github_data": results.get("github_data"),
+            "reddit_data": results.get("reddit_data"),
+            "news_data": results.get("news_data"),
+            "hackernews_data": results.get("hackernews_data"),
+            "stackoverflow_data": results.get("stackoverflow_data"),
+            "youtube_data": results.get("youtube_data"),
+            "producthunt_data": results.get("producthunt_data"),
+            "devto_data": results.get("devto_data"),
+            "npm_data": results.get("npm_data"),
+            "pypi_data": results.get("pypi_data"),
+            "medium_data": results.get("medium_data")
         }
 
+    def _process_tool(self, tool_info: dict) -> str:
+        """Gathers intelligence for a single tool, generates a snapshot and returns the run status."""
+        logging.info(f"Starting intelligence gathering for tool: {tool_info['name']} (ID: {tool_info['id']})")
+        
+        # --- 1. Data Gathering ---
+        # All sources are fetched concurrently, so a tool's gather time is roughly
+        # that of its slowest source rather than the sum of all of them.
+        full_raw_data_payload = self._gather_sources(tool_info)
+
+        all_scraped_text = full_raw_data_payload["scraped_content"]
+        github_data = full_raw_data_payload["github_data"]
+        reddit_data = full_raw_data_payload["reddit_data"]
+        news_data = full_raw_data_payload["news_data"]
+        hackernews_data = full_raw_data_payload["hackernews_data"]
+        stackoverflow_data = full_raw_data_payload["stackoverflow_data"]
+        youtube_data = full_raw_data_payload["youtube_data"]
+        producthunt_data = full_raw_data_payload["producthunt_data"]
+        devto_data = full_raw_data_payload["devto_data"]
+        npm_data = full_raw_data_payload["npm_data"]
+        pypi_data = full_raw_data_payload["pypi_data"]
+        medium_data = full_raw_data_payload["medium_data"]
+
         # --- 2. Direct Community Metrics Extraction ---
         # Extract concrete metrics directly from scraper results
         community_metrics_direct = {}
@@ -278,53 +670,10 @@ class ToolIntelligenceAgent(ScraperMixin):
             "medium_data": json.dumps(medium_data, default=str) if medium_data else None
         }
 
-        for source_name, source_content in large_data_sources.items():
-            if not source_content:
-                continue
-            
-            # Use progressive chunk sizing starting with default, then smaller on overflow
-            initial_chunks = chunk_text(str(source_content))
-            logging.info(f"Processing source '{source_name}' in {len(initial_chunks)} chunk(s).")
-
-            for i, chunk in enumerate(initial_chunks):
-                chunk_info = f"chunk {i+1}/{len(initial_chunks)} from source: {source_name}"
-                
-                # Try analysis with progressively smaller chunks on overflow
-                chunk_sizes_to_try = [len(chunk), len(chunk)//2, len(chunk)//4]
-                success = False
-                
-                for attempt, max_chunk_size in enumerate(chunk_sizes_to_try):
-                    if max_chunk_size < 1000:  # Don't go below 1000 chars
-                        break
-                        
-                    # Split chunk if needed
-                    current_chunk = chunk[:max_chunk_size] if len(chunk) > max_chunk_size else chunk
-                    
-                    # Payload contains ONLY the essential context and the specific data chunk.
-                    chunk_payload = {
-                        "context_info": base_info,
-                        "data_source_name": source_name,
-                        "data_chunk": current_chunk
-                    }
-                    
-                    chunk_prompt = self._create_full_prompt(tool_info['name'], chunk_payload, is_partial=True)
-                    
-                    # Use retry method for analysis
-                    partial_result = self._analyze_chunk_with_retry(chunk_prompt, chunk_info, max_retries=2)
-                    
-                    if partial_result:
-                        extracted_json = self._extract_json(partial_result)
-                        if extracted_json:
-                            partial_analyses.append(extracted_json)
-                            success = True
-                            if attempt > 0:
-                                logging.info(f"Successfully analyzed {chunk_info} with reduced chunk size ({max_chunk_size} chars)")
-                            break
-                        else:
-                            logging.warning(f"No JSON extracted from {chunk_info}")
-                    
-                if not success:
-                    logging.warning(f"Failed to analyze {chunk_info} after trying multiple chunk sizes")
+        previous_cache = self.db.get_latest_analysis_cache(tool_info['id']) if ANALYSIS_REUSE else {}
+        partial_analyses, full_raw_data_payload[ANALYSIS_CACHE_KEY] = self._analyze_sources(
+            tool_info, base_info, large_data_sources, previous_cache
+        )
 
         # --- 4. Synthesis ---
         # The synthesis step now merges the clean, partial analyses.
@@ -342,39 +691,39 @@ class ToolIntelligenceAgent(ScraperMixin):
             logging.info(f"Saving fallback snapshot with direct metrics for {tool_info['name']}")
             self.db.create_snapshot(tool_info['id'], fallback_data.model_dump(), full_raw_data_payload)
             self.db.update_tool_run_status(tool_info['id'], 'partial_success', 'Direct metrics saved, AI analysis failed due to credentials.')
-            return
+            return 'partial_success'
 
         logging.info(f"Synthesizing {len(partial_analyses)} partial analyses...")
-        synthesis_prompt = self._create_synthesis_prompt(tool_info['name'], partial_analyses)
         
         try:
-            agent_response = self.agent(synthesis_prompt)
-            logging.info("Agent raw response received successfully from synthesis.")
-            
-            json_string = self._extract_json(str(agent_response))
-            if not json_string:
-                raise ValueError("Could not extract JSON from synthesized agent response.")
+            validated_data = self._merge_locally(tool_info['name'], partial_analyses) if SYNTHESIS_MODE == "local" else None
+            if validated_data is None:
+                agent_response = self._synthesize(tool_info['name'], partial_analyses)
+                logging.info("Agent raw response received successfully from synthesis.")
+                
+                json_string = self._extract_json(str(agent_response))
+                if not json_string:
+                    raise ValueError("Could not extract JSON from synthesized agent response.")
 
-            validated_data = ToolSnapshotData.model_validate_json(json_string)
-            logging.info("Pydantic model validation successful after synthesis.")
+                validated_data = ToolSnapshotData.model_validate_json(json_string)
+                logging.info("Pydantic model validation successful after synthesis.")
             
             # Merge direct community metrics back into the validated data
             # The AI synthesis may have overwritten the direct metrics with None values
             if hasattr(validated_data, 'community_metrics') and validated_data.community_metrics:
-                ai_community_metrics = validated_data.community_metrics.copy()
-                
                 # Preserve direct metrics by merging them back in
-                for key, value in community_metrics_direct.items():
-                    if value is not None:  # Only overwrite if we have actual data
-                        ai_community_metrics[key] = value
-                        
-                validated_data.community_metrics = ai_community_metrics
+                # Rebuilt with model_validate so the merged-in direct values are validated too.
+                validated_data.community_metrics = CommunityMetrics.model_validate({
+                    **validated_data.community_metrics.model_dump(),
+                    **{key: value for key, value in community_metrics_direct.items()
+                       if value is not None}  # Only overwrite if we have actual data
+                })
                 logging.info(f"Merged {len([k for k, v in community_metrics_direct.items() if v is not None])} direct metrics back into synthesis result")
         
         except Exception as e:
             logging.error(f"Agent did not return structured data for {tool_info['name']} after synthesis. Error: {e}", exc_info=True)
             self.db.update_tool_run_status(tool_info['id'], 'failed', str(e))
-            return
+            return 'failed'
 
         # --- 5. Database Update ---
         # The full, original raw data is saved along with the clean, structured data.
@@ -382,6 +731,82 @@ class ToolIntelligenceAgent(ScraperMixin):
         self.db.create_snapshot(tool_info['id'], validated_data.model_dump(), full_raw_data_payload)
         self.db.update_tool_run_status(tool_info['id'], 'success')
         logging.info(f"Successfully created snapshot and processed {tool_info['name']}.")
+        return 'success'
+
+    def _merge_locally(self, tool_name: str, partial_analyses: list):
+        """
+        Merges the partial analyses without a synthesis call. Only free-text fields the partials
+        disagree on are resolved by the model, in one small prompt.
+        :return: The validated snapshot, or None if the merge did not validate (LLM synthesis is used instead).
+        """
+        merged, conflicts = merge_partials(parse_partials(partial_analyses))
+        if conflicts:
+            logging.info(f"Resolving {len(conflicts)} conflicting text field(s) with the model: {', '.join(conflicts)}")
+            for path, text in self._resolve_conflicts(tool_name, conflicts).items():
+                if path in conflicts and isinstance(text, str) and text.strip():
+                    section, field = path.split(".", 1)
+                    merged[section][field] = text.strip()
+        try:
+            validated_data = ToolSnapshotData.model_validate(merged)
+        except ValidationError as e:
+            logging.warning(f"Local merge for {tool_name} did not validate, falling back to LLM synthesis: {e}")
+            return None
+        logging.info(f"Merged {len(partial_analyses)} partial analyses locally ({len(conflicts)} conflict(s) sent to the model).")
+        return validated_data
+
+    def _resolve_conflicts(self, tool_name: str, conflicts: dict) -> dict:
+        """Asks the model to settle conflicting free-text fields; returns {path: text}, or {} on failure."""
+        prompt = self._create_conflict_prompt(tool_name, conflicts)
+        try:
+            context = call_context(tool_name, "conflict_resolution")
+            response = self._cached_llm_call(
+                prompt, lambda: self._invoke_llm(prompt, context), context, validate=self._is_json_object_response
+            )
+            resolved = json.loads(self._extract_json(str(response)) or "{}")
+            return resolved if isinstance(resolved, dict) else {}
+        except Exception as e:
+            # The locally merged (longest) values are kept.
+            logging.warning(f"Could not resolve conflicting fields for {tool_name}: {e}")
+            return {}
+
+    def _synthesize_group(self, tool_name: str, partial_json_strings: list, validate=None) -> str:
+        """Runs one synthesis call over a group of partials, pre-merged in tree mode, and returns the raw response."""
+        if SYNTHESIS_MODE != "single":
+            partial_json_strings = [premerge_json(partial_json_strings)]
+        synthesis_prompt = self._create_synthesis_prompt(tool_name, partial_json_strings)
+        context = call_context(tool_name, "synthesis")
+        return self._cached_llm_call(
+            synthesis_prompt, lambda: self._invoke_llm(synthesis_prompt, context), context, validate=validate
+        )
+
+    def _synthesize(self, tool_name: str, partial_analyses: list) -> str:
+        """
+        Synthesizes the partial analyses into one response. In tree mode partials are merged in
+        groups of SYNTHESIS_GROUP_SIZE, concurrently, and the group results are merged again
+        until a single group remains; that last call's raw response is returned.
+        """
+        partials = list(partial_analyses)
+        level = 1
+        while SYNTHESIS_MODE != "single" and len(partials) > SYNTHESIS_GROUP_SIZE:
+            groups = [partials[i:i + SYNTHESIS_GROUP_SIZE] for i in range(0, len(partials), SYNTHESIS_GROUP_SIZE)]
+            logging.info(f"Synthesis level {level}: merging {len(partials)} partials in {len(groups)} groups")
+
+            def reduce_group(group):
+                try:
+                    merged = self._extract_json(self._synthesize_group(tool_name, group))
+                    if merged:
+                        return merged
+                except Exception as e:
+                    logging.warning(f"Synthesis of a group of {len(group)} partials failed: {e}")
+                # Fall back to the deterministic merge so no partial is lost.
+                return premerge_json(group)
+
+            with ThreadPoolExecutor(max_workers=min(LLM_MAX_INFLIGHT, len(groups)), thread_name_prefix="synthesis") as executor:
+                partials = list(executor.map(reduce_group, groups))
+            level += 1
+        # The final response is only cached once it validates as a snapshot, so a bad
+        # synthesis is not replayed on every re-run of the failed tool.
+        return self._synthesize_group(tool_name, partials, validate=self._is_valid_snapshot_response)
 
     def _create_synthesis_prompt(self, tool_name: str, partial_json_strings: list) -> str:
         """Creates the prompt to synthesize partial JSON analyses."""
@@ -395,6 +820,7 @@ class ToolIntelligenceAgent(ScraperMixin):
         2.  Merge them into a single, complete, and coherent JSON object.
         3.  De-duplicate any repeated information. For lists like 'feature_list' or 'testimonials', merge them and remove identical entries. For numeric fields like 'github_stars', take the most frequently occurring value or the most plausible one if there are discrepancies.
         4.  Ensure the final JSON object strictly adheres to the provided schema. Do not add any fields that are not in the schema. All list fields must be lists, even if empty.
+        5.  If a snippet has a '{CANDIDATES_KEY}' object, it lists the differing values that partials gave for a text field (by dotted path). Choose or combine them into that field's single value, and do not include '{CANDIDATES_KEY}' in your output.
         
         Partial JSON snippets to synthesize:
         {partials_str}
@@ -402,6 +828,19 @@ class ToolIntelligenceAgent(ScraperMixin):
         Return ONLY the final, synthesized JSON object, enclosed in ```json ... ```.
         """
 
+    def _create_conflict_prompt(self, tool_name: str, conflicts: dict) -> str:
+        """Creates the prompt that resolves free-text fields the partial analyses disagree on."""
+        return f"""
+        You are an expert data synthesizer. Partial analyses of the AI tool '{tool_name}' disagree on the text fields below.
+        Each key is a field path and its value lists the candidate texts. For every field, write the single most accurate
+        value, combining candidates where they complement each other and dropping anything contradicted by the others.
+        
+        Conflicting fields:
+        {json.dumps(conflicts, indent=1)}
+
+        Return ONLY a JSON object that maps each field path to its final text, enclosed in ```json ... ```.
+        """
+
     def _create_compact_schema(self) -> dict:
         """Creates a compact JSON schema for partial analysis to reduce context window usage."""
         return {
@@ -444,8 +883,11 @@ class ToolIntelligenceAgent(ScraperMixin):
             }
         }
 
-    def _create_full_prompt(self, tool_name: str, data_payload: dict, is_partial: bool = False) -> str:
-        """Creates a prompt for the agent, adapting for full or partial (chunked) data."""
+    def _create_full_prompt(self, tool_name: str, data_payload: dict, is_partial: bool = False, packed: bool = False) -> str:
+        """
+        Creates a prompt for the agent, adapting for full or partial (chunked) data.
+        packed marks partial data that combines several sources, each introduced by source_label().
+        """
         
         if is_partial:
             # This is the new, isolated chunk processing logic
@@ -460,9 +902,11 @@ class ToolIntelligenceAgent(ScraperMixin):
 Analyze this data from '{source_name}' about the AI tool '{tool_name}'. 
 Extract any relevant information you can find. Focus on key features, metrics, and company details.
 If information is not available, use null or empty arrays."""
+            if packed:
+                prompt_intro += "\nThe data combines several sources, each introduced by a '--- Source: <name> ---' line. Use all of them."
             
-            # Truncate data chunk to ensure we don't exceed context window
-            data_str = data_chunk[:12000]  # Conservative limit
+            # Chunks from chunk_by_tokens already fit; this only guards oversized direct input
+            data_str = truncate_to_tokens(data_chunk, LLM_PROMPT_TOKEN_BUDGET)
 
             return f"""
             {prompt_intro}
@@ -507,25 +951,147 @@ If information is not available, use null or empty arrays."""
             ```
             """
 
-    def _extract_json(self, text: str) -> str:
-        """Extracts the first JSON object from a string."""
-        # Regex to find JSON wrapped in ```json ... ```
-        match = re.search(r'```json\s*(\{.*?\})\s*```', text, re.DOTALL)
-        if match:
-            return match.group(1)
-        
-        # Fallback for raw JSON without backticks, finding the first '{' to the last '}'
+    def _is_json_object_response(self, text: str) -> bool:
+        """Whether the response contains a JSON object."""
         try:
-            start = text.index('{')
-            end = text.rindex('}') + 1
-            return text[start:end]
+            return isinstance(json.loads(self._extract_json(text) or "null"), dict)
         except ValueError:
+            return False
+
+    def _is_valid_snapshot_response(self, text: str) -> bool:
+        """Whether the response contains JSON that validates as ToolSnapshotData."""
+        try:
+            ToolSnapshotData.model_validate_json(self._extract_json(text))
+            return True
+        except ValidationError:
+            return False
+
+    def _extract_json(self, text: str) -> str:
+        """Extracts the first JSON object from a string, preferring one inside a ```json fence."""
+        json_string = extract_first_json_object(text)
+        if not json_string:
             logging.warning("Could not find a JSON object in the response text.")
-            return ""
+        return json_string
 
 # --- Main Execution Logic ---
+class ToolLeaseHeartbeat:
+    """Claims tools for this collector and keeps their leases alive until they are finished."""
+
+    def __init__(self, db: Database, worker_id: str, lease_seconds: int = TOOL_LEASE_SECONDS):
+        self.db = db
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self._active = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+
+    def claim(self, count: int) -> list:
+        tools = self.db.claim_tools(self.worker_id, count, self.lease_seconds)
+        with self._lock:
+            self._active.update(tool['id'] for tool in tools)
+        if tools:
+            logging.info(f"Claimed {len(tools)} tool(s) as {self.worker_id}: {', '.join(tool['name'] for tool in tools)}")
+        return tools
+
+    def release(self, tool: dict):
+        # The claim itself is cleared by update_tool_run_status; this only stops renewing it.
+        with self._lock:
+            self._active.discard(tool['id'])
+
+    def _run(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._lock:
+                active = sorted(self._active)
+            try:
+                lost = self.db.renew_tool_leases(self.worker_id, active, self.lease_seconds)
+            except Exception as e:
+                logging.error(f"Could not renew tool leases: {e}")
+                continue
+            if lost:
+                logging.warning(f"Lost the lease on tool(s) {lost}; another collector may process them as well.")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_tools(claim_tools, concurrency: int, db: Database, total: int = None, on_finished=None) -> dict:
+    """
+    Processes tools on a pool of workers, asking claim_tools(count) for more whenever workers are
+    idle until it returns none. Each worker thread lazily creates its own ToolIntelligenceAgent;
+    all of them share the pooled Database. A failure in one tool is recorded via
+    update_tool_run_status without affecting the others; on_finished(tool) is called after each tool.
+    """
+    local = threading.local()
+
+    def get_agent():
+        if not hasattr(local, 'agent'):
+            local.agent = ToolIntelligenceAgent(db=db)
+        return local.agent
+
+    def process(tool):
+        try:
+            # Inside the try, so a tool whose agent could not be set up is still marked failed
+            # and its claim released instead of being held until the lease expires.
+            return get_agent()._process_tool(tool)
+        except Exception as e:
+            logging.error(f"Unhandled error while processing {tool['name']} (ID: {tool['id']}): {e}", exc_info=True)
+            db.update_tool_run_status(tool['id'], 'failed', str(e))
+            return 'failed'
+
+    concurrency = max(1, concurrency)
+    outcomes = {}
+    done_count = 0
+    started = time.monotonic()
+    logging.info(f"Processing {total if total is not None else 'claimed'} tools with concurrency {concurrency}.")
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tool-worker") as executor:
+        futures = {}
+        queue_empty = False
+        while True:
+            if not queue_empty and len(futures) < concurrency:
+                tools = claim_tools(concurrency - len(futures))
+                queue_empty = not tools
+                for tool in tools:
+                    futures[executor.submit(process, tool)] = tool
+            if not futures:
+                break
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                tool = futures.pop(future)
+                try:
+                    status = future.result()
+                except Exception as e:
+                    # Only reachable when recording the failure itself failed (e.g. the database is down).
+                    logging.error(f"Worker failed while processing {tool['name']}: {e}")
+                    status = 'failed'
+                if on_finished:
+                    on_finished(tool)
+                outcomes[status] = outcomes.get(status, 0) + 1
+                done_count += 1
+
+                elapsed_minutes = (time.monotonic() - started) / 60
+                throughput = done_count / elapsed_minutes if elapsed_minutes > 0 else 0.0
+                logging.info(
+                    f"Progress: {done_count}/{total if total is not None else '?'} tools done ({tool['name']}: {status}) - "
+                    f"{throughput:.2f} tools/minute - outcomes so far: {outcomes}"
+                )
+
+    return outcomes
+
 def main():
     """Main function to run the intelligence gathering process."""
+    parser = argparse.ArgumentParser(description="AI Intelligence Platform weekly run.")
+    parser.add_argument(
+        "--concurrency", type=int, default=TOOL_CONCURRENCY,
+        help="Number of tools to process at once (default: TOOL_CONCURRENCY env or 1)."
+    )
+    args = parser.parse_args()
+
     # --- Logging Configuration ---
     LOGS_DIR = 'logs'
     if not os.path.exists(LOGS_DIR):
@@ -535,7 +1101,7 @@ def main():
     
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
+        format='%(asctime)s - %(levelname)s - [%(threadName)s] %(message)s',
         handlers=[
             logging.FileHandler(log_file_name),
             logging.StreamHandler()
@@ -548,24 +1114,57 @@ def main():
 
     db = None  # Initialize db to None
     try:
-        db = Database()
-        if not db.conn:
+        # One pooled Database is shared by all tool workers, with a connection for each plus the
+        # main thread and the lease heartbeat.
+        db = Database(max_connections=max(DB_POOL_MAX, args.concurrency + 2))
+        if not db.pool:
             logging.error("Failed to establish database connection. Exiting.")
             return
 
-        agent = ToolIntelligenceAgent(db=db)
-
-        tools_to_process = db.get_tools_to_process()
-        logging.info(f"Found {len(tools_to_process)} tools to process.")
+        if TOOL_CLAIM_MODE:
+            # Tools are claimed from the shared queue as workers free up, so only the claimed
+            # ones are prefetched from GitHub; other collectors may take the rest.
+            logging.info(f"Found {db.count_tools_to_process()} tools to process (claimed from the shared queue as workers free up).")
+            worker_id = f"{socket.gethostname()}:{os.getpid()}"
+            with ToolLeaseHeartbeat(db, worker_id) as heartbeat:
+                def claim(count):
+                    tools = heartbeat.claim(count)
+                    if GITHUB_GRAPHQL_MODE:
+                        prefetch_github_repos([t['github_url'] for t in tools if t.get('github_url')], os.getenv("GITHUB_API_TOKEN"))
+                    return tools
 
-        for tool in tools_to_process:
-            agent._process_tool(tool)
+                outcomes = run_tools(claim, args.concurrency, db, on_finished=heartbeat.release)
+        else:
+            tools_to_process = db.get_tools_to_process()
+            logging.info(f"Found {len(tools_to_process)} tools to process.")
+            if GITHUB_GRAPHQL_MODE:
+                # One batched GraphQL query per ~25 repositories instead of four REST calls per tool.
+                github_urls = [t['github_url'] for t in tools_to_process if t.get('github_url')]
+                prefetch_github_repos(github_urls, os.getenv("GITHUB_API_TOKEN"))
+            pending = iter(tools_to_process)
+            outcomes = run_tools(
+                lambda count: list(itertools.islice(pending, count)), args.concurrency, db, total=len(tools_to_process)
+            )
+        logging.info(f"Run outcomes: {outcomes}")
+        get_http_client().log_stats()
+        log_scraper_stats()
+        LLM_LIMITER.log_stats()
+        LLM_METRICS.log_stats()
+        if LLM_BUDGET.limit:
+            logging.info(f"LLM token budget: {LLM_BUDGET.summary()}")
+        logging.info(f"LLM run report written to {LLM_METRICS.write_report(LOGS_DIR, LLM_BUDGET)}")
+        SOURCE_REUSE_STATS.log_stats()
+        if response_cache := get_response_cache():
+            response_cache.log_stats()
+        if llm_cache := get_llm_cache():
+            llm_cache.log_stats()
 
     except Exception as e:
         logging.error(f"An unexpected error occurred during the main run: {e}", exc_info=True)
     finally:
-        if db and db.conn:
+        if db and db.pool:
             db.close()
+            db.stats.log_stats()
         logging.info("AI Intelligence Platform run finished.")
 
 if __name__ == "__main__":
@@ -0,0 +1,238 @@
+"""
+Deterministic merging of partial analyses.
+
+Chunk analyses overlap heavily: the same features, languages and metrics show up
+in many partials, so most of synthesis is mechanical and is done here in Python.
+
+merge_partials() merges partials field by field along the ToolSnapshotData schema
+and replaces LLM synthesis: only free-text fields whose partials disagree are left
+for the model to resolve.
+
+premerge() is the schema-agnostic variant that consolidates partials before LLM
+synthesis:
+
+- lists are unioned and de-duplicated (case- and whitespace-insensitive),
+- numbers and booleans are decided by majority vote (ties go to the first value seen),
+- nested objects are merged key by key,
+- text fields that disagree keep their first value, and every distinct value is
+  recorded under CANDIDATES_KEY so the model can pick or combine them.
+"""
+import re
+import json
+import logging
+from collections import Counter
+from typing import Union, get_args, get_origin
+
+from models import ToolSnapshotData
+
+
+# Top-level key that holds the alternative values of conflicting text fields, by dotted path.
+CANDIDATES_KEY = "_candidates"
+
+# Descriptive fields where differing partials cannot be merged mechanically.
+FREE_TEXT_FIELDS = {
+    "basic_info.description",
+    "technical_details.model_integration_capabilities",
+    "technical_details.code_quality_and_analysis",
+    "technical_details.enterprise_capabilities",
+    "technical_details.market_positioning",
+    "technical_details.roadmap_information",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(value) -> str:
+    """Returns the identity used to de-duplicate a list item or compare text values."""
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip().rstrip(".").casefold()
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _union(lists: list) -> list:
+    merged = []
+    seen = set()
+    for items in lists:
+        for item in items:
+            if item is None or item == "":
+                continue
+            key = _normalize(item)
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+    return merged
+
+
+def _vote(values: list):
+    counts = Counter(values)
+    top = max(counts.values())
+    return next(value for value in values if counts[value] == top)
+
+
+def _merge_values(values: list, path: str, candidates: dict):
+    values = [value for value in values if value is not None and value != "" and value != [] and value != {}]
+    if not values:
+        return None
+
+    if all(isinstance(value, dict) for value in values):
+        keys = list(dict.fromkeys(key for value in values for key in value))
+        merged = {}
+        for key in keys:
+            merged[key] = _merge_values([value.get(key) for value in values], f"{path}.{key}" if path else key, candidates)
+        return merged
+
+    if any(isinstance(value, list) for value in values):
+        # A scalar where other partials gave a list is treated as a one-item list.
+        return _union([value if isinstance(value, list) else [value] for value in values])
+
+    if all(_is_number(value) for value in values) or all(isinstance(value, bool) for value in values):
+        return _vote(values)
+
+    distinct = {}
+    for value in values:
+        distinct.setdefault(_normalize(value), value)
+    if len(distinct) > 1:
+        candidates[path] = list(distinct.values())
+    return values[0]
+
+
+def premerge(partials: list) -> dict:
+    """
+    Merges parsed partial analyses into one object.
+    :param partials: Partial analysis dictionaries, in analysis order.
+    :return: The merged object; conflicting text fields are listed under CANDIDATES_KEY.
+    """
+    candidates = {}
+    previous_candidates = [partial.get(CANDIDATES_KEY) or {} for partial in partials]
+    merged = _merge_values([
+        {key: value for key, value in partial.items() if key != CANDIDATES_KEY} for partial in partials
+    ], "", candidates) or {}
+
+    # Candidates recorded by an earlier merge level are carried forward.
+    for earlier in previous_candidates:
+        for path, values in earlier.items():
+            candidates[path] = _union([candidates.get(path, []), values])
+    candidates = {path: values for path, values in candidates.items() if len(values) > 1}
+    if candidates:
+        merged[CANDIDATES_KEY] = candidates
+    return merged
+
+
+def parse_partials(partial_json_strings: list) -> list:
+    """Parses partial analysis JSON strings, skipping any that are not JSON objects."""
+    partials = []
+    for partial in partial_json_strings:
+        try:
+            parsed = json.loads(partial)
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Skipping partial analysis that is not valid JSON: {e}")
+            continue
+        if isinstance(parsed, dict):
+            partials.append(parsed)
+    return partials
+
+
+def premerge_json(partial_json_strings: list) -> str:
+    """Pre-merges partial analysis JSON strings and returns the merged object as JSON."""
+    return json.dumps(premerge(parse_partials(partial_json_strings)), indent=1, default=str)
+
+
+def _unwrap_optional(annotation):
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _to_number(value, number_type):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return number_type(value)
+    if isinstance(value, str):
+        try:
+            return number_type(float(value.replace(",", "").strip()))
+        except ValueError:
+            return None
+    return None
+
+
+def _coerce_item(item, item_type):
+    """Coerces a list item to the schema's item type, or returns None if it does not fit."""
+    if get_origin(item_type) is dict or item_type is dict:
+        return {str(k): str(v) for k, v in item.items() if v is not None} if isinstance(item, dict) else None
+    if item_type is str:
+        if isinstance(item, str):
+            return item.strip() or None
+        return str(item) if _is_number(item) else None
+    return item
+
+
+def _merge_field(annotation, values: list, path: str, conflicts: dict):
+    """Merges the values the partials gave for one schema field."""
+    annotation = _unwrap_optional(annotation)
+    origin = get_origin(annotation) or annotation
+    values = [value for value in values if value is not None and value != "" and value != [] and value != {}]
+    if not values:
+        return None
+
+    if origin is list:
+        item_type = (get_args(annotation) or (None,))[0]
+        items = [value if isinstance(value, list) else [value] for value in values]
+        coerced = [[_coerce_item(item, item_type) for item in group] for group in items]
+        return _union([[item for item in group if item is not None] for group in coerced])
+
+    if origin is dict:
+        # e.g. pricing_model: merged key by key, the first partial wins on conflicting leaves.
+        return _merge_values([value for value in values if isinstance(value, dict)], path, {})
+
+    if annotation is bool:
+        flags = [value for value in values if isinstance(value, bool)]
+        return _vote(flags) if flags else None
+
+    if annotation in (int, float):
+        numbers = [number for number in (_to_number(value, annotation) for value in values) if number is not None]
+        if not numbers:
+            return None
+        # Most frequent value; ties go to the largest.
+        counts = Counter(numbers)
+        top = max(counts.values())
+        return max(number for number in numbers if counts[number] == top)
+
+    texts = [str(value).strip() for value in values if str(value).strip()]
+    if not texts:
+        return None
+    distinct = {}
+    for text in texts:
+        distinct.setdefault(_normalize(text), text)
+    if path in FREE_TEXT_FIELDS and len(distinct) > 1:
+        conflicts[path] = list(distinct.values())
+    # Longest non-null value.
+    return max(texts, key=len)
+
+
+def merge_partials(partials: list):
+    """
+    Merges parsed partial analyses field by field along the ToolSnapshotData schema:
+    lists are unioned with normalization, numbers take the most frequent (then largest)
+    value, booleans the majority, strings the longest value and dicts are merged key by key.
+    :param partials: Partial analysis dictionaries, in analysis order.
+    :return: (snapshot dictionary, conflicts) where conflicts maps the dotted path of each
+             free-text field the partials disagree on to its distinct values.
+    """
+    conflicts = {}
+    snapshot = {}
+    for section, section_field in ToolSnapshotData.model_fields.items():
+        section_values = [partial.get(section) for partial in partials if isinstance(partial.get(section), dict)]
+        merged_section = {}
+        for name, field in section_field.annotation.model_fields.items():
+            value = _merge_field(field.annotation, [values.get(name) for values in section_values], f"{section}.{name}", conflicts)
+            if value is not None:
+                merged_section[name] = value
+        snapshot[section] = merged_section
+    return snapshot, conflicts
@@ -0,0 +1,149 @@
+"""
+Rate limiting shared by concurrent scrapers and LLM calls.
+
+Tool workers run in parallel and each one owns its own API clients, so the
+per-client throttling those libraries do on their own cannot see the other
+workers. A TokenBucket created at module level is shared by every worker in
+the process and can additionally be aligned with the rate-limit headers the
+server reports.
+"""
+import time
+import logging
+import threading
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that also honours server-reported quota.
+    A rate of 0 or less disables the client-side limit; server-reported pauses still apply.
+    """
+
+    def __init__(self, requests_per_minute: float, name: str):
+        self.name = name
+        self.unlimited = requests_per_minute <= 0
+        self.capacity = max(requests_per_minute, 1.0)
+        self.refill_per_second = requests_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+        self.server_limits = {}
+
+    def _refill_locked(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+        return now
+
+    def acquire(self, tokens: float = 1.0):
+        """Blocks until `tokens` requests may be sent."""
+        while True:
+            with self._lock:
+                now = self._refill_locked()
+                if now >= self._blocked_until and (self.unlimited or self._tokens >= tokens):
+                    self._tokens -= tokens
+                    self.acquired += tokens
+                    return
+                wait = self._blocked_until - now
+                if not self.unlimited:
+                    wait = max(wait, (tokens - self._tokens) / self.refill_per_second)
+            time.sleep(wait)
+            with self._lock:
+                self.waited_seconds += wait
+
+    def observe(self, remaining: float = None, reset_in_seconds: float = None, used: float = None):
+        """Aligns the bucket with the quota the server reports in its rate-limit headers."""
+        with self._lock:
+            now = self._refill_locked()
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+                if remaining < 1 and reset_in_seconds:
+                    self._blocked_until = now + reset_in_seconds
+                    logging.warning(f"{self.name} quota exhausted; pausing for {reset_in_seconds:.1f}s")
+            self.server_limits = {"remaining": remaining, "reset_in_seconds": reset_in_seconds, "used": used}
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "requests": int(self.acquired),
+                "waited_seconds": round(self.waited_seconds, 1),
+                "server_limits": self.server_limits,
+            }
+
+    def log_stats(self):
+        """Logs how much of the quota this run used."""
+        logging.info(f"{self.name} quota usage: {self.summary()}")
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Bounds the number of calls in flight and adapts the bound to throttling (AIMD):
+    a throttled call halves the limit and pauses new calls with exponential backoff,
+    while every successful call grows the limit back by roughly one slot per round.
+    """
+
+    def __init__(self, max_inflight: int, name: str, base_backoff_seconds: float = 1.0, max_backoff_seconds: float = 30.0):
+        self.name = name
+        self.max_inflight = max(int(max_inflight), 1)
+        self.limit = float(self.max_inflight)
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._backoff_seconds = base_backoff_seconds
+        self._paused_until = 0.0
+        self._inflight = 0
+        self._cond = threading.Condition()
+        self.calls = 0
+        self.throttles = 0
+        self.min_limit_seen = self.limit
+
+    def acquire(self):
+        """Blocks until a call may start."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    self._cond.wait(self._paused_until - now)
+                elif self._inflight < int(self.limit):
+                    self._inflight += 1
+                    self.calls += 1
+                    return
+                else:
+                    self._cond.wait()
+
+    def release(self, throttled: bool = False):
+        """Ends a call started with acquire(), reporting whether it was throttled."""
+        with self._cond:
+            self._inflight -= 1
+            now = time.monotonic()
+            if throttled:
+                self.throttles += 1
+                # Calls already in flight may all be throttled together; back off once per pause.
+                if now >= self._paused_until:
+                    self.limit = max(1.0, self.limit / 2)
+                    self.min_limit_seen = min(self.min_limit_seen, self.limit)
+                    self._paused_until = now + self._backoff_seconds
+                    logging.warning(
+                        f"{self.name} throttled; limiting to {int(self.limit)} in flight "
+                        f"and pausing for {self._backoff_seconds:.1f}s"
+                    )
+                    self._backoff_seconds = min(self._backoff_seconds * 2, self.max_backoff_seconds)
+            else:
+                self.limit = min(float(self.max_inflight), self.limit + 1.0 / self.limit)
+                self._backoff_seconds = self.base_backoff_seconds
+            self._cond.notify_all()
+
+    def summary(self) -> dict:
+        with self._cond:
+            return {
+                "calls": self.calls,
+                "throttles": self.throttles,
+                "max_inflight": self.max_inflight,
+                "current_limit": int(self.limit),
+                "min_limit_seen": int(self.min_limit_seen),
+            }
+
+    def log_stats(self):
+        """Logs how often this run was throttled."""
+        logging.info(f"{self.name} concurrency stats: {self.summary()}")
@@ -0,0 +1,96 @@
+"""
+Compressed, per-source framing of raw scraper payloads.
+
+A raw payload is a JSON object with one key per source (scraped_content,
+github_data, reddit_data, ...). Each source is serialized and compressed into its
+own frame, so a consumer can inflate github_data without touching the much larger
+scraped_content.
+
+Frames are zlib streams (RFC 1950, not raw deflate) primed with a dictionary
+shared by all snapshots; such frames have the FDICT header flag set and carry the
+dictionary's Adler-32, so other consumers must call inflateSetDictionary (or pass
+zdict) with the stored dictionary. Payloads repeat heavily from week to week and across tools (JSON keys,
+API field names, boilerplate website text), which small per-source frames cannot
+exploit on their own; the dictionary supplies that shared context. It is trained
+from existing frames by train_dictionary() and stored in the database with an id,
+and every payload records the dictionary it was compressed with.
+"""
+import os
+import re
+import json
+import zlib
+from collections import Counter
+
+
+RAW_FRAME_CODEC = "zlib"
+RAW_FRAME_ZLIB_LEVEL = int(os.getenv("RAW_FRAME_ZLIB_LEVEL", "9"))
+
+# Deflate only looks back 32 KiB, so a larger dictionary would never be referenced.
+DICTIONARY_MAX_BYTES = 32 * 1024
+# Only the start of each training sample is scanned, which bounds training time on large pages.
+DICTIONARY_SAMPLE_BYTES = 64 * 1024
+
+# Candidate dictionary entries: runs between JSON structural characters (keys, values, sentences).
+_SEGMENT = re.compile(rb'[^,{}\[\]]{4,256}')
+
+
+def source_json(value) -> bytes:
+    """Serializes one source of a payload the same way on every write."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def train_dictionary(samples: list, max_bytes: int = DICTIONARY_MAX_BYTES) -> bytes:
+    """
+    Builds a shared compression dictionary from sample frames (serialized sources).
+    Segments are scored by how many samples contain them times their length, so the
+    dictionary holds the text that recurs across payloads rather than within one.
+    :param samples: Serialized sources (bytes) from a representative set of payloads.
+    :return: The dictionary, at most max_bytes long.
+    """
+    document_counts = Counter()
+    for sample in samples:
+        document_counts.update(set(_SEGMENT.findall(sample[:DICTIONARY_SAMPLE_BYTES])))
+
+    scored = sorted(
+        ((segment, (count - 1) * len(segment)) for segment, count in document_counts.items() if count > 1),
+        key=lambda item: item[1], reverse=True
+    )
+    chosen = []
+    size = 0
+    for segment, _ in scored:
+        if size + len(segment) > max_bytes:
+            continue
+        chosen.append(segment)
+        size += len(segment)
+    # Matches closer to the end of the dictionary are cheaper to encode, so the best segments go last.
+    return b"".join(reversed(chosen))
+
+
+def compress_frame(data: bytes, dictionary: bytes = None) -> bytes:
+    if dictionary:
+        compressor = zlib.compressobj(RAW_FRAME_ZLIB_LEVEL, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(RAW_FRAME_ZLIB_LEVEL)
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress_frame(frame: bytes, dictionary: bytes = None) -> bytes:
+    decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+    return decompressor.decompress(frame) + decompressor.flush()
+
+
+def encode_payload(payload: dict, dictionary: bytes = None) -> list:
+    """
+    Splits a raw payload into compressed per-source frames.
+    :return: [(source, frame, uncompressed size)] in the payload's key order.
+    """
+    frames = []
+    for source, value in payload.items():
+        data = source_json(value)
+        frames.append((source, compress_frame(data, dictionary), len(data)))
+    return frames
+
+
+def decode_frame(frame: bytes, dictionary: bytes = None):
+    """Returns the value of one source from its compressed frame."""
+    return json.loads(decompress_frame(bytes(frame), dictionary))
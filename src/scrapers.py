@@ -5,14 +5,260 @@ This module contains all the individual scraper tools that collect data
 from various sources for AI tool analysis.
 """
 import os
+import re
+import time
+import datetime
 import logging
+import threading
 import requests
 import praw
 import prawcore
 from typing import List
+from xml.etree import ElementTree
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from strands import tool
 from firecrawl import FirecrawlApp
 
+from http_client import get_http_client
+from rate_limit import TokenBucket
+
+
+# NPM's bulk downloads endpoint accepts at most 128 unscoped package names per request.
+NPM_BULK_DOWNLOADS_LIMIT = 128
+# Bound on concurrent per-package NPM requests (scoped packages cannot be bulk-queried).
+NPM_MAX_CONCURRENCY = int(os.getenv("NPM_MAX_CONCURRENCY", "4"))
+# Shared across all tool workers so parallel runs stay within Reddit's OAuth quota.
+REDDIT_RATE_LIMITER = TokenBucket(float(os.getenv("REDDIT_REQUESTS_PER_MINUTE", "60")), name="Reddit API")
+# Bound on concurrent Dev.to tag requests per tool.
+DEVTO_MAX_CONCURRENCY = int(os.getenv("DEVTO_MAX_CONCURRENCY", "4"))
+# Medium publication feeds scanned for tool mentions (downloaded once per run).
+MEDIUM_FEEDS = [
+    "https://medium.com/feed/@towardsdatascience",
+    "https://medium.com/feed/better-programming",
+    "https://medium.com/feed/hackernoon"
+]
+RSS_CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+RSS_DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+# Bound on concurrent PyPI package-name probes.
+PYPI_MAX_CONCURRENCY = int(os.getenv("PYPI_MAX_CONCURRENCY", "5"))
+
+
+_run_shared_values = {}
+_run_shared_lock = threading.Lock()
+
+
+def _run_shared(key: str, loader):
+    """
+    Returns loader() computed at most once per run for `key`, shared by all tools and
+    workers. Concurrent callers wait for the first one; a None result is not kept so a
+    later tool can retry a failed fetch.
+    """
+    with _run_shared_lock:
+        entry = _run_shared_values.get(key)
+        is_owner = entry is None
+        if is_owner:
+            entry = _run_shared_values[key] = {"ready": threading.Event(), "value": None}
+    if not is_owner:
+        entry["ready"].wait()
+        return entry["value"]
+    try:
+        entry["value"] = loader()
+    finally:
+        if entry["value"] is None:
+            with _run_shared_lock:
+                _run_shared_values.pop(key, None)
+        entry["ready"].set()
+    return entry["value"]
+
+
+# --- GitHub helpers ---
+# GraphQL mode fetches metadata, releases, contributor and commit counts for many
+# repositories in one batched query instead of four REST calls per repository.
+GITHUB_GRAPHQL_MODE = os.getenv("GITHUB_GRAPHQL_MODE", "false").lower() in ("1", "true", "yes")
+GITHUB_GRAPHQL_BATCH_SIZE = int(os.getenv("GITHUB_GRAPHQL_BATCH_SIZE", "25"))
+GITHUB_STATS_MAX_POLLS = int(os.getenv("GITHUB_STATS_MAX_POLLS", "5"))
+GITHUB_STATS_WAIT_SECONDS = float(os.getenv("GITHUB_STATS_WAIT_SECONDS", "30"))
+
+GITHUB_GRAPHQL_REPO_FIELDS = """
+    name
+    nameWithOwner
+    owner { login }
+    description
+    stargazerCount
+    forkCount
+    watchers { totalCount }
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+    pushedAt
+    createdAt
+    updatedAt
+    primaryLanguage { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    licenseInfo { name }
+    diskUsage
+    hasIssuesEnabled
+    hasWikiEnabled
+    isArchived
+    isDisabled
+    homepageUrl
+    url
+    sshUrl
+    defaultBranchRef {
+        name
+        target { ... on Commit { history(since: $since) { totalCount } } }
+    }
+    releases(first: 1, orderBy: {field: CREATED_AT, direction: DESC}) {
+        totalCount
+        nodes { tagName name publishedAt releaseAssets(first: 50) { nodes { downloadCount } } }
+    }
+    mentionableUsers(first: 5) { totalCount nodes { login } }
+"""
+
+_github_stats_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="github-stats")
+_github_prefetched = {}
+_github_lock = threading.Lock()
+_github_rate_limit = {"graphql_queries": 0, "graphql_cost": 0}
+
+
+def _split_github_repo_url(repo_url: str):
+    """Returns (owner, repo, error) for a GitHub repository URL; error is None when valid."""
+    # Improved URL parsing
+    if not repo_url or "github.com" not in repo_url:
+        return None, None, "Invalid GitHub URL"
+    parts = repo_url.strip("/").split("/")
+    if len(parts) < 5: # e.g. https://github.com/owner/repo
+        return None, None, "URL does not appear to be a valid repository link"
+    owner, repo = parts[-2], parts[-1]
+    if owner == 'features' or owner == 'topics':
+        return None, None, "URL points to a GitHub feature or topic, not a repository"
+    return owner, repo, None
+
+
+def _get_prefetched_github_repo(owner: str, repo: str):
+    with _github_lock:
+        result = _github_prefetched.get((owner.lower(), repo.lower()))
+    return dict(result) if result is not None else None
+
+
+def _record_github_rest_rate_limit(response):
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    if remaining is not None:
+        with _github_lock:
+            _github_rate_limit["rest_remaining"] = int(remaining)
+            _github_rate_limit["rest_reset"] = response.headers.get("X-RateLimit-Reset")
+
+
+def _graphql_repo_to_result(node: dict) -> dict:
+    """Maps a GraphQL repository node onto the dictionary returned by the REST path."""
+    releases = node.get("releases") or {}
+    latest_releases = releases.get("nodes") or []
+    branch = node.get("defaultBranchRef") or {}
+    history = (branch.get("target") or {}).get("history")
+    # mentionableUsers is the closest GraphQL equivalent of the REST contributors list.
+    contributors = node.get("mentionableUsers") or {}
+
+    result = {
+        "owner": (node.get("owner") or {}).get("login"),
+        "repo_name": node.get("name"),
+        "full_name": node.get("nameWithOwner"),
+        "description": node.get("description"),
+        "stars": node.get("stargazerCount", 0),
+        "forks": node.get("forkCount", 0),
+        "watchers": (node.get("watchers") or {}).get("totalCount", 0),
+        # The REST open_issues_count includes open pull requests.
+        "open_issues": (node.get("issues") or {}).get("totalCount", 0) + (node.get("pullRequests") or {}).get("totalCount", 0),
+        "last_commit_date": node.get("pushedAt"),
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "topics": [t["topic"]["name"] for t in (node.get("repositoryTopics") or {}).get("nodes", [])],
+        "license": (node.get("licenseInfo") or {}).get("name"),
+        "size": node.get("diskUsage"),  # in KB
+        "default_branch": branch.get("name"),
+        "has_issues": node.get("hasIssuesEnabled"),
+        "has_wiki": node.get("hasWikiEnabled"),
+        "has_pages": None,  # Not exposed by the GraphQL API
+        "archived": node.get("isArchived"),
+        "disabled": node.get("isDisabled"),
+        "homepage": node.get("homepageUrl"),
+        "clone_url": f"{node['url']}.git" if node.get("url") else None,
+        "ssh_url": node.get("sshUrl"),
+        "contributors_count": contributors.get("totalCount", 0),
+        "top_contributors": [u.get("login") for u in contributors.get("nodes", [])],
+        "releases_count": releases.get("totalCount", 0)
+    }
+    if latest_releases:
+        latest_release = latest_releases[0]
+        result["latest_release"] = {
+            "tag_name": latest_release.get("tagName"),
+            "name": latest_release.get("name"),
+            "published_at": latest_release.get("publishedAt"),
+            "download_count": sum(a.get("downloadCount", 0) for a in (latest_release.get("releaseAssets") or {}).get("nodes", []))
+        }
+    if history is not None:
+        result["commits_last_year"] = history.get("totalCount")
+    return result
+
+
+def prefetch_github_repos(repo_urls: List[str], api_token: str):
+    """
+    Fetches many repositories through batched GitHub GraphQL queries and keeps the
+    results for github_analyzer for the rest of the run.
+    :param repo_urls: GitHub repository URLs; invalid or already fetched ones are skipped.
+    :param api_token: The GitHub API token.
+    """
+    if not api_token:
+        return
+    repos = []
+    for repo_url in repo_urls:
+        owner, repo, error = _split_github_repo_url(repo_url)
+        if error or _get_prefetched_github_repo(owner, repo) is not None or (owner, repo) in repos:
+            continue
+        repos.append((owner, repo))
+
+    headers = {'Authorization': f'bearer {api_token}', 'Content-Type': 'application/json'}
+    since = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=365)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    for i in range(0, len(repos), GITHUB_GRAPHQL_BATCH_SIZE):
+        batch = repos[i:i + GITHUB_GRAPHQL_BATCH_SIZE]
+        variable_defs = ", ".join(f"$o{j}: String!, $n{j}: String!" for j in range(len(batch)))
+        selections = "\n".join(f"r{j}: repository(owner: $o{j}, name: $n{j}) {{ ...RepoFields }}" for j in range(len(batch)))
+        query = (
+            f"query({variable_defs}, $since: GitTimestamp!) {{\n"
+            f"rateLimit {{ cost remaining resetAt }}\n{selections}\n}}\n"
+            f"fragment RepoFields on Repository {{{GITHUB_GRAPHQL_REPO_FIELDS}}}"
+        )
+        variables = {"since": since}
+        for j, (owner, repo) in enumerate(batch):
+            variables[f"o{j}"] = owner
+            variables[f"n{j}"] = repo
+
+        try:
+            response = get_http_client().request(
+                "POST", "https://api.github.com/graphql", headers=headers, json={"query": query, "variables": variables}
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.RequestException, ValueError) as e:
+            logging.error(f"GitHub GraphQL batch of {len(batch)} repositories failed: {e}")
+            continue
+
+        data = payload.get("data") or {}
+        rate_limit = data.get("rateLimit") or {}
+        with _github_lock:
+            _github_rate_limit["graphql_queries"] += 1
+            _github_rate_limit["graphql_cost"] += rate_limit.get("cost", 0)
+            _github_rate_limit["graphql_remaining"] = rate_limit.get("remaining")
+            _github_rate_limit["graphql_reset_at"] = rate_limit.get("resetAt")
+            for j, (owner, repo) in enumerate(batch):
+                node = data.get(f"r{j}")
+                if node:
+                    _github_prefetched[(owner.lower(), repo.lower())] = _graphql_repo_to_result(node)
+                elif "data" in payload:
+                    # Missing repositories come back as null alongside a NOT_FOUND error.
+                    _github_prefetched[(owner.lower(), repo.lower())] = {"error": "Repository not found"}
+        logging.info(f"Fetched {len(batch)} GitHub repositories in one GraphQL query (cost {rate_limit.get('cost')}, remaining {rate_limit.get('remaining')})")
+
 
 class ScraperMixin:
     """Mixin class containing all scraper tools for the ToolIntelligenceAgent."""
@@ -75,6 +321,8 @@ class ScraperMixin:
     def github_analyzer(self, repo_url: str) -> dict:
         """
         Analyzes a GitHub repository URL to extract key metrics.
+        In GraphQL mode (GITHUB_GRAPHQL_MODE) the metrics come from one batched GraphQL
+        query, usually prefetched for every tool at the start of the run.
         :param repo_url: The full URL of the GitHub repository.
         :return: A dictionary containing key metrics about the repository.
         """
@@ -89,23 +337,24 @@ class ScraperMixin:
         }
         
         try:
-            # Improved URL parsing
-            if not repo_url or "github.com" not in repo_url:
-                return {"error": "Invalid GitHub URL"}
-                
-            parts = repo_url.strip("/").split("/")
-            if len(parts) < 5: # e.g. https://github.com/owner/repo
-                logging.warning(f"Could not parse GitHub URL: {repo_url}")
-                return {"error": "URL does not appear to be a valid repository link"}
+            owner, repo, parse_error = _split_github_repo_url(repo_url)
+            if parse_error:
+                logging.warning(f"{parse_error}: {repo_url}")
+                return {"error": parse_error}
 
-            owner, repo = parts[-2], parts[-1]
-            if owner == 'features' or owner == 'topics':
-                 logging.warning(f"Skipping non-repository GitHub URL: {repo_url}")
-                 return {"error": "URL points to a GitHub feature or topic, not a repository"}
+            if GITHUB_GRAPHQL_MODE:
+                prefetched = _get_prefetched_github_repo(owner, repo)
+                if prefetched is None:
+                    prefetch_github_repos([repo_url], self.github_api_token)
+                    prefetched = _get_prefetched_github_repo(owner, repo)
+                if prefetched is not None:
+                    return prefetched
+                logging.warning(f"GraphQL lookup failed for {owner}/{repo}; falling back to the REST API")
 
             api_url = f"https://api.github.com/repos/{owner}/{repo}"
             
-            response = requests.get(api_url, headers=headers, timeout=15)
+            response = self._make_request(api_url, headers=headers)
+            _record_github_rest_rate_limit(response)
             if response.status_code == 404:
                 logging.warning(f"Repository not found at {api_url}")
                 return {"error": "Repository not found"}
@@ -114,6 +363,10 @@ class ScraperMixin:
                 return {"error": "API rate limit exceeded or access forbidden"}
             response.raise_for_status()
             data = response.json()
+
+            # GitHub computes commit statistics lazily and answers 202 until they are ready,
+            # so they are polled in the background while the other calls run.
+            activity_future = _github_stats_executor.submit(self._poll_commit_activity, owner, repo, headers)
             
             # Get additional information
             result = {
@@ -147,7 +400,7 @@ class ScraperMixin:
             try:
                 # Get contributors count
                 contributors_url = f"https://api.github.com/repos/{owner}/{repo}/contributors"
-                contributors_response = requests.get(contributors_url, headers=headers, timeout=10)
+                contributors_response = self._make_request(contributors_url, headers=headers)
                 if contributors_response.status_code == 200:
                     contributors = contributors_response.json()
                     result["contributors_count"] = len(contributors)
@@ -155,7 +408,7 @@ class ScraperMixin:
                 
                 # Get releases
                 releases_url = f"https://api.github.com/repos/{owner}/{repo}/releases"
-                releases_response = requests.get(releases_url, headers=headers, timeout=10)
+                releases_response = self._make_request(releases_url, headers=headers)
                 if releases_response.status_code == 200:
                     releases = releases_response.json()
                     result["releases_count"] = len(releases)
@@ -168,14 +421,13 @@ class ScraperMixin:
                             "download_count": sum(asset.get('download_count', 0) for asset in latest_release.get('assets', []))
                         }
                 
-                # Get commit activity (last 52 weeks)
-                commit_activity_url = f"https://api.github.com/repos/{owner}/{repo}/stats/commit_activity"
-                activity_response = requests.get(commit_activity_url, headers=headers, timeout=10)
-                if activity_response.status_code == 200:
-                    activity_data = activity_response.json()
-                    if activity_data:
-                        total_commits_last_year = sum(week.get('total', 0) for week in activity_data)
-                        result["commits_last_year"] = total_commits_last_year
+                # Get commit activity (last 52 weeks) from the background poll
+                try:
+                    commits_last_year = activity_future.result(timeout=GITHUB_STATS_WAIT_SECONDS)
+                    if commits_last_year is not None:
+                        result["commits_last_year"] = commits_last_year
+                except FuturesTimeoutError:
+                    logging.info(f"Commit statistics for {owner}/{repo} are still being computed by GitHub")
                         
             except Exception as additional_error:
                 logging.warning(f"Could not get additional GitHub metrics: {additional_error}")
@@ -186,10 +438,37 @@ class ScraperMixin:
             logging.error(f"Failed to analyze GitHub repo {repo_url}: {e}")
             return {"error": str(e)}
 
+    def _poll_commit_activity(self, owner: str, repo: str, headers: dict):
+        """
+        Fetches the total commits of the last 52 weeks, polling while GitHub answers
+        202 Accepted (statistics still being computed).
+        :return: The commit count, or None if it could not be obtained.
+        """
+        url = f"https://api.github.com/repos/{owner}/{repo}/stats/commit_activity"
+        delay = 1.0
+        for attempt in range(GITHUB_STATS_MAX_POLLS):
+            try:
+                response = self._make_request(url, headers=headers)
+            except requests.RequestException as e:
+                logging.debug(f"Commit activity request failed for {owner}/{repo}: {e}")
+                return None
+            _record_github_rest_rate_limit(response)
+            if response.status_code == 200:
+                activity_data = response.json()
+                return sum(week.get('total', 0) for week in activity_data) if activity_data else None
+            if response.status_code != 202:
+                return None
+            time.sleep(delay)
+            delay *= 2
+        logging.info(f"GitHub did not finish computing commit statistics for {owner}/{repo}")
+        return None
+
     @tool()
     def reddit_searcher(self, tool_name: str, subreddits: List[str]) -> dict:
         """
         Searches specific subreddits for a tool name using the Reddit API (PRAW).
+        All subreddits are searched with one combined query, throttled by a token bucket
+        shared with every other worker in the run.
         :param tool_name: The name of the tool to search for.
         :param subreddits: A list of subreddit names to search within.
         :return: A dictionary containing aggregated search results.
@@ -200,28 +479,34 @@ class ScraperMixin:
 
         logging.info(f"Searching Reddit API for '{tool_name}' in subreddits: {subreddits}")
         
+        # Corrected the case of the subreddit name
+        subreddit_names = ['artificialinteligence' if name == 'ArtificialInteligence' else name for name in subreddits]
+
         search_results = []
         try:
-            for sub_name in subreddits:
-                try:
-                    # Corrected the case of the subreddit name
-                    if sub_name == 'ArtificialInteligence':
-                        sub_name = 'artificialinteligence'
-
-                    subreddit = self.reddit_client.subreddit(sub_name)
-                    # Search for the tool name in the subreddit, limit results to keep it focused
-                    for submission in subreddit.search(tool_name, limit=10, sort='relevance', time_filter='year'):
-                        search_results.append({
-                            "subreddit": sub_name,
-                            "title": submission.title,
-                            "score": submission.score,
-                            "url": submission.url,
-                            "selftext": submission.selftext[:500] # Truncate for brevity
-                        })
-                except prawcore.exceptions.NotFound:
-                    logging.warning(f"Subreddit 'r/{sub_name}' not found. Skipping.")
-                except prawcore.exceptions.Forbidden:
-                    logging.warning(f"Subreddit 'r/{sub_name}' is private or quarantined. Skipping.")
+            try:
+                # A single multi-subreddit query (r/a+b+c) replaces one round-trip per subreddit.
+                REDDIT_RATE_LIMITER.acquire()
+                combined = self.reddit_client.subreddit("+".join(subreddit_names))
+                for submission in combined.search(tool_name, limit=10 * len(subreddit_names), sort='relevance', time_filter='year'):
+                    search_results.append(self._reddit_submission_to_dict(submission, submission.subreddit.display_name))
+            except (prawcore.exceptions.NotFound, prawcore.exceptions.Forbidden, prawcore.exceptions.Redirect) as e:
+                # One missing or private subreddit fails the whole combined query.
+                logging.warning(f"Combined Reddit search failed ({e}); searching subreddits individually.")
+                search_results = []
+                for sub_name in subreddit_names:
+                    try:
+                        REDDIT_RATE_LIMITER.acquire()
+                        subreddit = self.reddit_client.subreddit(sub_name)
+                        # Search for the tool name in the subreddit, limit results to keep it focused
+                        for submission in subreddit.search(tool_name, limit=10, sort='relevance', time_filter='year'):
+                            search_results.append(self._reddit_submission_to_dict(submission, sub_name))
+                    except prawcore.exceptions.NotFound:
+                        logging.warning(f"Subreddit 'r/{sub_name}' not found. Skipping.")
+                    except prawcore.exceptions.Forbidden:
+                        logging.warning(f"Subreddit 'r/{sub_name}' is private or quarantined. Skipping.")
+            finally:
+                self._observe_reddit_limits()
 
             # Sort results by score to prioritize more popular mentions
             search_results.sort(key=lambda x: x['score'], reverse=True)
@@ -233,6 +518,28 @@ class ScraperMixin:
             logging.error(f"An error occurred during Reddit API search: {e}", exc_info=True)
             return {"error": str(e)}
 
+    def _reddit_submission_to_dict(self, submission, sub_name: str) -> dict:
+        """Converts a PRAW submission into the result record returned by reddit_searcher."""
+        return {
+            "subreddit": sub_name,
+            "title": submission.title,
+            "score": submission.score,
+            "url": submission.url,
+            "selftext": submission.selftext[:500] # Truncate for brevity
+        }
+
+    def _observe_reddit_limits(self):
+        """Feeds the rate-limit headers PRAW last saw into the shared Reddit token bucket."""
+        try:
+            limits = self.reddit_client.auth.limits
+        except Exception:
+            return
+        if not limits or limits.get("remaining") is None:
+            return
+        reset_timestamp = limits.get("reset_timestamp")
+        reset_in = max(reset_timestamp - time.time(), 0) if reset_timestamp else None
+        REDDIT_RATE_LIMITER.observe(limits.get("remaining"), reset_in, limits.get("used"))
+
     @tool()
     def stock_data_fetcher(self, stock_symbol: str) -> dict:
         """
@@ -252,7 +559,7 @@ class ScraperMixin:
             "apikey": self.alpha_vantage_api_key
         }
         try:
-            response = requests.get(base_url, params=params, timeout=15)
+            response = self._make_request(base_url, params=params)
             response.raise_for_status()
             data = response.json()
             quote = data.get("Global Quote")
@@ -286,7 +593,7 @@ class ScraperMixin:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(search_url, headers=headers, timeout=15)
+            response = self._make_request(search_url, headers=headers)
             response.raise_for_status()
             
             from bs4 import BeautifulSoup
@@ -336,7 +643,7 @@ class ScraperMixin:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(search_url, headers=headers, timeout=15)
+            response = self._make_request(search_url, headers=headers)
             response.raise_for_status()
             
             from bs4 import BeautifulSoup
@@ -387,12 +694,12 @@ class ScraperMixin:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(search_url, headers=headers, timeout=15)
+            response = self._make_request(search_url, headers=headers)
             
             if response.status_code == 404:
                 # Try alternative search format
                 search_url = f"https://wellfound.com/companies/{company_name.lower().replace(' ', '-')}"
-                response = requests.get(search_url, headers=headers, timeout=15)
+                response = self._make_request(search_url, headers=headers)
             
             if response.status_code == 200:
                 from bs4 import BeautifulSoup
@@ -544,7 +851,7 @@ class ScraperMixin:
             "pageSize": 20
         }
         try:
-            response = requests.get(base_url, params=params, timeout=15)
+            response = self._make_request(base_url, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -585,7 +892,7 @@ class ScraperMixin:
         }
         
         try:
-            response = requests.get(base_url, params=params, timeout=15)
+            response = self._make_request(base_url, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -631,7 +938,7 @@ class ScraperMixin:
         }
         
         try:
-            response = requests.get(base_url, params=params, timeout=15)
+            response = self._make_request(base_url, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -705,11 +1012,11 @@ class ScraperMixin:
         }
 
         try:
-            response = requests.post(
+            response = self._make_request(
                 api_url, 
                 headers=headers, 
                 json=graphql_query,
-                timeout=20
+                method="POST"
             )
             response.raise_for_status()
             data = response.json()
@@ -752,121 +1059,48 @@ class ScraperMixin:
         """
         logging.info(f"Searching Dev.to for: {tool_name}")
         
-        # Dev.to has multiple search strategies
         relevant_articles = []
+        seen_urls = set()
+
+        def add_articles(articles, found_via):
+            for article in articles:
+                article_url = article.get("url")
+                if article_url in seen_urls:
+                    continue
+                seen_urls.add(article_url)
+                relevant_articles.append(self._devto_article_record(article, found_via))
         
         try:
-            # Strategy 1: Search by tags
-            tag_searches = [
-                tool_name.lower(),
-                f"{tool_name.lower()}-editor" if "editor" not in tool_name.lower() else None,
-                f"{tool_name.lower()}-ai" if "ai" not in tool_name.lower() else None,
-            ]
-            
-            for tag in tag_searches:
-                if tag:
-                    try:
-                        tag_url = f"https://dev.to/api/articles?tag={tag}&per_page=20"
-                        tag_response = requests.get(tag_url, timeout=10)
-                        if tag_response.status_code == 200:
-                            tag_articles = tag_response.json()
-                            for article in tag_articles:
-                                relevant_articles.append({
-                                    "title": article.get("title"),
-                                    "url": article.get("url"),
-                                    "description": article.get("description"),
-                                    "published_at": article.get("published_at"),
-                                    "positive_reactions_count": article.get("positive_reactions_count", 0),
-                                    "comments_count": article.get("comments_count", 0),
-                                    "reading_time_minutes": article.get("reading_time_minutes", 0),
-                                    "tags": article.get("tag_list", []),
-                                    "user": article.get("user", {}).get("name", "Unknown"),
-                                    "organization": article.get("organization", {}).get("name") if article.get("organization") else None,
-                                    "found_via": f"tag: {tag}"
-                                })
-                    except Exception as tag_error:
-                        logging.debug(f"Tag search failed for {tag}: {tag_error}")
-            
-            # Strategy 2: Search general articles and filter
-            general_params = {
-                "tag": "programming,webdev,ai,development,coding",
-                "per_page": 50,
-                "state": "fresh"
-            }
+            # Strategy 1 (tag searches) and strategy 3 (name variations) are planned together:
+            # tags are normalized the way Dev.to stores them, so e.g. "cursor-ai" and "Cursor AI"
+            # collapse into one request, and all distinct tags are fetched concurrently.
+            tag_plan = self._plan_devto_tags(tool_name)
+            with ThreadPoolExecutor(max_workers=DEVTO_MAX_CONCURRENCY) as executor:
+                tag_results = dict(zip(tag_plan, executor.map(self._fetch_devto_tag, tag_plan)))
+
+            for tag, (strategy, label) in tag_plan.items():
+                if strategy == "tag":
+                    add_articles(tag_results[tag], f"tag: {label}")
             
-            general_response = requests.get("https://dev.to/api/articles", params=general_params, timeout=15)
-            if general_response.status_code == 200:
-                articles = general_response.json()
+            # Strategy 2: Search general articles and filter. The feed does not depend on
+            # the tool, so it is fetched once per run and shared by every tool.
+            tool_name_lower = tool_name.lower()
+            general_matches = []
+            for article in _run_shared("devto_fresh_feed", self._fetch_devto_fresh_feed) or []:
+                title = (article.get("title") or "").lower()
+                description = (article.get("description") or "").lower()
+                tags = [tag.lower() for tag in article.get("tag_list", [])]
                 
-                tool_name_lower = tool_name.lower()
-                for article in articles:
-                    title = article.get("title", "").lower()
-                    description = article.get("description", "").lower()
-                    tags = [tag.lower() for tag in article.get("tag_list", [])]
-                    
-                    # More flexible matching
-                    if (tool_name_lower in title or 
-                        tool_name_lower in description or 
-                        tool_name_lower in tags or
-                        any(tool_name_lower in tag for tag in tags)):
-                        
-                        # Check if we already have this article
-                        article_url = article.get("url")
-                        if not any(a.get("url") == article_url for a in relevant_articles):
-                            relevant_articles.append({
-                                "title": article.get("title"),
-                                "url": article_url,
-                                "description": article.get("description"),
-                                "published_at": article.get("published_at"),
-                                "positive_reactions_count": article.get("positive_reactions_count", 0),
-                                "comments_count": article.get("comments_count", 0),
-                                "reading_time_minutes": article.get("reading_time_minutes", 0),
-                                "tags": article.get("tag_list", []),
-                                "user": article.get("user", {}).get("name", "Unknown"),
-                                "organization": article.get("organization", {}).get("name") if article.get("organization") else None,
-                                "found_via": "general search"
-                            })
-            
-            # Strategy 3: Search for variations of the tool name
-            tool_variations = [
-                tool_name,
-                tool_name.replace(" ", ""),
-                tool_name.replace(" ", "-"),
-                f"{tool_name} AI",
-                f"{tool_name} editor",
-                f"{tool_name} tool"
-            ]
-            
-            for variation in tool_variations:
-                if variation.lower() != tool_name.lower():
-                    try:
-                        # Use the search endpoint if available
-                        search_params = {
-                            "per_page": 20,
-                            "state": "fresh"
-                        }
-                        search_url = f"https://dev.to/api/articles?tag={variation.lower().replace(' ', '')}"
-                        search_response = requests.get(search_url, timeout=10)
-                        if search_response.status_code == 200:
-                            search_articles = search_response.json()
-                            for article in search_articles:
-                                article_url = article.get("url")
-                                if not any(a.get("url") == article_url for a in relevant_articles):
-                                    relevant_articles.append({
-                                        "title": article.get("title"),
-                                        "url": article_url,
-                                        "description": article.get("description"),
-                                        "published_at": article.get("published_at"),
-                                        "positive_reactions_count": article.get("positive_reactions_count", 0),
-                                        "comments_count": article.get("comments_count", 0),
-                                        "reading_time_minutes": article.get("reading_time_minutes", 0),
-                                        "tags": article.get("tag_list", []),
-                                        "user": article.get("user", {}).get("name", "Unknown"),
-                                        "organization": article.get("organization", {}).get("name") if article.get("organization") else None,
-                                        "found_via": f"variation: {variation}"
-                                    })
-                    except Exception as var_error:
-                        logging.debug(f"Variation search failed for {variation}: {var_error}")
+                # More flexible matching
+                if (tool_name_lower in title or 
+                    tool_name_lower in description or 
+                    any(tool_name_lower in tag for tag in tags)):
+                    general_matches.append(article)
+            add_articles(general_matches, "general search")
+
+            for tag, (strategy, label) in tag_plan.items():
+                if strategy == "variation":
+                    add_articles(tag_results[tag], f"variation: {label}")
             
             # Sort by reactions and limit results
             relevant_articles.sort(key=lambda x: x.get('positive_reactions_count', 0), reverse=True)
@@ -880,6 +1114,78 @@ class ScraperMixin:
             logging.error(f"Failed to search Dev.to for {tool_name}: {e}")
             return {"error": str(e)}
 
+    def _plan_devto_tags(self, tool_name: str) -> dict:
+        """
+        Builds the de-duplicated set of Dev.to tags to query for a tool.
+        Dev.to tags are lowercase alphanumerics, so candidates are normalized before
+        de-duplication; the first strategy that produced a tag is kept for attribution.
+        :return: An ordered dictionary mapping tag to (strategy, original label).
+        """
+        name_lower = tool_name.lower()
+        candidates = [
+            ("tag", name_lower),
+            ("tag", f"{name_lower}-editor" if "editor" not in name_lower else None),
+            ("tag", f"{name_lower}-ai" if "ai" not in name_lower else None),
+        ]
+        variations = [
+            tool_name.replace(" ", ""),
+            tool_name.replace(" ", "-"),
+            f"{tool_name} AI",
+            f"{tool_name} editor",
+            f"{tool_name} tool"
+        ]
+        candidates += [("variation", v) for v in variations if v.lower() != name_lower]
+
+        plan = {}
+        for strategy, label in candidates:
+            if not label:
+                continue
+            tag = re.sub(r"[^a-z0-9]", "", label.lower())
+            if tag and tag not in plan:
+                plan[tag] = (strategy, label)
+        return plan
+
+    def _fetch_devto_tag(self, tag: str) -> list:
+        """Fetches the latest Dev.to articles for one tag; failures yield an empty list."""
+        try:
+            response = self._make_request("https://dev.to/api/articles", params={"tag": tag, "per_page": 20})
+            if response.status_code == 200:
+                return response.json()
+        except (requests.RequestException, ValueError) as e:
+            logging.debug(f"Tag search failed for {tag}: {e}")
+        return []
+
+    def _fetch_devto_fresh_feed(self):
+        """Fetches the general 'fresh' Dev.to feed used to find mentions outside of tags."""
+        general_params = {
+            "tag": "programming,webdev,ai,development,coding",
+            "per_page": 50,
+            "state": "fresh"
+        }
+        try:
+            response = self._make_request("https://dev.to/api/articles", params=general_params)
+            if response.status_code == 200:
+                return response.json()
+        except (requests.RequestException, ValueError) as e:
+            logging.warning(f"Could not fetch the general Dev.to feed: {e}")
+        return None
+
+    def _devto_article_record(self, article: dict, found_via: str) -> dict:
+        """Converts a Dev.to API article into the record returned by devto_searcher."""
+        return {
+            "title": article.get("title"),
+            "url": article.get("url"),
+            "description": article.get("description"),
+            "published_at": article.get("published_at"),
+            "positive_reactions_count": article.get("positive_reactions_count", 0),
+            "comments_count": article.get("comments_count", 0),
+            "reading_time_minutes": article.get("reading_time_minutes", 0),
+            "tags": article.get("tag_list", []),
+            "user": article.get("user", {}).get("name", "Unknown"),
+            "organization": article.get("organization", {}).get("name") if article.get("organization") else None,
+            "found_via": found_via
+        }
+
     @tool()
     def npm_searcher(self, tool_name: str) -> dict:
         """
@@ -902,12 +1208,11 @@ class ScraperMixin:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36'
             }
-            response = requests.get(base_url, params=params, headers=headers, timeout=15)
+            response = self._make_request(base_url, params=params, headers=headers)
             response.raise_for_status()
             data = response.json()
             
-            packages = []
-            relevant_packages = []
+            relevant_objects = []
             
             for obj in data.get("objects", []):
                 package = obj.get("package", {})
@@ -927,44 +1232,35 @@ class ScraperMixin:
                     any(term in keywords for term in ["ai", "editor", "code", "development"])
                 )
                 
-                if is_relevant:
-                    # Get detailed package info for relevant packages
-                    try:
-                        detail_response = requests.get(f"https://registry.npmjs.org/{package_name}", timeout=10)
-                        if detail_response.status_code == 200:
-                            detail_data = detail_response.json()
-                            latest_version = package.get("version")
-                            
-                            # Get download stats
-                            downloads_url = f"https://api.npmjs.org/downloads/point/last-week/{package_name}"
-                            weekly_downloads = None
-                            try:
-                                downloads_response = requests.get(downloads_url, timeout=5)
-                                if downloads_response.status_code == 200:
-                                    weekly_downloads = downloads_response.json().get("downloads")
-                            except:
-                                pass  # Downloads API might be down, continue without it
-                            
-                            package_info = {
-                                "name": package_name,
-                                "version": latest_version,
-                                "description": package.get("description"),
-                                "keywords": package.get("keywords", []),
-                                "npm_url": f"https://www.npmjs.com/package/{package_name}",
-                                "homepage": package.get("links", {}).get("homepage"),
-                                "repository": package.get("links", {}).get("repository"),
-                                "weekly_downloads": weekly_downloads,
-                                "license": package.get("license"),
-                                "last_publish": package.get("date"),
-                                "author": package.get("author", {}).get("name") if package.get("author") else None,
-                                "maintainers_count": len(package.get("maintainers", [])),
-                                "score": obj.get("score", {}),
-                                "relevance_score": self._calculate_npm_relevance_score(tool_name, package)
-                            }
-                            relevant_packages.append(package_info)
-                    except Exception as detail_error:
-                        logging.warning(f"Could not get detailed info for {package_name}: {detail_error}")
-                        continue
+                if is_relevant and package_name:
+                    relevant_objects.append(obj)
+            
+            # Everything we report comes from the search result itself, so the full
+            # registry document is not fetched; only download counts are looked up, in bulk.
+            weekly_downloads = self._fetch_npm_weekly_downloads(
+                [obj["package"]["name"] for obj in relevant_objects]
+            )
+            
+            relevant_packages = []
+            for obj in relevant_objects:
+                package = obj["package"]
+                package_name = package["name"]
+                relevant_packages.append({
+                    "name": package_name,
+                    "version": package.get("version"),
+                    "description": package.get("description"),
+                    "keywords": package.get("keywords", []),
+                    "npm_url": f"https://www.npmjs.com/package/{package_name}",
+                    "homepage": package.get("links", {}).get("homepage"),
+                    "repository": package.get("links", {}).get("repository"),
+                    "weekly_downloads": weekly_downloads.get(package_name),
+                    "license": package.get("license"),
+                    "last_publish": package.get("date"),
+                    "author": package.get("author", {}).get("name") if package.get("author") else None,
+                    "maintainers_count": len(package.get("maintainers", [])),
+                    "score": obj.get("score", {}),
+                    "relevance_score": self._calculate_npm_relevance_score(tool_name, package)
+                })
             
             # Sort by relevance score
             relevant_packages.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
@@ -977,6 +1273,53 @@ class ScraperMixin:
             logging.error(f"Failed to search NPM for {tool_name}: {e}")
             return {"error": str(e)}
 
+    def _fetch_npm_weekly_downloads(self, package_names: List[str]) -> dict:
+        """
+        Looks up last-week download counts for many NPM packages at once.
+        Unscoped packages go through npm's bulk endpoint (comma-separated names, up to
+        128 per request); scoped packages are not supported there and are fetched
+        individually on a small bounded pool.
+        :param package_names: The package names to look up.
+        :return: A dictionary mapping package name to weekly downloads.
+        """
+        downloads = {}
+        unscoped = [name for name in package_names if not name.startswith("@")]
+        scoped = [name for name in package_names if name.startswith("@")]
+        base_url = "https://api.npmjs.org/downloads/point/last-week"
+
+        for i in range(0, len(unscoped), NPM_BULK_DOWNLOADS_LIMIT):
+            batch = unscoped[i:i + NPM_BULK_DOWNLOADS_LIMIT]
+            try:
+                response = self._make_request(f"{base_url}/{','.join(batch)}")
+                if response.status_code != 200:
+                    continue
+                data = response.json()
+                if len(batch) == 1:
+                    # A single name returns the plain point format rather than a mapping.
+                    downloads[batch[0]] = data.get("downloads")
+                else:
+                    for name in batch:
+                        if data.get(name):
+                            downloads[name] = data[name].get("downloads")
+            except (requests.RequestException, ValueError) as e:
+                logging.warning(f"Could not get bulk NPM download counts: {e}")
+
+        def fetch_single(name):
+            try:
+                response = self._make_request(f"{base_url}/{name}")
+                if response.status_code == 200:
+                    return name, response.json().get("downloads")
+            except (requests.RequestException, ValueError) as e:
+                logging.debug(f"Could not get NPM download count for {name}: {e}")
+            return name, None
+
+        if scoped:
+            with ThreadPoolExecutor(max_workers=NPM_MAX_CONCURRENCY) as executor:
+                for name, count in executor.map(fetch_single, scoped):
+                    downloads[name] = count
+
+        return downloads
+
     def _calculate_npm_relevance_score(self, tool_name: str, package_info: dict) -> float:
         """Calculate a relevance score for an NPM package based on the tool name."""
         score = 0.0
@@ -1046,12 +1389,13 @@ class ScraperMixin:
                 f"python-{tool_name_lower}"
             ]
         
-        packages = []
-        relevant_packages = []
-        
-        for package_name in potential_packages:
+        # Most guesses do not exist, so all of them are probed at once. Known-missing
+        # names are answered from the HTTP layer's negative cache without a request.
+        potential_packages = list(dict.fromkeys(potential_packages))
+
+        def probe(package_name):
             try:
-                detail_response = requests.get(f"https://pypi.org/pypi/{package_name}/json", timeout=10)
+                detail_response = self._make_request(f"https://pypi.org/pypi/{package_name}/json")
                 if detail_response.status_code == 200:
                     detail_data = detail_response.json()
                     info = detail_data.get("info", {})
@@ -1091,13 +1435,16 @@ class ScraperMixin:
                             "release_count": len(releases),
                             "relevance_score": self._calculate_relevance_score(tool_name, info)
                         }
-                        relevant_packages.append(package_info)
+                        return package_info
                     else:
                         logging.debug(f"Package {package_name} deemed not relevant to {tool_name}")
                         
             except Exception as detail_error:
                 logging.debug(f"Package {package_name} not found on PyPI: {detail_error}")
-                continue
+            return None
+
+        with ThreadPoolExecutor(max_workers=PYPI_MAX_CONCURRENCY) as executor:
+            relevant_packages = [info for info in executor.map(probe, potential_packages) if info]
         
         # Sort by relevance score and limit results
         relevant_packages.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
@@ -1142,53 +1489,39 @@ class ScraperMixin:
     def medium_searcher(self, tool_name: str) -> dict:
         """
         Searches Medium for articles mentioning a specific tool.
-        Note: Medium's API has limited public access, so this uses web scraping approach.
+        Note: Medium's API has limited public access, so this scans the RSS feeds of
+        popular tech publications. The feeds are downloaded and indexed once per run
+        and shared by every tool.
         :param tool_name: The name of the tool to search for.
         :return: A dictionary containing search results from Medium.
         """
         logging.info(f"Searching Medium for: {tool_name}")
         
-        # Medium search via RSS feeds and public endpoints
-        # Note: Medium's official API requires partnership approval
-        search_query = tool_name.replace(" ", "+")
-        
         try:
-            # Use Medium's search functionality
-            search_url = f"https://medium.com/search"
-            params = {
-                "q": tool_name
-            }
-            
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            
-            # For now, let's use a simpler approach with RSS feeds from popular tech publications
-            tech_publications = [
-                "https://medium.com/feed/@towardsdatascience",
-                "https://medium.com/feed/better-programming", 
-                "https://medium.com/feed/hackernoon"
-            ]
-            
+            feed_index = _run_shared("medium_feed_index", self._build_medium_feed_index)
+            if feed_index is None:
+                return {"error": "Could not fetch any Medium feeds"}
+
+            # Candidate items contain every word of the tool name; the phrase itself is
+            # then confirmed against the pre-lowercased text.
+            tool_name_lower = tool_name.lower()
+            tokens = re.findall(r"[a-z0-9]+", tool_name_lower)
+            postings = [feed_index["postings"].get(token, set()) for token in tokens]
+            candidates = sorted(set.intersection(*postings)) if postings else []
+
             articles = []
-            for feed_url in tech_publications:
-                try:
-                    feed_response = requests.get(feed_url, headers=headers, timeout=10)
-                    if feed_response.status_code == 200:
-                        # Simple parsing for titles that mention the tool
-                        content = feed_response.text
-                        if tool_name.lower() in content.lower():
-                            # This is a simplified approach - in production, you'd want proper RSS parsing
-                            # For now, we'll return a placeholder structure
-                            articles.append({
-                                "title": f"Article mentioning {tool_name}",
-                                "url": feed_url.replace("/feed", ""),
-                                "publication": feed_url.split("/")[-1] if "/" in feed_url else "Medium",
-                                "found_via": "RSS feed scan"
-                            })
-                except Exception as feed_error:
-                    logging.debug(f"Could not process feed {feed_url}: {feed_error}")
-                    continue
+            for item_id in candidates:
+                item = feed_index["items"][item_id]
+                if tool_name_lower in item["search_text"]:
+                    articles.append({
+                        "title": item["title"],
+                        "url": item["url"],
+                        "publication": item["publication"],
+                        "author": item["author"],
+                        "published_at": item["published_at"],
+                        "categories": item["categories"],
+                        "found_via": "RSS feed scan"
+                    })
             
             # If we have the Medium API key, we could use it here
             if self.medium_api_key:
@@ -1203,9 +1536,73 @@ class ScraperMixin:
             logging.error(f"Failed to search Medium for {tool_name}: {e}")
             return {"error": str(e)}
 
-    def _make_request(self, url: str, headers: dict = None, params: dict = None) -> requests.Response:
-        """Centralized request-making method."""
-        return requests.get(url, headers=headers, params=params, timeout=10)
+    def _build_medium_feed_index(self):
+        """
+        Downloads the Medium publication feeds, parses them into item records and builds
+        a word index over their pre-lowercased titles, categories and text.
+        :return: {"items": [...], "postings": {word: set(item ids)}}, or None if no feed could be fetched.
+        """
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
+
+        def fetch(feed_url):
+            try:
+                feed_response = self._make_request(feed_url, headers=headers)
+                if feed_response.status_code == 200:
+                    return feed_url, feed_response.content
+            except requests.RequestException as feed_error:
+                logging.debug(f"Could not fetch feed {feed_url}: {feed_error}")
+            return feed_url, None
+
+        with ThreadPoolExecutor(max_workers=len(MEDIUM_FEEDS)) as executor:
+            feeds = list(executor.map(fetch, MEDIUM_FEEDS))
+        if all(content is None for _, content in feeds):
+            return None
+
+        items = []
+        postings = {}
+        seen_urls = set()
+        for feed_url, content in feeds:
+            if content is None:
+                continue
+            try:
+                channel_items = ElementTree.fromstring(content).iter("item")
+            except ElementTree.ParseError as parse_error:
+                logging.debug(f"Could not parse feed {feed_url}: {parse_error}")
+                continue
+            publication = feed_url.rstrip("/").split("/")[-1]
+            for entry in channel_items:
+                url = entry.findtext("link")
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                title = entry.findtext("title") or ""
+                categories = [c.text for c in entry.findall("category") if c.text]
+                body = entry.findtext(RSS_CONTENT_ENCODED) or entry.findtext("description") or ""
+                text = re.sub(r"<[^>]+>", " ", body)
+                search_text = " ".join([title, " ".join(categories), text]).lower()
+
+                item_id = len(items)
+                items.append({
+                    "title": title,
+                    "url": url,
+                    "publication": publication,
+                    "author": entry.findtext(RSS_DC_CREATOR),
+                    "published_at": entry.findtext("pubDate"),
+                    "categories": categories,
+                    "search_text": search_text
+                })
+                for token in set(re.findall(r"[a-z0-9]+", search_text)):
+                    postings.setdefault(token, set()).add(item_id)
+
+        logging.info(f"Indexed {len(items)} Medium feed items for this run")
+        return {"items": items, "postings": postings}
+
+    def _make_request(self, url: str, headers: dict = None, params: dict = None,
+                      method: str = "GET", json: dict = None) -> requests.Response:
+        """Centralized request-making method; every scraper call goes through the shared pooled HTTP client."""
+        return get_http_client().request(method, url, headers=headers, params=params, json=json)
 
     @tool()
     def youtube_searcher(self, tool_name: str) -> dict:
@@ -1257,4 +1654,11 @@ class ScraperMixin:
             return {"error": str(e), "status_code": e.response.status_code, "response_text": e.response.text, "videos": []}
         except Exception as e:
             logging.error(f"An unexpected error occurred during YouTube search for {tool_name}: {e}")
-            return {"error": str(e), "videos": []}
\ No newline at end of file
+            return {"error": str(e), "videos": []}
+
+
+def log_run_stats():
+    """Logs run-wide scraper statistics such as the Reddit and GitHub quota used."""
+    REDDIT_RATE_LIMITER.log_stats()
+    with _github_lock:
+        logging.info(f"GitHub API rate limit: {dict(_github_rate_limit)}")
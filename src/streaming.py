@@ -0,0 +1,92 @@
+"""
+Streaming model calls that stop as soon as the answer is complete.
+
+The analysis prompts ask for a single JSON object enclosed in ```json ... ```.
+Models often keep writing after the closing fence (explanations, caveats), and
+those tokens cost time and money without adding anything we parse. Streaming
+the response lets us watch for the closing fence and close the stream right
+there, which also cancels the generation on the provider side.
+"""
+import time
+
+from json_scan import JSON_FENCE_OPEN, BalancedSpanScanner
+
+
+JSON_FENCE_CLOSE = "```"
+
+
+class FencedJsonDetector:
+    """
+    Incrementally detects the end of the first ```json fenced block in streamed text.
+    The block only counts as closed once its JSON object is balanced and a closing fence
+    follows it, so a ``` inside a string value does not end the stream.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._body_start = None
+        self._scan_from = 0
+        self._object_start = None
+        self._object_end = None
+        self._scanner = BalancedSpanScanner()
+
+    def feed(self, text: str) -> bool:
+        """Adds streamed text and returns True once the fenced JSON block is closed."""
+        self._buffer += text
+        if self._body_start is None:
+            # Resume a little before the previous end in case the fence was split across chunks.
+            start = self._buffer.find(JSON_FENCE_OPEN, max(self._scan_from - len(JSON_FENCE_OPEN), 0))
+            if start < 0:
+                self._scan_from = len(self._buffer)
+                return False
+            self._body_start = self._scan_from = start + len(JSON_FENCE_OPEN)
+        if self._object_start is None:
+            start = self._buffer.find("{", self._scan_from)
+            if start < 0:
+                self._scan_from = len(self._buffer)
+                return False
+            self._object_start = self._scan_from = start
+        if self._object_end is None:
+            end = self._scanner.feed(self._buffer[self._scan_from:])
+            self._scan_from = len(self._buffer)
+            if end < 0:
+                return False
+            self._object_end = self._scan_from = self._object_start + end
+        end = self._buffer.find(JSON_FENCE_CLOSE, max(self._scan_from - len(JSON_FENCE_CLOSE), self._object_end))
+        if end < 0:
+            self._scan_from = len(self._buffer)
+            return False
+        return True
+
+
+async def stream_until_json(agent, prompt: str):
+    """
+    Streams an agent's response to a prompt and stops once the fenced JSON block is complete.
+    :return: (response text, monotonic time of the first text token or None, whether the stream was
+             stopped early, token usage reported by the provider or None if the stream was cut short)
+    """
+    parts = []
+    first_token_at = None
+    usage = None
+    detector = FencedJsonDetector()
+    stream = agent.stream_async(prompt)
+    try:
+        async for event in stream:
+            if not isinstance(event, dict):
+                continue
+            if "result" in event:
+                # The final event carries the AgentResult with the accumulated token usage.
+                usage = getattr(getattr(event["result"], "metrics", None), "accumulated_usage", None)
+                continue
+            text = event.get("data")
+            if not text:
+                continue
+            if first_token_at is None:
+                first_token_at = time.monotonic()
+            parts.append(text)
+            if detector.feed(text):
+                return "".join(parts), first_token_at, True, None
+    finally:
+        # Closing the generator ends the model stream, so nothing after the fence is generated.
+        await stream.aclose()
+    return "".join(parts), first_token_at, False, usage
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for token-budget chunking and packing of analysis sources (src/chunking.py).
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from chunking import chunk_by_tokens, estimate_tokens, pack_sources, source_label, truncate_to_tokens
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens(None) == 0
+    # Punctuation counts one token each, words one per four characters.
+    assert estimate_tokens('{"name": "abcdefgh"}') == 2 + 1 + 1 + 2 + 1 + 1 + 1 + 1
+
+
+def test_chunks_fit_budget_and_keep_all_text():
+    text = "\n\n".join(f"## Section {i}\n" + " ".join(f"word{j}" for j in range(80)) for i in range(20))
+    chunks = chunk_by_tokens(text, 300)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 300 for chunk in chunks)
+    assert "".join(chunks) == text
+
+
+def test_chunks_cut_on_paragraph_boundaries():
+    paragraphs = [" ".join(["lorem"] * 100) for _ in range(4)]
+    chunks = chunk_by_tokens("\n\n".join(paragraphs), estimate_tokens(paragraphs[0]) + 5)
+    assert [chunk.strip() for chunk in chunks] == paragraphs
+
+
+def test_text_without_boundaries_is_cut_by_characters():
+    chunks = chunk_by_tokens("x" * 10000, 100)
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert "".join(chunks) == "x" * 10000
+
+
+def test_empty_text_has_no_chunks():
+    assert chunk_by_tokens("", 100) == []
+    assert chunk_by_tokens("   \n", 100) == []
+    assert truncate_to_tokens("", 100) == ""
+
+
+def test_pack_sources_keeps_order_and_labels_packed_sources():
+    sources = {"a": "alpha " * 50, "b": "beta " * 300, "c": "gamma " * 50}
+    chunks = pack_sources(sources, estimate_tokens(sources["b"]) + 20)
+    assert [names for names, _ in chunks] == [["a", "c"], ["b"]]
+    assert chunks[0][1] == source_label("a") + sources["a"] + "\n" + source_label("c") + sources["c"]
+    # A source alone in its chunk is not labelled.
+    assert chunks[1][1] == sources["b"]
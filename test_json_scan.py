@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON object scanner used to extract model responses (src/json_scan.py).
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from json_scan import balanced_span_end, extract_first_json_object, find_json_objects
+
+
+def test_fenced_object_is_preferred():
+    text = 'Example: {"draft": true}\n```json\n{"a": {"b": [1, 2]}}\n```\nDone.'
+    assert extract_first_json_object(text) == '{"a": {"b": [1, 2]}}'
+
+
+def test_unfenced_object_in_prose():
+    text = 'Here is the analysis: {"stars": 10, "note": "uses {braces} in a string"} as requested.'
+    assert extract_first_json_object(text) == '{"stars": 10, "note": "uses {braces} in a string"}'
+
+
+def test_non_json_braces_are_skipped_with_their_contents():
+    text = 'Template {employee_count} and { mode: {"nested": 1} } then {"a": 1}'
+    assert find_json_objects(text) == ['{"a": 1}']
+
+
+def test_stray_unclosed_brace_does_not_hide_later_objects():
+    assert extract_first_json_object('Use the { key to open. Result: {"a": 1}') == '{"a": 1}'
+    assert find_json_objects('{ oops {"a": 1} and {"b": 2}') == ['{"a": 1}', '{"b": 2}']
+
+
+def test_stray_brace_in_prose_before_the_fence():
+    text = 'Press { to start.\n```json\n{"a": 1}\n```'
+    assert extract_first_json_object(text) == '{"a": 1}'
+
+
+def test_truncated_response_has_no_object():
+    assert extract_first_json_object('```json\n{"a": 1, "b": [1, 2') == ""
+    assert balanced_span_end('{"a": {"b": 1}', 0) == -1
+
+
+def test_truncated_response_does_not_return_a_complete_child():
+    text = (
+        '```json\n{"basic_info": {"description": "x", "category_classification": "y"}, '
+        '"technical_details": {"feature_list": ["a"'
+    )
+    assert extract_first_json_object(text) == ""
+    assert extract_first_json_object(text[len("```json\n"):]) == ""
+    assert find_json_objects('{"outer": {"inner": 1}, "rest": [') == []
+
+
+def test_deep_nesting_does_not_raise():
+    assert extract_first_json_object('{"a":' * 5000) == ""
+    assert extract_first_json_object('{"a":' * 5000 + "1" + "}" * 5000) == ""  # too deep to decode
+    assert extract_first_json_object("{ x " * 5000 + '{"ok": 1}') == '{"ok": 1}'
+
+
+def test_escaped_quotes_inside_strings():
+    text = '{"quote": "she said \\"}\\" loudly"}'
+    assert balanced_span_end(text, 0) == len(text)
+    assert extract_first_json_object(text) == text
+
+
+def test_empty_and_json_free_input():
+    assert extract_first_json_object("") == ""
+    assert extract_first_json_object(None) == ""
+    assert find_json_objects("no objects [1, 2] here") == []
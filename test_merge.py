@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the deterministic merging of partial analyses (src/merge.py).
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from merge import CANDIDATES_KEY, merge_partials, parse_partials, premerge, premerge_json
+from models import ToolSnapshotData
+
+
+def test_lists_are_unioned_with_normalization():
+    merged = premerge([
+        {"technical_details": {"feature_list": ["Chat", "Autocomplete."]}},
+        {"technical_details": {"feature_list": ["autocomplete", "  chat ", "Agents"]}},
+    ])
+    assert merged["technical_details"]["feature_list"] == ["Chat", "Autocomplete.", "Agents"]
+
+
+def test_numbers_take_the_majority_and_ties_the_first():
+    merged = premerge([{"stars": 10, "forks": 1}, {"stars": 12, "forks": 2}, {"stars": 12}])
+    assert merged["stars"] == 12
+    assert merged["forks"] == 1
+
+
+def test_conflicting_text_keeps_the_first_value_and_records_candidates():
+    merged = premerge([
+        {"basic_info": {"description": "An AI editor."}},
+        {"basic_info": {"description": "an ai editor"}},
+        {"basic_info": {"description": "A code assistant."}},
+    ])
+    assert merged["basic_info"]["description"] == "An AI editor."
+    assert merged[CANDIDATES_KEY] == {"basic_info.description": ["An AI editor.", "A code assistant."]}
+
+
+def test_candidates_of_earlier_levels_are_carried_forward():
+    level_one = premerge([{"name": "A"}, {"name": "B"}])
+    merged = premerge([level_one, {"name": "C"}])
+    assert merged[CANDIDATES_KEY]["name"] == ["A", "C", "B"]
+
+
+def test_invalid_partials_are_skipped():
+    assert parse_partials(['{"a": 1}', "not json", "[1, 2]", None]) == [{"a": 1}]
+    assert json.loads(premerge_json(['{"a": [1]}', "oops", '{"a": [2]}'])) == {"a": [1, 2]}
+
+
+def test_merge_partials_follows_the_schema():
+    snapshot, conflicts = merge_partials([
+        {"technical_details": {"feature_list": ["Chat"], "api_access": True, "pricing_model": {"free": "Yes"}},
+         "community_metrics": {"github_stars": "1,200"}},
+        {"technical_details": {"feature_list": "chat", "api_access": False, "pricing_model": {"pro": "$20"}},
+         "community_metrics": {"github_stars": 1200}},
+        {"technical_details": {"api_access": True}, "community_metrics": {"github_stars": 900}},
+    ])
+    assert snapshot["technical_details"]["feature_list"] == ["Chat"]
+    assert snapshot["technical_details"]["api_access"] is True
+    assert snapshot["technical_details"]["pricing_model"] == {"free": "Yes", "pro": "$20"}
+    assert snapshot["community_metrics"]["github_stars"] == 1200
+    assert conflicts == {}
+    ToolSnapshotData.model_validate(snapshot)
+
+
+def test_merge_partials_reports_free_text_conflicts_only():
+    snapshot, conflicts = merge_partials([
+        {"basic_info": {"description": "An editor.", "category_classification": "AI_IDE"}},
+        {"basic_info": {"description": "An AI-first code editor.", "category_classification": "CODE_COMPLETION"}},
+    ])
+    # The longest value is kept; only descriptive fields are sent to the model.
+    assert snapshot["basic_info"]["description"] == "An AI-first code editor."
+    assert snapshot["basic_info"]["category_classification"] == "CODE_COMPLETION"
+    assert conflicts == {"basic_info.description": ["An editor.", "An AI-first code editor."]}
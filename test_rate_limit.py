@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared rate limiters (src/rate_limit.py).
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from rate_limit import AdaptiveConcurrencyLimiter, TokenBucket
+
+
+def test_bucket_allows_a_burst_up_to_capacity():
+    bucket = TokenBucket(requests_per_minute=120, name="test")
+    started = time.monotonic()
+    for _ in range(120):
+        bucket.acquire()
+    assert time.monotonic() - started < 0.5
+    assert bucket.summary()["requests"] == 120
+
+
+def test_bucket_waits_for_refill_when_empty():
+    bucket = TokenBucket(requests_per_minute=600, name="test")  # 10 per second
+    for _ in range(600):
+        bucket.acquire()
+    started = time.monotonic()
+    bucket.acquire()
+    assert 0.05 <= time.monotonic() - started < 1.0
+    assert bucket.summary()["waited_seconds"] >= 0
+
+
+def test_server_reported_quota_limits_the_bucket():
+    bucket = TokenBucket(requests_per_minute=6000, name="test")
+    bucket.observe(remaining=0, reset_in_seconds=0.2, used=100)
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.15
+    assert bucket.summary()["server_limits"] == {"remaining": 0, "reset_in_seconds": 0.2, "used": 100}
+
+
+def test_non_positive_rate_disables_the_client_side_limit():
+    for rate in (0, -1):
+        bucket = TokenBucket(requests_per_minute=rate, name="test")
+        started = time.monotonic()
+        for _ in range(100):
+            bucket.acquire()
+        assert time.monotonic() - started < 0.5
+    bucket.observe(remaining=0, reset_in_seconds=0.2)
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.15
+
+
+def test_limiter_halves_on_throttle_and_recovers():
+    limiter = AdaptiveConcurrencyLimiter(max_inflight=8, name="test", base_backoff_seconds=0.05)
+    limiter.acquire()
+    limiter.acquire()
+    # Calls throttled together back off only once.
+    limiter.release(throttled=True)
+    limiter.release(throttled=True)
+    assert limiter.summary()["current_limit"] == 4
+    started = time.monotonic()
+    for _ in range(40):
+        limiter.acquire()
+        limiter.release()
+    assert time.monotonic() - started >= 0.04  # the first call waited out the backoff
+    assert limiter.summary() == {"calls": 42, "throttles": 2, "max_inflight": 8, "current_limit": 8, "min_limit_seen": 4}
+
+
+def test_limiter_bounds_calls_in_flight():
+    limiter = AdaptiveConcurrencyLimiter(max_inflight=2, name="test")
+    inflight = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def call():
+        limiter.acquire()
+        with lock:
+            inflight.append(1)
+            peak[0] = max(peak[0], len(inflight))
+        time.sleep(0.02)
+        with lock:
+            inflight.pop()
+        limiter.release()
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the compressed per-source framing of raw payloads (src/raw_frames.py).
+"""
+
+import sys
+import os
+import zlib
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from raw_frames import (
+    DICTIONARY_MAX_BYTES, compress_frame, decode_frame, encode_payload, source_json, train_dictionary
+)
+
+
+def _payload(i: int) -> dict:
+    return {
+        "scraped_content": f"Tool {i} is an AI coding assistant with chat, autocomplete and agent mode. Pricing: free and pro tiers.",
+        "github_data": {"stars": 1000 + i, "forks": 10 + i, "language": "TypeScript", "license": "MIT", "open_issues": i},
+        "npm_data": None,
+    }
+
+
+def test_frames_round_trip_per_source():
+    payloads = [_payload(i) for i in range(20)]
+    dictionary = train_dictionary([source_json(value) for payload in payloads for value in payload.values()])
+    payload = _payload(99)
+    frames = encode_payload(payload, dictionary)
+    assert [source for source, _, _ in frames] == list(payload)
+    for source, frame, raw_size in frames:
+        assert decode_frame(frame, dictionary) == payload[source]
+        assert raw_size == len(source_json(payload[source]))
+    # Without a dictionary the frames are plain deflate streams.
+    assert [decode_frame(frame) for _, frame, _ in encode_payload(payload)] == list(payload.values())
+
+
+def test_dictionary_holds_shared_text_and_shrinks_frames():
+    samples = [source_json(_payload(i)["scraped_content"]) for i in range(30)]
+    dictionary = train_dictionary(samples)
+    assert 0 < len(dictionary) <= DICTIONARY_MAX_BYTES
+    assert b" autocomplete and agent mode" in dictionary
+    sample = source_json(_payload(100)["scraped_content"])
+    assert len(compress_frame(sample, dictionary)) < len(compress_frame(sample))
+
+
+def test_dictionary_respects_size_limit():
+    samples = [source_json({f"key_{j}": f"value number {j} repeated" for j in range(200)}) for _ in range(3)]
+    assert len(train_dictionary(samples, max_bytes=256)) <= 256
+    assert train_dictionary([b'{"unique":"only once"}']) == b""
+
+
+def test_frames_are_zlib_streams_flagging_the_dictionary():
+    dictionary = b'"stars":"forks":"language":'
+    frame = compress_frame(source_json({"stars": 1, "forks": 2}), dictionary)
+    assert frame[0] & 0x0F == 8 and (frame[0] << 8 | frame[1]) % 31 == 0  # zlib header (deflate, valid check bits)
+    assert frame[1] & 0x20  # FDICT
+    assert int.from_bytes(frame[2:6], "big") == zlib.adler32(dictionary)
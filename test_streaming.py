@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for stopping streamed model responses after the fenced JSON block (src/streaming.py).
+"""
+
+import sys
+import os
+import asyncio
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from streaming import FencedJsonDetector, stream_until_json
+
+
+def _stop_index(text: str, piece_size: int) -> int:
+    """Feeds text in pieces and returns how much had been fed when the detector fired, or -1."""
+    detector = FencedJsonDetector()
+    for i in range(0, len(text), piece_size):
+        if detector.feed(text[i:i + piece_size]):
+            return min(i + piece_size, len(text))
+    return -1
+
+
+def test_stops_at_the_piece_that_closes_the_fence():
+    answer = 'Sure.\n```json\n{"a": {"b": [1, 2]}}\n```'
+    for piece_size in (1, 2, 5, len(answer)):
+        stop = _stop_index(answer + "\nSome notes after the block.", piece_size)
+        assert len(answer) <= stop < len(answer) + piece_size
+
+
+def test_fence_inside_a_string_value_does_not_stop_the_stream():
+    answer = '```json\n{"description": "Run ```npm i``` first", "escaped": "a \\" ``` b"}\n```'
+    for piece_size in (1, 3, 7, len(answer)):
+        assert _stop_index(answer, piece_size) == len(answer)
+    assert _stop_index(answer[:-3], 1) == -1
+
+
+def test_no_fence_never_stops():
+    assert _stop_index('{"a": 1}\n```\nmore', 1) == -1
+
+
+class _FakeAgent:
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.closed = False
+
+    def stream_async(self, prompt):
+        agent = self
+
+        async def events():
+            try:
+                for piece in agent.pieces:
+                    yield {"data": piece}
+                yield {"result": None}
+            finally:
+                agent.closed = True
+        return events()
+
+
+def test_stream_until_json_cuts_after_the_block():
+    pieces = ["```json\n{\"d\": \"run ```", "x``` now\"}", "\n```", "\ntrailing notes"]
+    agent = _FakeAgent(pieces)
+    text, first_token_at, stopped_early, usage = asyncio.run(stream_until_json(agent, "prompt"))
+    assert text == "".join(pieces[:3])
+    assert stopped_early and usage is None and first_token_at is not None
+    assert agent.closed